@@ -0,0 +1 @@
+"""效能基準測試（於 backend 目錄下以 python -m benchmarks.<name> 執行）"""
@@ -0,0 +1,197 @@
+"""
+管理員每日概覽基準測試
+比較舊版（每位用戶一次查詢 + 每場會議一次與會者查詢）與目前的集合式查詢，
+並比較逐一讀取摘要檔與並行讀取（各種 summary_mode）的耗時
+
+使用方式（於 backend 目錄下）：
+
+    python -m benchmarks.bench_admin_overview --users 10000 --meetings 100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 使用暫存資料庫，避免動到正式資料
+_tmp_dir = tempfile.mkdtemp(prefix="bench_admin_overview_")
+os.environ["DATABASE_PATH"] = str(Path(_tmp_dir) / "bench.db")
+os.environ["STORAGE_PATH"] = str(Path(_tmp_dir) / "meetings")
+
+import database  # noqa: E402
+from config import get_settings  # noqa: E402
+from routers import admin  # noqa: E402
+from services.storage import artifact_cache, configure_artifact_cache, read_text  # noqa: E402
+
+BASE_DATE = datetime(2024, 1, 1)
+
+
+def seed(user_count: int, meeting_count: int, days: int, attendees_per_meeting: int):
+    """以同步 sqlite3 大量寫入測試資料"""
+    rng = random.Random(42)
+    conn = sqlite3.connect(get_settings().database_path)
+    conn.executemany(
+        "INSERT INTO users (id, email, name) VALUES (?, ?, ?)",
+        ((i, f"user{i:05d}@example.com", f"User {i}") for i in range(1, user_count + 1)),
+    )
+    meetings = []
+    for i in range(meeting_count):
+        start = BASE_DATE + timedelta(days=rng.randrange(days), minutes=rng.randrange(8 * 60, 19 * 60))
+        meetings.append((
+            f"mtg_{i:08d}",
+            rng.randint(1, user_count),
+            f"會議室 {rng.choice('ABCD')}",
+            f"主題 {i}",
+            start.isoformat(),
+            (start + timedelta(minutes=45)).isoformat(),
+            "completed" if rng.random() < 0.9 else "failed",
+        ))
+    conn.executemany(
+        """
+        INSERT INTO meetings (id, user_id, room, topic, start_time, end_time, status)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+        meetings,
+    )
+    conn.executemany(
+        "INSERT INTO attendees (meeting_id, email, name) VALUES (?, ?, ?)",
+        (
+            (m[0], f"guest{j}@example.com", None)
+            for m in meetings
+            for j in range(attendees_per_meeting)
+        ),
+    )
+    conn.commit()
+    conn.execute("ANALYZE")
+    conn.close()
+
+
+async def legacy_overview(date_str: str) -> int:
+    """舊版實作：N+1 查詢與無法使用索引的 DATE() 條件（僅保留查詢部分）"""
+    db = await database.get_db()
+    cursor = await db.execute("SELECT id, email, name FROM users ORDER BY email")
+    users = await cursor.fetchall()
+    total = 0
+    for user in users:
+        cursor = await db.execute(
+            """
+            SELECT m.id, m.room, m.topic, m.start_time, m.end_time, m.status
+            FROM meetings m
+            WHERE m.user_id = ?
+            AND DATE(m.start_time) = ?
+            AND m.status = 'completed'
+            ORDER BY m.start_time
+            """,
+            (user["id"], date_str),
+        )
+        for meeting in await cursor.fetchall():
+            cursor2 = await db.execute(
+                "SELECT email, name FROM attendees WHERE meeting_id = ?",
+                (meeting["id"],),
+            )
+            await cursor2.fetchall()
+            total += 1
+    return total
+
+
+async def current_overview(date_str: str, token: str, summary_mode: str = "none") -> int:
+    response = await admin.get_daily_overview(
+        date=date_str, summary_mode=summary_mode, excerpt_chars=300, authorization=f"Bearer {token}"
+    )
+    return json.loads(response.body)["total_meetings"]
+
+
+def write_summaries(date_str: str, paragraphs: int) -> list:
+    """為指定日期的已完成會議寫入摘要檔並更新 summary_path，回傳路徑列表"""
+    conn = sqlite3.connect(get_settings().database_path)
+    rows = conn.execute(
+        "SELECT id FROM meetings WHERE substr(start_time, 1, 10) = ? AND status = 'completed'",
+        (date_str,),
+    ).fetchall()
+    paths = []
+    for (meeting_id,) in rows:
+        meeting_dir = Path(get_settings().storage_path) / meeting_id
+        meeting_dir.mkdir(parents=True, exist_ok=True)
+        path = meeting_dir / "summary.md"
+        path.write_text(
+            "# 會議摘要\n" + "".join(f"- 重點 {i}：討論專案進度與預算分配\n" for i in range(paragraphs)),
+            encoding="utf-8",
+        )
+        paths.append(str(path))
+        conn.execute("UPDATE meetings SET summary_path = ? WHERE id = ?", (str(path), meeting_id))
+    conn.commit()
+    conn.close()
+    return paths
+
+
+async def sequential_summaries(paths: list) -> int:
+    """舊版讀法：在事件迴圈中逐一同步讀檔"""
+    return sum(len(read_text(path)) for path in paths)
+
+
+async def cold(coro_factory):
+    """清空內容快取後執行，量測實際讀檔的耗時"""
+    artifact_cache.clear()
+    return await coro_factory()
+
+
+async def timed(coro_factory, repeat: int):
+    """回傳（最佳耗時秒數, 結果）"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await coro_factory()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="管理員每日概覽基準測試")
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--meetings", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=60, help="會議分布的天數")
+    parser.add_argument("--attendees", type=int, default=3, help="每場會議的與會者數")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--summary-lines", type=int, default=200, help="每份摘要檔的行數")
+    args = parser.parse_args()
+
+    await database.init_db()
+    await database.close_db()
+    configure_artifact_cache()
+    print(f"🗄️  建立測試資料：{args.users} 位用戶、{args.meetings} 場會議 ({_tmp_dir})")
+    seed(args.users, args.meetings, args.days, args.attendees)
+
+    token = "bench-admin-token"
+    admin.admin_tokens["bench@example.com"] = token
+    date_str = (BASE_DATE + timedelta(days=args.days // 2)).strftime("%Y-%m-%d")
+
+    legacy_time, legacy_count = await timed(lambda: legacy_overview(date_str), args.repeat)
+    current_time, current_count = await timed(lambda: current_overview(date_str, token), args.repeat)
+
+    if legacy_count != current_count:
+        print(f"❌ 結果不一致：舊版 {legacy_count} 場，新版 {current_count} 場")
+
+    print(f"📅 {date_str}：{current_count} 場已完成會議")
+    print(f"   舊版（N+1 查詢）   {legacy_time * 1000:>9.1f} ms")
+    print(f"   新版（集合式查詢） {current_time * 1000:>9.1f} ms  (x{legacy_time / current_time:.1f})")
+
+    # 摘要讀取（每次執行前清空內容快取）
+    paths = write_summaries(date_str, args.summary_lines)
+    sequential_time, _ = await timed(lambda: sequential_summaries(paths), args.repeat)
+    print(f"📄 摘要檔 {len(paths)} 份")
+    print(f"   逐一同步讀取（僅讀檔）         {sequential_time * 1000:>9.1f} ms")
+    for mode in ("full", "excerpt", "key_points"):
+        mode_time, _ = await timed(lambda: cold(lambda: current_overview(date_str, token, mode)), args.repeat)
+        print(f"   概覽 summary_mode={mode:<10}  {mode_time * 1000:>9.1f} ms")
+    await database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,124 @@
+"""
+資料庫連線池基準測試
+模擬前端輪詢 /status 的讀取負載，比較不同唯讀連線數下的吞吐量
+
+使用方式（於 backend 目錄下）：
+
+    python -m benchmarks.bench_db_pool --meetings 5000 --clients 64 --seconds 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 使用暫存資料庫，避免動到正式資料
+_tmp_dir = tempfile.mkdtemp(prefix="bench_db_pool_")
+os.environ["DATABASE_PATH"] = str(Path(_tmp_dir) / "bench.db")
+os.environ["STORAGE_PATH"] = str(Path(_tmp_dir) / "meetings")
+
+import database  # noqa: E402
+from config import get_settings  # noqa: E402
+
+
+async def seed(meeting_count: int):
+    """建立測試資料"""
+    await database.init_db()
+    db = await database.get_db()
+    base = datetime(2024, 1, 1)
+    await db.executemany(
+        "INSERT INTO meetings (id, room, start_time, status) VALUES (?, ?, ?, ?)",
+        [
+            (f"mtg_{i:08d}", "會議室 A", (base + timedelta(minutes=i)).isoformat(), "processing")
+            for i in range(meeting_count)
+        ],
+    )
+    await db.executemany(
+        "INSERT INTO attendees (meeting_id, email, name) VALUES (?, ?, ?)",
+        [
+            (f"mtg_{i:08d}", f"user{j}@example.com", f"User {j}")
+            for i in range(meeting_count)
+            for j in range(3)
+        ],
+    )
+    await db.commit()
+    await database.close_db()
+
+
+async def poll_status(meeting_id: str):
+    """與 get_meeting_status 相同的兩次查詢"""
+    async with database.get_db_session(readonly=True) as db:
+        cursor = await db.execute("SELECT * FROM meetings WHERE id = ?", (meeting_id,))
+        await cursor.fetchone()
+        cursor = await db.execute("SELECT * FROM attendees WHERE meeting_id = ?", (meeting_id,))
+        await cursor.fetchall()
+
+
+async def run(
+    reader_count: int,
+    meeting_count: int,
+    clients: int,
+    writers: int,
+    seconds: float,
+) -> tuple:
+    """在指定唯讀連線數下執行，回傳（每秒讀取請求數, 每秒寫入交易數）"""
+    get_settings().db_reader_count = reader_count
+    await database.get_db()
+
+    done = 0
+    committed = 0
+    deadline = time.perf_counter() + seconds
+
+    async def writer():
+        # 模擬 process_meeting 的狀態更新
+        nonlocal committed
+        db = await database.get_db()
+        while time.perf_counter() < deadline:
+            await db.execute(
+                "UPDATE meetings SET updated_at = ? WHERE id = ?",
+                (datetime.now().isoformat(), f"mtg_{random.randrange(meeting_count):08d}"),
+            )
+            await db.commit()
+            committed += 1
+
+    async def client():
+        nonlocal done
+        while time.perf_counter() < deadline:
+            await poll_status(f"mtg_{random.randrange(meeting_count):08d}")
+            done += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(client() for _ in range(clients)),
+        *(writer() for _ in range(writers)),
+    )
+    elapsed = time.perf_counter() - started
+
+    await database.close_db()
+    return done / elapsed, committed / elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="資料庫連線池基準測試")
+    parser.add_argument("--meetings", type=int, default=5000)
+    parser.add_argument("--clients", type=int, default=64)
+    parser.add_argument("--writers", type=int, default=1, help="同時進行的寫入工作數")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--readers", type=int, nargs="+", default=[0, 1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"🗄️  建立測試資料：{args.meetings} 場會議 ({_tmp_dir})")
+    await seed(args.meetings)
+
+    for reader_count in args.readers:
+        rps, wps = await run(reader_count, args.meetings, args.clients, args.writers, args.seconds)
+        label = "單一連線" if reader_count == 0 else f"{reader_count} 條唯讀連線"
+        print(f"   {label:<12} 讀取 {rps:>9,.0f} req/s   寫入 {wps:>8,.0f} commit/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,180 @@
+"""
+會議批次匯出基準測試
+以不同的會議數量執行 NDJSON/CSV/ZIP 匯出，量測吞吐量與 Python 記憶體配置的峰值
+（量測期間啟用 tracemalloc，吞吐量約為實際的一半），
+並驗證輸出可被完整解析
+
+使用方式（於 backend 目錄下）：
+
+    python -m benchmarks.bench_export --meetings 2000 20000
+
+NDJSON/CSV 的記憶體峰值隨會議數量成長超過 --max-growth 倍、ZIP 每場會議的增量超過
+--zip-bytes-per-meeting，或輸出無法解析時以非零狀態碼結束
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+import zipfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 使用暫存資料庫，避免動到正式資料
+_tmp_dir = tempfile.mkdtemp(prefix="bench_export_")
+os.environ["DATABASE_PATH"] = str(Path(_tmp_dir) / "bench.db")
+os.environ["STORAGE_PATH"] = str(Path(_tmp_dir) / "meetings")
+os.environ["STORAGE_COMPACTOR_ENABLED"] = "false"
+
+import database  # noqa: E402
+from config import get_settings  # noqa: E402
+from services.export import EXPORT_FORMATS, export_meetings  # noqa: E402
+
+BASE_DATE = datetime(2024, 1, 1)
+
+
+def seed(meeting_count: int, transcript_chars: int):
+    """清空後重新寫入測試資料；逐字稿與摘要共用少數檔案，避免建立大量檔案"""
+    settings = get_settings()
+    shared = Path(settings.storage_path) / "shared"
+    shared.mkdir(parents=True, exist_ok=True)
+    transcript = shared / "transcript.txt"
+    line = '王經理："第三季預算需要重新分配，請各部門回報進度。"\n'
+    transcript.write_text(line * (transcript_chars // len(line) + 1), encoding="utf-8")
+    summary = shared / "summary.md"
+    summary.write_text("# 會議摘要\n- 預算重新分配\n- 各部門回報進度\n", encoding="utf-8")
+
+    conn = sqlite3.connect(settings.database_path)
+    conn.execute("DELETE FROM attendees")
+    conn.execute("DELETE FROM meetings")
+    conn.execute("DELETE FROM users")
+    conn.executemany(
+        "INSERT INTO users (id, email, name) VALUES (?, ?, ?)",
+        ((i, f"user{i:04d}@example.com", f"User {i}") for i in range(1, 101)),
+    )
+    conn.executemany(
+        """
+        INSERT INTO meetings (id, user_id, room, topic, start_time, end_time, status,
+                              transcript_path, summary_path)
+        VALUES (?, ?, ?, ?, ?, ?, 'completed', ?, ?)
+        """,
+        (
+            (
+                f"mtg_{i:08d}", i % 100 + 1, f"會議室 {'ABCD'[i % 4]}", f"主題 {i}",
+                (BASE_DATE + timedelta(minutes=i * 7)).isoformat(),
+                (BASE_DATE + timedelta(minutes=i * 7 + 45)).isoformat(),
+                str(transcript), str(summary),
+            )
+            for i in range(meeting_count)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO attendees (meeting_id, email, name) VALUES (?, ?, ?)",
+        (
+            (f"mtg_{i:08d}", f"guest{j}@example.com", f"Guest {j}" if j else None)
+            for i in range(meeting_count)
+            for j in range(3)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+async def run_export(fmt: str, output_path: Path):
+    """回傳（耗時秒數, 輸出位元組數, Python 記憶體配置峰值）"""
+    tracemalloc.start()
+    started = time.perf_counter()
+    written = 0
+    with open(output_path, "wb") as output:
+        async for data in export_meetings(fmt):
+            output.write(data)
+            written += len(data)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, written, peak
+
+
+def count_records(fmt: str, output_path: Path) -> int:
+    """解析輸出並回傳會議筆數（逐字稿須完整）"""
+    expected = (Path(get_settings().storage_path) / "shared" / "transcript.txt").read_text(encoding="utf-8")
+    if fmt == "ndjson":
+        count = 0
+        with open(output_path, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                assert record["transcript"] == expected and len(record["attendees"]) == 3
+                count += 1
+        return count
+    if fmt == "csv":
+        with open(output_path, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert all(row["transcript"] == expected for row in rows)
+        return len(rows)
+    with zipfile.ZipFile(output_path) as archive:
+        names = [name for name in archive.namelist() if name.endswith("/transcript.txt")]
+        assert archive.read(names[-1]).decode("utf-8") == expected
+        assert archive.testzip() is None
+        return len(names)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="會議批次匯出基準測試")
+    parser.add_argument("--meetings", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--transcript-chars", type=int, default=20000, help="每份逐字稿的字數")
+    parser.add_argument("--max-growth", type=float, default=1.5,
+                        help="NDJSON/CSV：最大與最小會議數之間允許的記憶體峰值成長倍數")
+    parser.add_argument("--zip-bytes-per-meeting", type=int, default=4096,
+                        help="ZIP：每多一場會議允許增加的記憶體峰值（中央目錄的中繼資料）")
+    args = parser.parse_args()
+
+    await database.init_db()
+    await database.close_db()
+
+    ok = True
+    peaks = {fmt: [] for fmt in EXPORT_FORMATS}
+    try:
+        for meeting_count in sorted(args.meetings):
+            seed(meeting_count, args.transcript_chars)
+            print(f"📦 {meeting_count:,} 場會議（每份逐字稿 {args.transcript_chars:,} 字）")
+            for fmt in EXPORT_FORMATS:
+                output_path = Path(_tmp_dir) / f"export.{fmt}"
+                elapsed, written, peak = await run_export(fmt, output_path)
+                count = count_records(fmt, output_path)
+                peaks[fmt].append(peak)
+                ok = ok and count == meeting_count
+                print(
+                    f"   {fmt:<7} {written / 1024 / 1024:>8.1f} MB  {elapsed:>6.2f} s  "
+                    f"{written / 1024 / 1024 / elapsed:>7.1f} MB/s  記憶體峰值 {peak / 1024 / 1024:>6.2f} MB  "
+                    f"{'✅' if count == meeting_count else f'❌ 只有 {count} 筆'}"
+                )
+                output_path.unlink()
+    finally:
+        await database.close_db()
+
+    counts = sorted(args.meetings)
+    for fmt, values in peaks.items():
+        if len(values) < 2:
+            continue
+        if fmt == "zip":
+            # ZIP 的中央目錄須記錄每個項目，峰值與筆數成正比，改以每場會議的增量檢查
+            per_meeting = (values[-1] - values[0]) / (counts[-1] - counts[0])
+            if per_meeting > args.zip_bytes_per_meeting:
+                ok = False
+                print(f"❌ zip 每場會議增加 {per_meeting:,.0f} bytes（上限 {args.zip_bytes_per_meeting:,}）")
+        elif values[-1] / values[0] > args.max_growth:
+            ok = False
+            print(f"❌ {fmt} 記憶體峰值成長 x{values[-1] / values[0]:.2f}（上限 x{args.max_growth:.1f}）")
+
+    print("🎉 通過" if ok else "❌ 失敗")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,207 @@
+"""
+後端熱點函式的微基準測試與效能回歸檢查
+量測每次呼叫的耗時，與 benchmarks/baselines/hotpaths.json 中的基準值比較
+
+基準值依校準工作量（固定的純 Python 運算）換算，在不同機器上也能大致比較；
+耗時超過基準值（換算後）的 1 + --threshold 倍即視為回歸
+
+使用方式（於 backend 目錄下）：
+
+    python -m benchmarks.bench_hotpaths                 # 與基準值比較
+    python -m benchmarks.bench_hotpaths --save          # 效能改善後更新基準值
+    python -m benchmarks.bench_hotpaths --only markdown_to_html status_response
+
+有任何項目回歸時以非零狀態碼結束
+"""
+
+import argparse
+import json
+import platform
+import sys
+import timeit
+from pathlib import Path
+from typing import Callable, Dict
+
+from models.meeting import MeetingStatus
+from routers.meetings import _build_status_response, _calculate_processing_steps, _detect_audio_ext
+from services.digest import extract_key_points
+from services.email import _markdown_to_html
+from services.summary import SUMMARY_PROMPT
+
+BASELINE_PATH = Path(__file__).resolve().parent / "baselines" / "hotpaths.json"
+
+SAMPLE_SUMMARY = """# 會議摘要
+
+日期：2024-01-15T10:00:00 - 2024-01-15T11:00:00
+地點：會議室 A
+與會者：王經理 (wang@example.com), 李工程師 (lee@example.com), 陳設計師 (chen@example.com)
+
+---
+
+## 會議重點
+""" + "".join(f"- 重點 {i}：第三季預算需要重新分配，請各部門回報目前的進度與風險\n" for i in range(20)) + """
+## 決議事項
+- 行銷預算調整 10% 至產品開發
+- 新版上線時程延後兩週
+
+## 待辦事項
+""" + "".join(f"- [ ] 負責人 {i}：更新預算表並於週五前回報\n" for i in range(10))
+
+LARGE_TRANSCRIPT = "王經理：第三季的預算需要重新分配，請各部門在週五前回報目前的進度與風險。\n" * 5000
+
+
+def _meeting_row(status: str) -> dict:
+    return {
+        "id": "mtg_01HQ3K5Z8N9P2R4T6V8X0Z2B4D",
+        "status": status,
+        "start_time": "2024-01-15T10:00:00",
+        "end_time": "2024-01-15T11:00:00",
+        "room": "會議室 A",
+        "transcript_path": "data/meetings/mtg_01HQ3K5Z8N9P2R4T6V8X0Z2B4D/transcript.txt",
+        "summary_path": None if status == "processing" else "data/meetings/mtg_01HQ3K5Z8N9P2R4T6V8X0Z2B4D/summary.md",
+        "error_message": None,
+        "updated_at": "2024-01-15T11:05:00",
+    }
+
+
+_ATTENDEE_ROWS = [
+    {"id": i, "email": f"user{i}@example.com", "name": f"User {i}", "email_sent": 1,
+     "email_sent_at": "2024-01-15T11:05:00"}
+    for i in range(5)
+]
+_STEP_CASES = [(MeetingStatus(s), _meeting_row(s)) for s in ("recording", "processing", "completed", "failed")]
+_ATTENDEE_NAMES = ", ".join(f"User {i} (user{i}@example.com)" for i in range(5))
+
+
+def _processing_steps():
+    for status, meeting in _STEP_CASES:
+        _calculate_processing_steps(status, meeting)
+
+
+def _audio_sniffing():
+    _detect_audio_ext("blob", b"\x00\x00\x00\x20ftypM4A ")
+    _detect_audio_ext("blob", b"RIFF\x00\x00\x00\x00WAVE")
+    _detect_audio_ext("blob", b"\x1a\x45\xdf\xa3\x00\x00")
+    _detect_audio_ext("recording.webm", b"\x1a\x45\xdf\xa3")
+
+
+def _summary_prompt():
+    SUMMARY_PROMPT.format(
+        room="會議室 A",
+        start_time="2024-01-15T10:00:00",
+        end_time="2024-01-15T11:00:00",
+        attendees=_ATTENDEE_NAMES,
+        transcript=LARGE_TRANSCRIPT,
+        date_range="2024-01-15T10:00:00 - 2024-01-15T11:00:00",
+        attendee_names=_ATTENDEE_NAMES,
+    )
+
+
+_COMPLETED_MEETING = _meeting_row("completed")
+
+CASES: Dict[str, Callable[[], object]] = {
+    "markdown_to_html": lambda: _markdown_to_html(SAMPLE_SUMMARY, "會議室 A", "2024-01-15T10:00:00"),
+    "processing_steps": _processing_steps,
+    "extract_key_points": lambda: extract_key_points(SAMPLE_SUMMARY),
+    "audio_sniffing": _audio_sniffing,
+    "summary_prompt_format": _summary_prompt,
+    "status_response": lambda: _build_status_response(_COMPLETED_MEETING, _ATTENDEE_ROWS),
+}
+
+# 門檻倍數：summary_prompt_format 主要是大量字串複製，受記憶體頻寬影響，與校準工作量的相關性較低
+THRESHOLD_SCALE = {"summary_prompt_format": 2.0}
+
+
+def _calibration():
+    """校準工作量：固定的純 Python 運算（字串、dict 與迴圈），用來換算不同機器的速度"""
+    table = {}
+    for i in range(2000):
+        key = f"k{i % 97}"
+        table[key] = table.get(key, 0) + len(key.upper())
+    return sorted(table.items())
+
+
+def measure(fn: Callable[[], object], repeat: int) -> float:
+    """每次呼叫的最短耗時（秒）：先自動決定每輪次數（每輪至少 0.2 秒），再取多輪的最小值"""
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    number = max(1, number)
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def _format_time(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} µs"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="後端熱點函式的微基準測試")
+    parser.add_argument("--save", action="store_true", help="將本次結果存為基準值")
+    parser.add_argument("--threshold", type=float, default=0.3, help="允許的變慢比例")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--retries", type=int, default=3, help="疑似回歸時重新量測的次數")
+    parser.add_argument("--only", nargs="+", choices=sorted(CASES), help="只執行指定項目")
+    args = parser.parse_args()
+
+    baseline = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.exists() else None
+
+    # 校準工作量穿插在各項目之間量測並取最小值，降低 CPU 頻率變化與其他程序干擾的影響
+    names = args.only or list(CASES)
+    calibrations = [measure(_calibration, args.repeat)]
+    results = {}
+    for name in names:
+        results[name] = measure(CASES[name], args.repeat)
+        calibrations.append(measure(_calibration, args.repeat))
+    while len(calibrations) < len(CASES) + 1:
+        calibrations.append(measure(_calibration, args.repeat))
+    calibration = min(calibrations)
+    scale = calibration / baseline["calibration"] if baseline else 1.0
+
+    print(f"⏱️  熱點函式微基準測試（Python {platform.python_version()}，"
+          f"機器速度換算 x{scale:.2f}，回歸門檻 +{args.threshold:.0%}）")
+    ok = True
+    for name in names:
+        current = results[name]
+        expected = baseline["results"].get(name) if baseline else None
+        if expected is None:
+            print(f"   {name:<24} {_format_time(current):>12}   （尚無基準值）")
+            continue
+        expected *= scale
+        limit = 1 + args.threshold * THRESHOLD_SCALE.get(name, 1.0)
+        # 疑似回歸時重新量測，排除偶發的干擾
+        for _ in range(args.retries):
+            if current / expected <= limit:
+                break
+            current = results[name] = min(current, measure(CASES[name], args.repeat))
+        ratio = current / expected
+        regressed = ratio > limit
+        ok = ok and not regressed
+        print(
+            f"   {name:<24} {_format_time(current):>12}   基準 {_format_time(expected):>12}   "
+            f"x{ratio:.2f} {'❌' if regressed else '✅'}"
+        )
+
+    if args.save:
+        saved = dict(baseline["results"]) if baseline else {}
+        # 換算回基準值所在機器的速度，只更新本次執行的項目
+        if baseline and args.only:
+            saved.update({name: value / scale for name, value in results.items()})
+            calibration = baseline["calibration"]
+        else:
+            saved = results
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps({
+            "python": platform.python_version(),
+            "calibration": calibration,
+            "results": saved,
+        }, indent=2) + "\n")
+        print(f"💾 已更新基準值：{BASELINE_PATH}")
+        return 0
+
+    print("🎉 通過" if ok else "❌ 效能回歸")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+"""
+JSON 序列化基準測試
+比較會議列表與管理員概覽在舊版（逐筆 dict / Pydantic 模型，交由 FastAPI 驗證與編碼）
+與目前快速路徑（資料列直接轉 dict，FastJSONResponse 編碼）的耗時
+
+使用方式（於 backend 目錄下）：
+
+    python -m benchmarks.bench_json_serialization --rows 10000
+
+兩種路徑的輸出不一致，或快速路徑較慢時以非零狀態碼結束
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from routers.admin import (
+    DailyOverviewResponse,
+    MeetingSummaryItem,
+    UserMeetingOverview,
+)
+from routers.meetings import MEETING_LIST_FIELDS
+from services import serialization
+from services.serialization import FastJSONResponse, rows_to_dicts
+
+
+def make_rows(count: int, users: int):
+    """以記憶體中的 SQLite 產生 sqlite3.Row（與 aiosqlite 回傳的型別相同）"""
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute(
+        """
+        CREATE TABLE meetings (
+            id TEXT, user_id INTEGER, room TEXT, topic TEXT, start_time TEXT,
+            end_time TEXT, status TEXT, created_at TEXT
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT INTO meetings VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                f"mtg_01KE6DJ9J0B8Y9W5XJ{i:06d}", i % users + 1, f"會議室 {'ABCD'[i % 4]}",
+                f"週會 {i}" if i % 3 else None, f"2024-01-15T{8 + i % 10:02d}:{i % 60:02d}:00",
+                f"2024-01-15T{9 + i % 10:02d}:{i % 60:02d}:00", "completed", "2024-01-15T08:00:00",
+            )
+            for i in range(count)
+        ),
+    )
+    meetings = conn.execute("SELECT * FROM meetings").fetchall()
+    # 會議列表只查詢 MEETING_LIST_FIELDS，與正式查詢相同
+    list_rows = conn.execute(f"SELECT {', '.join(MEETING_LIST_FIELDS)} FROM meetings").fetchall()
+    users_rows = conn.execute(
+        "WITH RECURSIVE u(id) AS (SELECT 1 UNION ALL SELECT id + 1 FROM u WHERE id < ?) "
+        "SELECT id, 'user' || printf('%05d', id) || '@example.com' AS email, 'User ' || id AS name FROM u",
+        (users,),
+    ).fetchall()
+    conn.close()
+    return meetings, list_rows, users_rows
+
+
+# ---- 會議列表 ----
+
+def legacy_list(rows) -> bytes:
+    """舊版：逐欄以名稱取值組 dict，回傳後由 FastAPI 執行 jsonable_encoder 與 JSONResponse"""
+    content = {
+        "meetings": [
+            {
+                "id": m["id"],
+                "room": m["room"],
+                "start_time": m["start_time"],
+                "end_time": m["end_time"],
+                "status": m["status"],
+                "created_at": m["created_at"],
+            }
+            for m in rows
+        ],
+        "total": len(rows),
+        "limit": len(rows),
+        "offset": 0,
+        "next_cursor": None,
+    }
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def fast_list(rows) -> bytes:
+    return FastJSONResponse({
+        "meetings": rows_to_dicts(rows, MEETING_LIST_FIELDS),
+        "total": len(rows),
+        "limit": len(rows),
+        "offset": 0,
+        "next_cursor": None,
+    }).body
+
+
+# ---- 管理員概覽 ----
+
+def _group(meetings):
+    by_user = defaultdict(list)
+    for m in meetings:
+        by_user[m["user_id"]].append(m)
+    return by_user
+
+
+_overview_adapter = TypeAdapter(DailyOverviewResponse)
+
+
+def legacy_overview(meetings, users) -> bytes:
+    """舊版：逐筆建立 Pydantic 模型，再由 FastAPI 依 response_model 驗證並編碼"""
+    by_user = _group(meetings)
+    overviews = []
+    for user in users:
+        items = [
+            MeetingSummaryItem(
+                meeting_id=m["id"], topic=m["topic"], room=m["room"], start_time=m["start_time"],
+                end_time=m["end_time"], summary=None, attendees=["guest0", "guest1"],
+            )
+            for m in by_user.get(user["id"], [])
+        ]
+        overviews.append(UserMeetingOverview(
+            user_id=user["id"], email=user["email"], name=user["name"],
+            meeting_count=len(items), meetings=items,
+        ))
+    overviews.sort(key=lambda x: (-x.meeting_count, x.email))
+    response = DailyOverviewResponse(
+        date="2024-01-15",
+        total_users=len([u for u in overviews if u.meeting_count > 0]),
+        total_meetings=len(meetings),
+        users=overviews,
+    )
+    return _overview_adapter.dump_json(_overview_adapter.validate_python(response, from_attributes=True))
+
+
+def fast_overview(meetings, users) -> bytes:
+    by_user = _group(meetings)
+    overviews = []
+    for user_id, email, name in users:
+        items = [
+            {
+                "meeting_id": m["id"], "topic": m["topic"], "room": m["room"],
+                "start_time": m["start_time"], "end_time": m["end_time"], "summary": None,
+                "attendees": ["guest0", "guest1"],
+            }
+            for m in by_user.get(user_id, [])
+        ]
+        overviews.append({
+            "user_id": user_id, "email": email, "name": name,
+            "meeting_count": len(items), "meetings": items,
+        })
+    overviews.sort(key=lambda x: (-x["meeting_count"], x["email"]))
+    return FastJSONResponse({
+        "date": "2024-01-15",
+        "total_users": sum(1 for u in overviews if u["meeting_count"] > 0),
+        "total_meetings": len(meetings),
+        "users": overviews,
+    }).body
+
+
+def best_of(fn: Callable[[], bytes], repeat: int):
+    """回傳（最佳耗時秒數, 輸出）"""
+    best = float("inf")
+    body = b""
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - started)
+    return best, body
+
+
+def compare(name: str, legacy: Callable[[], bytes], fast: Callable[[], bytes], repeat: int) -> bool:
+    legacy_time, legacy_body = best_of(legacy, repeat)
+    fast_time, fast_body = best_of(fast, repeat)
+
+    orjson_module = serialization.orjson
+    serialization.orjson = None
+    try:
+        stdlib_time, stdlib_body = best_of(fast, repeat)
+    finally:
+        serialization.orjson = orjson_module
+
+    same = json.loads(legacy_body) == json.loads(fast_body) == json.loads(stdlib_body)
+    print(f"   {name}（{len(fast_body) / 1024:,.0f} KB）  輸出一致 {'✅' if same else '❌'}")
+    print(f"      舊版                     {legacy_time * 1000:>8.1f} ms")
+    if orjson_module is not None:
+        print(f"      快速路徑（orjson）       {fast_time * 1000:>8.1f} ms  (x{legacy_time / fast_time:.1f})")
+    print(f"      快速路徑（標準庫 json）  {stdlib_time * 1000:>8.1f} ms  (x{legacy_time / stdlib_time:.1f})")
+    return same and min(fast_time, stdlib_time) < legacy_time
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="JSON 序列化基準測試")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--users", type=int, default=1000, help="概覽中的用戶數")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    meetings, list_rows, users = make_rows(args.rows, args.users)
+    print(f"🧾 JSON 序列化基準測試：{args.rows:,} 筆會議、{args.users:,} 位用戶"
+          f"（orjson {'已安裝' if serialization.orjson else '未安裝'}）")
+
+    ok = compare("會議列表", lambda: legacy_list(list_rows), lambda: fast_list(list_rows), args.repeat)
+    ok = compare(
+        "管理員概覽",
+        lambda: legacy_overview(meetings, users),
+        lambda: fast_overview(meetings, users),
+        args.repeat,
+    ) and ok
+    print("🎉 通過" if ok else "❌ 失敗")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,306 @@
+"""
+端對端負載測試
+以 uvicorn 啟動 main:app（暫存資料庫），OpenAI 與 SMTP 改由本機替身服務（benchmarks.load_fakes）回應，
+模擬多位用戶同時開會：登入 → 開始會議 → 結束會議（上傳錄音）→ 輪詢處理狀態 → 讀取摘要
+
+報告各端點的 p50/p95/p99 延遲、吞吐量、從結束會議到取得摘要的時間，以及後端程序的 RSS 峰值
+
+使用方式（於 backend 目錄下）：
+
+    python -m benchmarks.bench_load --meetings 200 --concurrency 50
+    python -m benchmarks.bench_load --meetings 500 --concurrency 100 --whisper-latency 5 --gpt-latency 8
+
+有會議處理失敗、請求錯誤或寄出的 Email 數量不符時以非零狀態碼結束
+"""
+
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 每個端點的延遲（秒），list.append 在多執行緒下是安全的
+latencies: Dict[str, List[float]] = defaultdict(list)
+errors: Dict[str, int] = defaultdict(int)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(values: List[float], p: float) -> float:
+    """最近排名法的百分位數"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered) + 0.5)) - 1))]
+
+
+class Client:
+    """每個執行緒一條 keep-alive 連線，記錄每次請求的延遲"""
+
+    def __init__(self, port: int):
+        self.port = port
+        self._local = threading.local()
+
+    def _connection(self) -> http.client.HTTPConnection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = http.client.HTTPConnection("127.0.0.1", self.port, timeout=120)
+        return conn
+
+    def request(self, endpoint: str, method: str, path: str, body: Optional[bytes] = None,
+                headers: Optional[dict] = None):
+        """回傳（狀態碼, 回應標頭, 回應內容）；連線中斷時重新連線並重試一次"""
+        for attempt in range(2):
+            conn = self._connection()
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                response = conn.getresponse()
+                data = response.read()
+            except (ConnectionError, http.client.HTTPException):
+                conn.close()
+                self._local.conn = None
+                if attempt:
+                    errors[endpoint] += 1
+                    raise
+                continue
+            latencies[endpoint].append(time.perf_counter() - started)
+            if response.status >= 400:
+                errors[endpoint] += 1
+            return response.status, response.headers, data
+
+    def json(self, endpoint: str, method: str, path: str, payload: dict, token: Optional[str] = None):
+        headers = {"Content-Type": "application/json"}
+        if token:
+            headers["Authorization"] = f"Bearer {token}"
+        status, _, data = self.request(endpoint, method, path, json.dumps(payload).encode(), headers)
+        return status, json.loads(data) if data else None
+
+
+def _multipart_audio(audio: bytes) -> tuple:
+    boundary = uuid.uuid4().hex
+    body = (
+        f"--{boundary}\r\n"
+        'Content-Disposition: form-data; name="audio"; filename="recording.webm"\r\n'
+        "Content-Type: audio/webm\r\n\r\n"
+    ).encode() + audio + f"\r\n--{boundary}--\r\n".encode()
+    return body, f"multipart/form-data; boundary={boundary}"
+
+
+def run_meeting(client: Client, index: int, user: dict, audio: bytes, args) -> Optional[float]:
+    """
+    執行一場會議的完整流程
+
+    Returns:
+        從送出結束會議到取得摘要的秒數；處理失敗或逾時回傳 None
+    """
+    status, meeting = client.json("start", "POST", "/api/meetings/start", {
+        "room": f"會議室 {'ABCD'[index % 4]}",
+        "topic": f"負載測試 {index}",
+        "attendees": [
+            {"email": user["email"], "name": user["name"]},
+            {"email": f"guest{index % 7}@example.com", "name": None},
+        ],
+    }, token=user["token"])
+    if status != 200:
+        return None
+    meeting_id = meeting["meeting_id"]
+
+    # 開會中
+    time.sleep(args.meeting_seconds)
+
+    ended = time.perf_counter()
+    body, content_type = _multipart_audio(audio)
+    status, _, _ = client.request(
+        "end", "POST", f"/api/meetings/{meeting_id}/end", body, {"Content-Type": content_type}
+    )
+    if status != 200:
+        return None
+
+    # 以 If-None-Match 輪詢（與前端相同），狀態未變時回應 304
+    etag = None
+    deadline = ended + args.timeout
+    while time.perf_counter() < deadline:
+        time.sleep(args.poll_interval)
+        headers = {"If-None-Match": etag} if etag else {}
+        status, response_headers, data = client.request(
+            "status", "GET", f"/api/meetings/{meeting_id}/status", headers=headers
+        )
+        if status == 304:
+            continue
+        if status != 200:
+            return None
+        etag = response_headers.get("ETag")
+        state = json.loads(data)["status"]
+        if state == "failed":
+            return None
+        if state == "completed":
+            break
+    else:
+        errors["timeout"] += 1
+        return None
+
+    status, _, _ = client.request("summary", "GET", f"/api/meetings/{meeting_id}/summary")
+    if status != 200:
+        return None
+    return time.perf_counter() - ended
+
+
+def peak_rss_mb(pid: int) -> Optional[float]:
+    """程序的 RSS 峰值（Linux 的 VmHWM），無法取得時回傳 None"""
+    try:
+        for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+            if line.startswith("VmHWM:"):
+                return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def wait_until_ready(port: int, path: str, process: subprocess.Popen, timeout: float = 30.0):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"程序提前結束（exit code {process.returncode}）")
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", path)
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"{timeout:.0f} 秒內 {path} 未回應")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="端對端負載測試")
+    parser.add_argument("--meetings", type=int, default=200, help="總會議數")
+    parser.add_argument("--concurrency", type=int, default=50, help="同時進行的會議數")
+    parser.add_argument("--users", type=int, default=100, help="登入的用戶數（會議輪流分配）")
+    parser.add_argument("--whisper-latency", type=float, default=2.0, help="模擬轉錄延遲（秒）")
+    parser.add_argument("--gpt-latency", type=float, default=3.0, help="模擬摘要延遲（秒）")
+    parser.add_argument("--transcript-chars", type=int, default=6000, help="模擬逐字稿的字數")
+    parser.add_argument("--audio-kb", type=int, default=512, help="每場會議上傳的錄音大小")
+    parser.add_argument("--meeting-seconds", type=float, default=0.5, help="開始與結束會議之間的間隔")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="狀態輪詢間隔（秒）")
+    parser.add_argument("--timeout", type=float, default=300.0, help="單場會議處理逾時（秒）")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp(prefix="bench_load_")
+    openai_port, smtp_port, backend_port = _free_port(), _free_port(), _free_port()
+
+    fakes = subprocess.Popen(
+        [
+            sys.executable, "-m", "benchmarks.load_fakes",
+            "--openai-port", str(openai_port), "--smtp-port", str(smtp_port),
+            "--whisper-latency", str(args.whisper_latency), "--gpt-latency", str(args.gpt_latency),
+            "--transcript-chars", str(args.transcript_chars),
+        ],
+        cwd=BACKEND_DIR,
+    )
+    backend_log = open(Path(tmp_dir) / "backend.log", "w")
+    backend = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(backend_port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env={
+            **os.environ,
+            "DATABASE_PATH": str(Path(tmp_dir) / "load.db"),
+            "STORAGE_PATH": str(Path(tmp_dir) / "meetings"),
+            "ARCHIVE_PATH": str(Path(tmp_dir) / "archive"),
+            "STORAGE_COMPACTOR_ENABLED": "false",
+            "OPENAI_API_KEY": "sk-load-test",
+            "OPENAI_BASE_URL": f"http://127.0.0.1:{openai_port}/v1",
+            "SMTP_HOST": "127.0.0.1",
+            "SMTP_PORT": str(smtp_port),
+            "SMTP_USER": "load-test",
+            "SMTP_PASSWORD": "load-test",
+            "SMTP_TLS": "false",
+            "PYTHONUNBUFFERED": "1",
+        },
+        stdout=backend_log,
+        stderr=subprocess.STDOUT,
+    )
+
+    try:
+        wait_until_ready(openai_port, "/stats", fakes)
+        wait_until_ready(backend_port, "/health", backend)
+        client = Client(backend_port)
+        audio = b"\x1a\x45\xdf\xa3" + os.urandom(args.audio_kb * 1024)
+
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            def login(i: int) -> dict:
+                user = {"email": f"load{i:04d}@example.com", "name": f"Load User {i}"}
+                _, data = client.json("login", "POST", "/api/auth/login", user)
+                return {**user, "token": data["token"]}
+
+            users = list(pool.map(login, range(args.users)))
+
+            print(f"🏋️  負載測試：{args.meetings} 場會議、並行 {args.concurrency}、"
+                  f"Whisper {args.whisper_latency}s、GPT {args.gpt_latency}s（{tmp_dir}）")
+            started = time.perf_counter()
+            results = list(pool.map(
+                lambda i: run_meeting(client, i, users[i % len(users)], audio, args),
+                range(args.meetings),
+            ))
+            elapsed = time.perf_counter() - started
+
+        rss = peak_rss_mb(backend.pid)
+        conn = http.client.HTTPConnection("127.0.0.1", openai_port, timeout=5)
+        conn.request("GET", "/stats")
+        fake_stats = json.loads(conn.getresponse().read())
+    finally:
+        backend.terminate()
+        backend.wait()
+        fakes.terminate()
+        fakes.wait()
+        backend_log.close()
+
+    completed = [r for r in results if r is not None]
+    failed = len(results) - len(completed)
+    requests = sum(len(v) for k, v in latencies.items() if k != "login")
+
+    print(f"   總耗時 {elapsed:.1f} s：完成 {len(completed)} 場、失敗 {failed} 場")
+    print(f"   吞吐量 {len(completed) / elapsed * 60:.1f} 場/分鐘、{requests / elapsed:.1f} 請求/秒")
+    print(f"   {'端點':<10}{'次數':>8}{'錯誤':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}  (ms)")
+    for endpoint in ("login", "start", "end", "status", "summary"):
+        values = latencies.get(endpoint, [])
+        print(
+            f"   {endpoint:<10}{len(values):>8}{errors.get(endpoint, 0):>6}"
+            + "".join(f"{percentile(values, p) * 1000:>10.1f}" for p in (50, 95, 99))
+            + f"{max(values, default=0) * 1000:>10.1f}"
+        )
+    if completed:
+        print(
+            "   結束會議 → 取得摘要  "
+            + "  ".join(f"p{p} {percentile(completed, p):.2f}s" for p in (50, 95, 99))
+            + f"  （模擬 API 延遲合計 {args.whisper_latency + args.gpt_latency:.1f}s）"
+        )
+    print(f"   後端 RSS 峰值 {f'{rss:.0f} MB' if rss is not None else '無法取得'}")
+    print(f"   模擬服務：轉錄 {fake_stats['transcriptions']} 次、摘要 {fake_stats['completions']} 次、"
+          f"Email {fake_stats['emails']} 封（{fake_stats['recipients']} 位收件人）")
+
+    ok = failed == 0 and not errors and fake_stats["emails"] == len(completed)
+    if not ok:
+        print(f"   後端日誌：{Path(tmp_dir) / 'backend.log'}")
+    print("🎉 通過" if ok else "❌ 失敗")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+會議 ID 產生器壓力測試
+多執行緒大量產生 ID 並同時呼叫 start_meeting 建立會議，確認沒有重複且依時間排序
+
+使用方式（於 backend 目錄下）：
+
+    python -m benchmarks.bench_meeting_ids --meetings 5000 --concurrency 200
+
+發現重複 ID 或建立失敗時以非零狀態碼結束
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 使用暫存資料庫，避免動到正式資料
+_tmp_dir = tempfile.mkdtemp(prefix="bench_meeting_ids_")
+os.environ["DATABASE_PATH"] = str(Path(_tmp_dir) / "bench.db")
+os.environ["STORAGE_PATH"] = str(Path(_tmp_dir) / "meetings")
+
+import database  # noqa: E402
+from config import ensure_directories  # noqa: E402
+from models.meeting import MeetingCreate, AttendeeCreate  # noqa: E402
+from routers.meetings import generate_meeting_id, start_meeting  # noqa: E402
+
+
+def check_threads(threads: int, per_thread: int) -> bool:
+    """多執行緒產生 ID：全部唯一，且每個執行緒內嚴格遞增"""
+    def worker(_):
+        return [generate_meeting_id() for _ in range(per_thread)]
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - started
+
+    all_ids = [i for ids in results for i in ids]
+    unique = len(set(all_ids)) == len(all_ids)
+    ordered = all(ids == sorted(ids) and len(set(ids)) == len(ids) for ids in results)
+    print(
+        f"   執行緒 {threads} × {per_thread}：{len(all_ids) / elapsed:>12,.0f} ID/s   "
+        f"唯一 {'✅' if unique else '❌'}   遞增 {'✅' if ordered else '❌'}"
+    )
+    return unique and ordered
+
+
+async def check_start_meeting(meetings: int, concurrency: int) -> bool:
+    """同時呼叫 start_meeting，確認沒有主鍵衝突"""
+    ensure_directories()
+    await database.init_db()
+    semaphore = asyncio.Semaphore(concurrency)
+    failures = []
+
+    async def create(i: int):
+        async with semaphore:
+            try:
+                await start_meeting(
+                    MeetingCreate(
+                        room=f"會議室 {i % 20}",
+                        attendees=[AttendeeCreate(email=f"user{i}@example.com")],
+                    ),
+                    authorization=None,
+                )
+            except Exception as e:
+                failures.append(e)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(create(i) for i in range(meetings)))
+    elapsed = time.perf_counter() - started
+
+    async with database.get_db_session(readonly=True) as db:
+        cursor = await db.execute("SELECT COUNT(*) FROM meetings")
+        count = (await cursor.fetchone())[0]
+        cursor = await db.execute("SELECT id FROM meetings ORDER BY rowid")
+        ids = [row["id"] for row in await cursor.fetchall()]
+    await database.close_db()
+
+    ok = not failures and count == meetings
+    print(
+        f"   start_meeting × {meetings}（並行 {concurrency}）：{meetings / elapsed:>8,.0f} 場/s   "
+        f"寫入 {count} 場   失敗 {len(failures)}   "
+        f"插入順序即 ID 順序 {'✅' if ids == sorted(ids) else '⚠️'}"
+    )
+    if failures:
+        print(f"   第一個錯誤: {failures[0]!r}")
+    return ok
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="會議 ID 產生器壓力測試")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ids-per-thread", type=int, default=50000)
+    parser.add_argument("--meetings", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"🆔 會議 ID 壓力測試 ({_tmp_dir})")
+    ok = check_threads(args.threads, args.ids_per_thread)
+    ok = await check_start_meeting(args.meetings, args.concurrency) and ok
+    print("🎉 通過" if ok else "❌ 失敗")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,133 @@
+"""
+全文搜尋基準測試
+建立大量會議的 FTS5 索引後，量測 search_meetings 的查詢延遲
+
+使用方式（於 backend 目錄下）：
+
+    python -m benchmarks.bench_search --meetings 100000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 使用暫存資料庫，避免動到正式資料
+_tmp_dir = tempfile.mkdtemp(prefix="bench_search_")
+os.environ["DATABASE_PATH"] = str(Path(_tmp_dir) / "bench.db")
+os.environ["STORAGE_PATH"] = str(Path(_tmp_dir) / "meetings")
+
+import database  # noqa: E402
+from config import get_settings  # noqa: E402
+from services.search import search_meetings, user_rowid_range  # noqa: E402
+
+VOCABULARY = (
+    "預算 專案 進度 客戶 需求 報價 合約 交期 測試 上線 風險 人力 招募 行銷 活動 "
+    "供應商 採購 庫存 品質 良率 出貨 財務 報表 季度 目標 策略 會議 決議 待辦 負責人 "
+    "系統 架構 資料庫 效能 伺服器 部署 版本 功能 設計 介面 使用者 回饋 問題 修正"
+).split()
+
+QUERIES = ["資料庫 效能", "供應商", "季度目標", "上線", "客戶 需求 報價"]
+
+
+def _text(rng: random.Random, chars: int) -> str:
+    words = []
+    length = 0
+    while length < chars:
+        word = rng.choice(VOCABULARY)
+        words.append(word)
+        length += len(word)
+    return "，".join(words)
+
+
+def seed(meeting_count: int, user_count: int, transcript_chars: int):
+    rng = random.Random(7)
+    conn = sqlite3.connect(get_settings().database_path)
+    conn.executemany(
+        "INSERT INTO users (id, email) VALUES (?, ?)",
+        ((i, f"user{i}@example.com") for i in range(1, user_count + 1)),
+    )
+    base = datetime(2024, 1, 1)
+    next_seq = {}
+    batch_meetings = []
+    batch_search = []
+    for i in range(meeting_count):
+        meeting_id = f"mtg_{i:08d}"
+        user_id = rng.randint(1, user_count)
+        batch_meetings.append((
+            meeting_id, user_id, "會議室 A", f"主題 {rng.choice(VOCABULARY)}",
+            (base + timedelta(minutes=i)).isoformat(), "completed",
+        ))
+        next_seq[user_id] = next_seq.get(user_id, -1) + 1
+        batch_search.append((
+            user_rowid_range(user_id)[0] + next_seq[user_id], meeting_id, user_id, f"主題 {rng.choice(VOCABULARY)}",
+            _text(rng, transcript_chars // 5), _text(rng, transcript_chars),
+        ))
+        if len(batch_meetings) >= 5000:
+            _flush(conn, batch_meetings, batch_search)
+    _flush(conn, batch_meetings, batch_search)
+    conn.execute("INSERT INTO meeting_search(meeting_search) VALUES ('optimize')")
+    conn.commit()
+    conn.close()
+
+
+def _flush(conn, batch_meetings, batch_search):
+    conn.executemany(
+        "INSERT INTO meetings (id, user_id, room, topic, start_time, status) VALUES (?, ?, ?, ?, ?, ?)",
+        batch_meetings,
+    )
+    conn.executemany(
+        """
+        INSERT INTO meeting_search (rowid, meeting_id, user_id, topic, summary, transcript)
+        VALUES (?, ?, ?, ?, ?, ?)
+        """,
+        batch_search,
+    )
+    conn.commit()
+    batch_meetings.clear()
+    batch_search.clear()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="全文搜尋基準測試")
+    parser.add_argument("--meetings", type=int, default=100000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--transcript-chars", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    await database.init_db()
+    await database.close_db()
+    print(f"🗄️  建立測試資料：{args.meetings} 場會議 ({_tmp_dir})")
+    started = time.perf_counter()
+    seed(args.meetings, args.users, args.transcript_chars)
+    print(f"   耗時 {time.perf_counter() - started:.1f} 秒")
+
+    rng = random.Random(11)
+    async with database.get_db_session(readonly=True) as db:
+        for query in QUERIES:
+            timings = []
+            hits = 0
+            for _ in range(args.repeat):
+                user_id = rng.randint(1, args.users)
+                t0 = time.perf_counter()
+                results = await search_meetings(db, user_id, query, limit=20)
+                timings.append((time.perf_counter() - t0) * 1000)
+                hits += len(results)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1]
+            print(
+                f"   「{query}」 p50 {statistics.median(timings):7.2f} ms"
+                f"  p95 {p95:7.2f} ms  平均命中 {hits / args.repeat:.1f}"
+            )
+    await database.close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
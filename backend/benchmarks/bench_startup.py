@@ -0,0 +1,125 @@
+"""
+服務啟動時間基準測試
+每次都在新的 Python 程序中量測：
+- 匯入 main（建立 FastAPI app）所需的時間，以及匯入後是否載入了應延遲載入的套件
+- 從啟動 uvicorn 到第一次 /health 回應 200 的時間
+
+使用方式（於 backend 目錄下）：
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --runs 5 --import-budget-ms 1000 --health-budget-ms 2000
+
+中位數超過預算，或啟動時載入了 LAZY_MODULES 中的套件時以非零狀態碼結束
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+# 只在處理會議時才需要的套件，不應在啟動時載入
+LAZY_MODULES = ("openai", "aiosmtplib")
+
+_IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+
+def _env(tmp_dir: str) -> dict:
+    """使用暫存資料庫與儲存目錄，避免動到正式資料"""
+    return {
+        **os.environ,
+        "DATABASE_PATH": str(Path(tmp_dir) / "startup.db"),
+        "STORAGE_PATH": str(Path(tmp_dir) / "meetings"),
+        "ARCHIVE_PATH": str(Path(tmp_dir) / "archive"),
+        "STORAGE_COMPACTOR_ENABLED": "false",
+    }
+
+
+def measure_import(tmp_dir: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE],
+        cwd=BACKEND_DIR, env=_env(tmp_dir), capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_health(tmp_dir: str, timeout: float = 30.0) -> float:
+    """啟動 uvicorn 並輪詢 /health，回傳從啟動程序到第一次 200 回應的秒數"""
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=_env(tmp_dir), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn 提前結束（exit code {server.returncode}）")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"{timeout:.0f} 秒內 /health 未回應")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="服務啟動時間基準測試")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=1000)
+    parser.add_argument("--health-budget-ms", type=float, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="bench_startup_") as tmp_dir:
+        imports = [measure_import(tmp_dir) for _ in range(args.runs)]
+        healths = [measure_first_health(tmp_dir) for _ in range(args.runs)]
+
+    import_ms = statistics.median(r["seconds"] for r in imports) * 1000
+    health_ms = statistics.median(healths) * 1000
+    loaded = sorted({m for r in imports for m in r["loaded"]})
+
+    ok = True
+    print(f"🚀 服務啟動時間（{args.runs} 次的中位數）")
+    for name, value, budget in (
+        ("匯入 main", import_ms, args.import_budget_ms),
+        ("啟動到第一次 /health", health_ms, args.health_budget_ms),
+    ):
+        within = value <= budget
+        ok = ok and within
+        print(f"   {name:<22} {value:>8.0f} ms  （預算 {budget:.0f} ms）{'✅' if within else '❌'}")
+    if loaded:
+        ok = False
+        print(f"❌ 啟動時載入了應延遲載入的套件：{', '.join(loaded)}")
+    else:
+        print(f"   未載入 {', '.join(LAZY_MODULES)} ✅")
+
+    print("🎉 通過" if ok else "❌ 失敗")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,155 @@
+"""
+寫入合併基準測試
+模擬多場會議同時結束（end_meeting 的與會者更新＋狀態更新），
+比較逐筆 execute + commit 與 WriteBatch 合併提交的吞吐量與延遲
+
+使用方式（於 backend 目錄下）：
+
+    python -m benchmarks.bench_write_batching --writers 64 --seconds 5
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 使用暫存資料庫，避免動到正式資料
+_tmp_dir = tempfile.mkdtemp(prefix="bench_write_batching_")
+os.environ["DATABASE_PATH"] = str(Path(_tmp_dir) / "bench.db")
+os.environ["STORAGE_PATH"] = str(Path(_tmp_dir) / "meetings")
+
+import database  # noqa: E402
+from config import get_settings  # noqa: E402
+
+ATTENDEES_PER_MEETING = 5
+
+
+async def seed(meeting_count: int):
+    """建立測試資料"""
+    await database.init_db()
+    db = await database.get_db()
+    base = datetime(2024, 1, 1)
+    await db.executemany(
+        "INSERT INTO meetings (id, room, start_time, status) VALUES (?, ?, ?, ?)",
+        [
+            (f"mtg_{i:08d}", "會議室 A", (base + timedelta(minutes=i)).isoformat(), "recording")
+            for i in range(meeting_count)
+        ],
+    )
+    await db.commit()
+    await database.close_db()
+
+
+def _attendee_rows(meeting_id: str) -> list:
+    return [
+        (meeting_id, f"user{j}@example.com", f"User {j}")
+        for j in range(ATTENDEES_PER_MEETING)
+    ]
+
+
+async def end_meeting_direct(db, meeting_id: str):
+    """原本的寫法：逐筆 INSERT 後各自 commit"""
+    await db.execute("DELETE FROM attendees WHERE meeting_id = ?", (meeting_id,))
+    for row in _attendee_rows(meeting_id):
+        await db.execute(
+            "INSERT INTO attendees (meeting_id, email, name) VALUES (?, ?, ?)", row
+        )
+    await db.execute(
+        "UPDATE meetings SET status = ?, updated_at = ? WHERE id = ?",
+        ("processing", datetime.now().isoformat(), meeting_id),
+    )
+    await db.commit()
+
+
+async def end_meeting_batched(meeting_id: str):
+    """WriteBatch：executemany 並交由合併器提交"""
+    await (
+        database.WriteBatch()
+        .execute("DELETE FROM attendees WHERE meeting_id = ?", (meeting_id,))
+        .executemany(
+            "INSERT INTO attendees (meeting_id, email, name) VALUES (?, ?, ?)",
+            _attendee_rows(meeting_id),
+        )
+        .execute(
+            "UPDATE meetings SET status = ?, updated_at = ? WHERE id = ?",
+            ("processing", datetime.now().isoformat(), meeting_id),
+        )
+        .commit()
+    )
+
+
+async def run(mode: str, meeting_count: int, writers: int, seconds: float) -> dict:
+    db = await database.get_db()
+    latencies = []
+    deadline = time.perf_counter() + seconds
+
+    async def writer():
+        while time.perf_counter() < deadline:
+            meeting_id = f"mtg_{random.randrange(meeting_count):08d}"
+            started = time.perf_counter()
+            if mode == "direct":
+                await end_meeting_direct(db, meeting_id)
+            else:
+                await end_meeting_batched(meeting_id)
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(writer() for _ in range(writers)))
+    elapsed = time.perf_counter() - started
+
+    if mode == "direct":
+        # 每個寫入各自呼叫一次 commit
+        commits = len(latencies)
+    else:
+        commits = database.write_coalescer.commits
+    await database.close_db()
+
+    latencies.sort()
+    return {
+        "writes_per_sec": len(latencies) / elapsed,
+        "commits_per_sec": commits / elapsed,
+        "p50": latencies[len(latencies) // 2] if latencies else 0.0,
+        "p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="寫入合併基準測試")
+    parser.add_argument("--meetings", type=int, default=5000)
+    parser.add_argument("--writers", type=int, default=64, help="同時寫入的工作數")
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--window-ms", type=float, nargs="+", default=[1.0, 2.0, 5.0])
+    parser.add_argument("--synchronous", default=None, help="覆寫 DB_SYNCHRONOUS（例如 FULL）")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    if args.synchronous:
+        settings.db_synchronous = args.synchronous
+
+    print(f"🗄️  建立測試資料：{args.meetings} 場會議 ({_tmp_dir})")
+    await seed(args.meetings)
+    print(f"   synchronous={settings.db_synchronous}  writers={args.writers}")
+
+    def report(label: str, result: dict):
+        print(
+            f"   {label:<16} 寫入 {result['writes_per_sec']:>8,.0f}/s   "
+            f"commit {result['commits_per_sec']:>8,.0f}/s   "
+            f"p50 {result['p50']:>7.2f} ms   p99 {result['p99']:>7.2f} ms"
+        )
+
+    report("逐筆 commit", await run("direct", args.meetings, args.writers, args.seconds))
+    for window_ms in args.window_ms:
+        settings.db_write_batch_window_ms = window_ms
+        database.write_coalescer = database.WriteCoalescer()
+        report(
+            f"合併 {window_ms:g} ms",
+            await run("batched", args.meetings, args.writers, args.seconds),
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
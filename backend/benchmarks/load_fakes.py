@@ -0,0 +1,160 @@
+"""
+負載測試用的本機替身服務
+- 模擬 OpenAI API：/v1/audio/transcriptions（Whisper）與 /v1/chat/completions（GPT），可設定回應延遲
+- SMTP 收件器：接受 AUTH/MAIL/RCPT/DATA 並計數，不實際寄出
+
+兩者在同一個事件迴圈中執行，由 bench_load 以獨立程序啟動，避免與受測的後端搶 CPU；
+也可以單獨啟動供手動測試：
+
+    python -m benchmarks.load_fakes --openai-port 8900 --smtp-port 8925 --whisper-latency 2 --gpt-latency 3
+
+後端設定 OPENAI_BASE_URL=http://127.0.0.1:8900/v1、SMTP_HOST=127.0.0.1、SMTP_PORT=8925、SMTP_TLS=false
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+
+stats = {
+    "transcriptions": 0,
+    "completions": 0,
+    "emails": 0,
+    "recipients": 0,
+}
+
+TRANSCRIPT_LINE = "王經理：第三季的預算需要重新分配，請各部門在週五前回報目前的進度與風險。\n"
+
+SUMMARY_TEMPLATE = """# 會議摘要
+
+日期：{date}
+地點：會議室 A
+
+---
+
+## 會議重點
+- 第三季預算重新分配
+- 各部門週五前回報進度
+- 確認上線時程與風險
+
+## 決議事項
+- 行銷預算調整 10% 至產品開發
+
+## 待辦事項
+- [ ] 財務部：更新預算表（週五前）
+"""
+
+
+def create_app(whisper_latency: float, gpt_latency: float, jitter: float, transcript_chars: int) -> FastAPI:
+    app = FastAPI()
+    transcript = TRANSCRIPT_LINE * max(1, transcript_chars // len(TRANSCRIPT_LINE))
+
+    async def delay(seconds: float):
+        if seconds > 0:
+            await asyncio.sleep(max(0.0, seconds * (1 + random.uniform(-jitter, jitter))))
+
+    @app.post("/v1/audio/transcriptions")
+    async def transcriptions(request: Request):
+        # 讀完上傳的音檔（與真實 API 相同，上傳時間計入延遲）
+        await request.body()
+        await delay(whisper_latency)
+        stats["transcriptions"] += 1
+        return PlainTextResponse(transcript)
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        await delay(gpt_latency)
+        stats["completions"] += 1
+        return {
+            "id": f"chatcmpl-{stats['completions']}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "gpt-4o"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": SUMMARY_TEMPLATE.format(date=time.strftime("%Y-%m-%d"))},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": len(transcript), "completion_tokens": 200, "total_tokens": len(transcript) + 200},
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return stats
+
+    return app
+
+
+async def handle_smtp(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """極簡 SMTP 伺服器：所有指令皆回應成功，DATA 讀到單獨一行的 . 為止"""
+    def reply(line: str):
+        writer.write(f"{line}\r\n".encode())
+
+    reply("220 load-test SMTP sink")
+    recipients = 0
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line.decode("utf-8", "replace").strip().upper()
+            if command.startswith("EHLO"):
+                reply("250-load-test")
+                reply("250-AUTH PLAIN LOGIN")
+                reply("250 8BITMIME")
+            elif command.startswith("HELO"):
+                reply("250 load-test")
+            elif command.startswith("AUTH"):
+                reply("235 2.7.0 Authentication successful")
+            elif command.startswith("MAIL"):
+                recipients = 0
+                reply("250 OK")
+            elif command.startswith("RCPT"):
+                recipients += 1
+                reply("250 OK")
+            elif command == "DATA":
+                reply("354 End data with <CR><LF>.<CR><LF>")
+                while (await reader.readline()).rstrip(b"\r\n") != b".":
+                    pass
+                stats["emails"] += 1
+                stats["recipients"] += recipients
+                reply("250 OK queued")
+            elif command == "QUIT":
+                reply("221 Bye")
+                await writer.drain()
+                break
+            else:
+                reply("250 OK")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(args):
+    smtp_server = await asyncio.start_server(handle_smtp, "127.0.0.1", args.smtp_port)
+    app = create_app(args.whisper_latency, args.gpt_latency, args.jitter, args.transcript_chars)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.openai_port, log_level="warning"))
+    async with smtp_server:
+        await server.serve()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="負載測試用的 OpenAI 模擬伺服器與 SMTP 收件器")
+    parser.add_argument("--openai-port", type=int, default=8900)
+    parser.add_argument("--smtp-port", type=int, default=8925)
+    parser.add_argument("--whisper-latency", type=float, default=2.0, help="轉錄回應延遲（秒）")
+    parser.add_argument("--gpt-latency", type=float, default=3.0, help="摘要回應延遲（秒）")
+    parser.add_argument("--jitter", type=float, default=0.2, help="延遲的隨機浮動比例")
+    parser.add_argument("--transcript-chars", type=int, default=6000, help="模擬逐字稿的字數")
+    asyncio.run(serve(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -28,12 +28,52 @@ class Settings(BaseSettings):
     
     # 資料庫
     database_path: str = "./data/meetings.db"
+    db_reader_count: int = 4            # 唯讀連線數（0 表示讀寫共用單一連線）
+    db_busy_timeout_ms: int = 5000      # 遇到鎖定時的等待上限
+    db_synchronous: str = "NORMAL"      # WAL 模式下 NORMAL 即可保證一致性
+    db_cache_size_kb: int = 16384       # 每條連線的 page cache 大小
+    db_mmap_size_mb: int = 256          # 記憶體映射讀取大小
+    db_write_batch_window_ms: float = 2.0   # 批次寫入的合併時間窗
+    db_write_batch_max: int = 200           # 單次 COMMIT 最多合併的批次數
+    
+    # 認證 Token 快取
+    auth_cache_size: int = 10000
+    auth_cache_ttl_seconds: float = 300.0
+    
+    # 摘要/逐字稿內容快取（以位元組計算容量）
+    artifact_cache_max_mb: int = 64
+    
+    # 管理員每日概覽：並行讀取摘要檔的執行緒數
+    admin_overview_read_workers: int = 8
+    
+    # 會議狀態推送（SSE / WebSocket）
+    events_heartbeat_seconds: float = 15.0  # 閒置時的心跳間隔，同時重新確認一次 DB 狀態
+    
+    # 請求效能剖析
+    profiling_enabled: bool = True
+    profiling_slow_request_ms: float = 1000.0   # 請求超過此耗時即取樣呼叫堆疊並存成剖析檔（0 表示停用）
+    profiling_sample_interval_ms: float = 10.0  # 堆疊取樣間隔
+    profiling_max_profiles: int = 200           # 保留的剖析檔數量上限（超過時刪除最舊的）
+    profiles_path: str = "./data/profiles"
     
     # 檔案儲存
     storage_path: str = "./data/meetings"
+    archive_path: str = "./data/archive"        # 音檔封存層
+    storage_compress_after_days: int = 7        # 逐字稿/摘要超過天數後壓縮
+    storage_archive_after_days: int = 30        # 音檔超過天數後移至封存層
+    storage_compactor_enabled: bool = True
+    storage_compactor_interval_seconds: float = 3600.0
+    storage_compactor_batch_size: int = 100     # 每輪最多處理的檔案數
+    storage_compactor_io_mb_per_sec: float = 10.0   # 壓縮器讀寫頻寬上限（0 表示不限）
+    
+    # 音檔播放：設定 prefix 後改由前端 nginx 以 sendfile 傳送（X-Accel-Redirect），
+    # nginx 需有 internal location 將 prefix 對應到 root 目錄
+    audio_accel_redirect_prefix: str = ""       # 例如 /_protected_audio
+    audio_accel_redirect_root: str = "./data"   # storage_path 與 archive_path 共同的上層目錄
     
     # OpenAI API
     openai_api_key: str = ""
+    openai_base_url: str = ""           # 空白表示官方 API；可指向相容的代理或本機模擬伺服器
     whisper_model: str = "whisper-1"
     gpt_model: str = "gpt-4o"
     
@@ -43,6 +83,7 @@ class Settings(BaseSettings):
     smtp_user: str = ""
     smtp_password: str = ""
     smtp_from_name: str = "會議室 AI 系統"
+    smtp_tls: bool = True               # False 時以明文連線（僅限本機轉送或測試用的 SMTP）
     
     # 會議室設定
     default_room: str = "會議室 A"
@@ -71,4 +112,7 @@ def ensure_directories():
     # 檔案儲存目錄
     storage_path = Path(settings.storage_path)
     storage_path.mkdir(parents=True, exist_ok=True)
+    
+    # 封存目錄
+    Path(settings.archive_path).mkdir(parents=True, exist_ok=True)
 
@@ -1,41 +1,128 @@
 """
 資料庫模組
 使用 SQLite + aiosqlite 進行非同步操作
+
+連線配置：
+- 一條寫入連線（所有寫入都經由此連線，避免 SQLite 寫鎖競爭）
+- N 條唯讀連線組成的連線池（WAL 模式下讀取不會被寫入阻塞）
+- 一條批次寫入連線，將短時間內多個任務的寫入合併為單一交易（group commit）
 """
 
-from typing import Optional
+import asyncio
+import contextvars
+import hashlib
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Sequence, Tuple
 import aiosqlite
 from pathlib import Path
 from contextlib import asynccontextmanager
 from config import get_settings
+from services.profiling import instrument_connection, track_db
 
-# 資料庫連線池
+# 寫入連線
 _db_connection: Optional[aiosqlite.Connection] = None
 
+# 唯讀連線池（aiosqlite 連線各自擁有一條背景執行緒，會依序執行送入的查詢，
+# 因此以輪替方式分派即可，不需獨佔借用）
+_reader_connections: List[aiosqlite.Connection] = []
+_reader_index = 0
+_reader_pool_lock: Optional[asyncio.Lock] = None
+
+
+async def _connect(readonly: bool = False, **kwargs) -> aiosqlite.Connection:
+    """建立連線並套用 PRAGMA 設定（kwargs 直接傳給 sqlite3.connect）"""
+    settings = get_settings()
+    db_path = Path(settings.database_path)
+    
+    # 確保目錄存在
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    conn = await aiosqlite.connect(
+        str(db_path),
+        timeout=settings.db_busy_timeout_ms / 1000,
+        **kwargs,
+    )
+    conn.row_factory = aiosqlite.Row
+    instrument_connection(conn)
+    
+    try:
+        await _apply_pragmas(conn, settings, readonly)
+    except Exception:
+        # 設定失敗時關閉連線，避免留下背景執行緒
+        await conn.close()
+        raise
+    
+    return conn
+
+
+async def _apply_pragmas(conn: aiosqlite.Connection, settings, readonly: bool):
+    """套用連線的 PRAGMA 設定"""
+    # 啟用外鍵約束
+    await conn.execute("PRAGMA foreign_keys = ON")
+    await conn.execute(f"PRAGMA busy_timeout = {int(settings.db_busy_timeout_ms)}")
+    if not readonly:
+        # WAL 模式會持久化在資料庫檔案中，由寫入連線設定一次即可
+        await conn.execute("PRAGMA journal_mode = WAL")
+    await conn.execute(f"PRAGMA synchronous = {settings.db_synchronous}")
+    await conn.execute(f"PRAGMA cache_size = -{int(settings.db_cache_size_kb)}")
+    await conn.execute(f"PRAGMA mmap_size = {int(settings.db_mmap_size_mb) * 1024 * 1024}")
+    await conn.execute("PRAGMA temp_store = MEMORY")
+    if readonly:
+        await conn.execute("PRAGMA query_only = ON")
+
 
 async def get_db() -> aiosqlite.Connection:
-    """取得資料庫連線"""
+    """
+    取得資料庫連線（主連線）
+    
+    服務執行期間所有寫入都經由 WriteBatch 交給 write_coalescer 的專用連線，
+    這條連線只用於查詢；scripts/ 下的離線維護腳本（重建統計、搜尋索引）才會以它直接寫入，
+    與執行中的服務同時寫入時由 busy_timeout 排隊等待
+    """
     global _db_connection
     
     if _db_connection is None:
-        settings = get_settings()
-        db_path = Path(settings.database_path)
-        
-        # 確保目錄存在
-        db_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        _db_connection = await aiosqlite.connect(str(db_path))
-        _db_connection.row_factory = aiosqlite.Row
-        
-        # 啟用外鍵約束
-        await _db_connection.execute("PRAGMA foreign_keys = ON")
+        _db_connection = await _connect()
     
     return _db_connection
 
 
+async def _get_reader() -> Optional[aiosqlite.Connection]:
+    """輪替取得一條唯讀連線（首次使用時建立連線池）"""
+    global _reader_index, _reader_pool_lock
+    
+    settings = get_settings()
+    if settings.db_reader_count <= 0:
+        return None
+    
+    if not _reader_connections:
+        if _reader_pool_lock is None:
+            _reader_pool_lock = asyncio.Lock()
+        async with _reader_pool_lock:
+            if not _reader_connections:
+                # 先確保寫入連線已開啟 WAL，唯讀連線才能與寫入並行
+                await get_db()
+                readers = [
+                    await _connect(readonly=True)
+                    for _ in range(settings.db_reader_count)
+                ]
+                _reader_connections.extend(readers)
+    
+    _reader_index = (_reader_index + 1) % len(_reader_connections)
+    return _reader_connections[_reader_index]
+
+
 async def close_db():
     """關閉資料庫連線"""
-    global _db_connection
+    global _db_connection, _reader_pool_lock
+    
+    for conn in _reader_connections:
+        await conn.close()
+    _reader_connections.clear()
+    _reader_pool_lock = None
+    
+    await write_coalescer.close()
     
     if _db_connection is not None:
         await _db_connection.close()
@@ -79,12 +166,56 @@ async def init_db():
         )
     """)
     
+    # 嘗試添加 meeting_count 欄位（如果不存在），由觸發器維護，避免每次 COUNT(*)
+    try:
+        await db.execute(
+            "ALTER TABLE users ADD COLUMN meeting_count INTEGER NOT NULL DEFAULT 0"
+        )
+        # 新增欄位時回填既有會議數
+        await db.execute("""
+            UPDATE users SET meeting_count = (
+                SELECT COUNT(*) FROM meetings WHERE meetings.user_id = users.id
+            )
+        """)
+    except Exception:
+        pass  # 欄位已存在
+    
+    # 嘗試添加 meetings_version 欄位（如果不存在），用戶的任何會議新增/修改/刪除時遞增，
+    # 作為會議列表 ETag 的依據，不必掃描該用戶所有會議的 updated_at
+    try:
+        await db.execute(
+            "ALTER TABLE users ADD COLUMN meetings_version INTEGER NOT NULL DEFAULT 0"
+        )
+    except Exception:
+        pass  # 欄位已存在
+    
+    # 將舊版明文 Token 轉為 SHA-256 雜湊（雜湊值固定為 64 字元）
+    cursor = await db.execute(
+        "SELECT id, auth_token FROM users WHERE auth_token IS NOT NULL AND length(auth_token) != 64"
+    )
+    plaintext_tokens = await cursor.fetchall()
+    if plaintext_tokens:
+        await db.executemany(
+            "UPDATE users SET auth_token = ? WHERE id = ?",
+            [
+                (hashlib.sha256(row["auth_token"].encode("utf-8")).hexdigest(), row["id"])
+                for row in plaintext_tokens
+            ]
+        )
+    
     # 嘗試添加 topic 欄位（如果不存在）
     try:
         await db.execute("ALTER TABLE meetings ADD COLUMN topic TEXT")
     except Exception:
         pass  # 欄位已存在
     
+    # 嘗試添加處理統計欄位（如果不存在）
+    for column in ("transcript_chars INTEGER", "processing_seconds REAL"):
+        try:
+            await db.execute(f"ALTER TABLE meetings ADD COLUMN {column}")
+        except Exception:
+            pass  # 欄位已存在
+    
     # 建立與會者表
     await db.execute("""
         CREATE TABLE IF NOT EXISTS attendees (
@@ -98,6 +229,81 @@ async def init_db():
         )
     """)
     
+    # 建立每日統計彙總表（每位用戶每天一列，由 process_meeting 更新）
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS daily_user_stats (
+            user_id INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            meeting_count INTEGER NOT NULL DEFAULT 0,
+            failed_count INTEGER NOT NULL DEFAULT 0,
+            audio_minutes REAL NOT NULL DEFAULT 0,
+            transcript_chars INTEGER NOT NULL DEFAULT 0,
+            processing_seconds REAL NOT NULL DEFAULT 0,
+            updated_at DATETIME,
+            PRIMARY KEY (user_id, date),
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    """)
+    
+    # 建立每日業務日誌表（每位用戶每天一列，會議完成時增量更新，版本不符時於讀取時重建）
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS daily_digests (
+            user_id INTEGER NOT NULL,
+            date TEXT NOT NULL,
+            items TEXT NOT NULL,
+            meeting_count INTEGER NOT NULL DEFAULT 0,
+            source_version TEXT NOT NULL,
+            updated_at DATETIME,
+            PRIMARY KEY (user_id, date),
+            FOREIGN KEY (user_id) REFERENCES users(id)
+        )
+    """)
+    
+    # 建立檔案位置索引（記錄音檔/逐字稿/摘要目前所在的儲存層與路徑）
+    cursor = await db.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meeting_artifacts'"
+    )
+    artifacts_exist = await cursor.fetchone() is not None
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS meeting_artifacts (
+            meeting_id TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            tier TEXT NOT NULL DEFAULT 'hot',
+            path TEXT NOT NULL,
+            size_bytes INTEGER,
+            stored_bytes INTEGER,
+            updated_at DATETIME,
+            PRIMARY KEY (meeting_id, kind),
+            FOREIGN KEY (meeting_id) REFERENCES meetings(id) ON DELETE CASCADE
+        )
+    """)
+    if not artifacts_exist:
+        # 新建表時以 meetings 既有路徑回填（大小由壓縮器處理時補上）
+        for kind, column in (
+            ("audio", "audio_path"),
+            ("transcript", "transcript_path"),
+            ("summary", "summary_path"),
+        ):
+            await db.execute(
+                f"""
+                INSERT OR IGNORE INTO meeting_artifacts (meeting_id, kind, tier, path, updated_at)
+                SELECT id, ?, 'hot', {column}, updated_at FROM meetings WHERE {column} IS NOT NULL
+                """,
+                (kind,)
+            )
+    
+    # 建立全文搜尋表（trigram 分詞支援中文子字串搜尋）
+    await db.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS meeting_search USING fts5(
+            meeting_id UNINDEXED,
+            user_id UNINDEXED,
+            topic,
+            summary,
+            transcript,
+            tokenize = 'trigram'
+        )
+    """)
+    
     # 建立索引
     await db.execute("""
         CREATE INDEX IF NOT EXISTS idx_meetings_status 
@@ -131,17 +337,357 @@ async def init_db():
         ON meetings(user_id)
     """)
     
+    # 用戶會議列表的 keyset 分頁（ORDER BY created_at DESC, id DESC）
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_meetings_user_created_id
+        ON meetings(user_id, created_at, id)
+    """)
+    
+    # 依日期範圍查詢（管理員每日概覽）
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_meetings_start_time
+        ON meetings(start_time)
+    """)
+    
+    # 依用戶 + 日期範圍查詢（每日總結、用戶會議詳情）
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_meetings_user_start_time
+        ON meetings(user_id, start_time)
+    """)
+    
+    # 每日統計依日期查詢（管理員統計）
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_daily_user_stats_date
+        ON daily_user_stats(date)
+    """)
+    
+    # 壓縮器依儲存層挑選候選檔案
+    await db.execute("""
+        CREATE INDEX IF NOT EXISTS idx_meeting_artifacts_tier
+        ON meeting_artifacts(tier)
+    """)
+    
+    # 維護 users.meeting_count 的觸發器
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_meetings_count_insert
+        AFTER INSERT ON meetings
+        WHEN NEW.user_id IS NOT NULL
+        BEGIN
+            UPDATE users SET meeting_count = meeting_count + 1 WHERE id = NEW.user_id;
+        END
+    """)
+    
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_meetings_count_delete
+        AFTER DELETE ON meetings
+        WHEN OLD.user_id IS NOT NULL
+        BEGIN
+            UPDATE users SET meeting_count = meeting_count - 1 WHERE id = OLD.user_id;
+        END
+    """)
+    
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_meetings_count_update
+        AFTER UPDATE OF user_id ON meetings
+        WHEN OLD.user_id IS NOT NEW.user_id
+        BEGIN
+            UPDATE users SET meeting_count = meeting_count - 1 WHERE id = OLD.user_id;
+            UPDATE users SET meeting_count = meeting_count + 1 WHERE id = NEW.user_id;
+        END
+    """)
+    
+    # 維護 users.meetings_version 的觸發器
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_meetings_version_insert
+        AFTER INSERT ON meetings
+        WHEN NEW.user_id IS NOT NULL
+        BEGIN
+            UPDATE users SET meetings_version = meetings_version + 1 WHERE id = NEW.user_id;
+        END
+    """)
+    
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_meetings_version_delete
+        AFTER DELETE ON meetings
+        WHEN OLD.user_id IS NOT NULL
+        BEGIN
+            UPDATE users SET meetings_version = meetings_version + 1 WHERE id = OLD.user_id;
+        END
+    """)
+    
+    await db.execute("""
+        CREATE TRIGGER IF NOT EXISTS trg_meetings_version_update
+        AFTER UPDATE ON meetings
+        WHEN OLD.user_id IS NOT NULL OR NEW.user_id IS NOT NULL
+        BEGIN
+            UPDATE users SET meetings_version = meetings_version + 1
+            WHERE id IN (OLD.user_id, NEW.user_id);
+        END
+    """)
+    
     await db.commit()
     print("✅ 資料庫初始化完成")
 
 
 @asynccontextmanager
-async def get_db_session():
-    """資料庫會話上下文管理器"""
+async def get_db_session(readonly: bool = False):
+    """
+    資料庫會話上下文管理器
+    
+    Args:
+        readonly: True 時從唯讀連線池取得連線（只能執行查詢），
+                  False 時使用寫入連線，發生例外時自動 rollback
+    """
+    reader = await _get_reader() if readonly else None
+    
+    if reader is not None:
+        yield reader
+        return
+    
     db = await get_db()
     try:
         yield db
     except Exception:
-        await db.rollback()
+        if not readonly:
+            await db.rollback()
         raise
 
+
+@asynccontextmanager
+async def dedicated_reader():
+    """
+    長時間查詢專用的唯讀連線（用完即關閉）
+
+    游標未關閉前，連線會一直停留在同一個 WAL 快照；若使用共用的唯讀連線池，
+    輪替到該連線的其他請求都會讀到舊資料，checkpoint 也無法完成。
+    逐批讀取大量資料列（例如批次匯出）時應使用獨立連線
+    """
+    # 先確保寫入連線已開啟 WAL
+    await get_db()
+    conn = await _connect(readonly=True)
+    try:
+        yield conn
+    finally:
+        await conn.close()
+
+
+# ========== 批次寫入（group commit） ==========
+
+class WriteBatch:
+    """
+    一組需要在同一交易內完成的寫入
+    
+    用法：
+        batch = WriteBatch()
+        batch.execute("UPDATE meetings SET ... WHERE id = ?", (...))
+        batch.executemany("INSERT INTO attendees ...", rows)
+        await batch.commit()
+    
+    commit() 會交由 write_coalescer 與其他任務的寫入合併成一次 COMMIT；
+    各批次以 SAVEPOINT 隔離，單一批次失敗只會回滾自己並拋出例外
+    """
+    
+    def __init__(self):
+        self._ops: List[Tuple[str, Any, Any]] = []
+    
+    def execute(self, sql: str, params: Sequence = ()):
+        self._ops.append(("execute", sql, params))
+        return self
+    
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence]):
+        self._ops.append(("executemany", sql, list(seq_of_params)))
+        return self
+    
+    def run(self, fn: Callable[[aiosqlite.Connection], Awaitable[Any]]):
+        """在交易內執行需要先查詢再寫入的邏輯（fn 收到批次寫入連線，不可 commit）"""
+        self._ops.append(("run", fn, None))
+        return self
+    
+    def __len__(self):
+        return len(self._ops)
+    
+    async def commit(self):
+        if self._ops:
+            await track_db(write_coalescer.submit(self._ops))
+
+
+class WriteCoalescer:
+    """
+    寫入合併器
+    
+    收集 window 時間內送來的 WriteBatch，以專用連線 BEGIN IMMEDIATE … COMMIT
+    一次寫入，將每場會議多次 fsync 降為每個時間窗一次
+    """
+    
+    def __init__(self):
+        self._pending: List[Tuple[list, asyncio.Future, float]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._full = asyncio.Event()
+        self._conn: Optional[aiosqlite.Connection] = None
+        self.commits = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self._latencies_ms: deque = deque(maxlen=10000)
+    
+    async def submit(self, ops: list):
+        settings = get_settings()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((ops, future, time.perf_counter()))
+        
+        if len(self._pending) >= settings.db_write_batch_max:
+            self._full.set()
+        if self._flush_task is None or self._flush_task.done():
+            # 以空白 context 執行，避免合併器的寫入被計入觸發它的請求
+            self._flush_task = asyncio.create_task(self._run(), context=contextvars.Context())
+        
+        await future
+    
+    async def _run(self):
+        settings = get_settings()
+        while self._pending:
+            # 等待時間窗結束或批次已滿
+            try:
+                await asyncio.wait_for(
+                    self._full.wait(),
+                    timeout=settings.db_write_batch_window_ms / 1000,
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._full.clear()
+            
+            batch = self._pending[:settings.db_write_batch_max]
+            self._pending = self._pending[settings.db_write_batch_max:]
+            await self._flush(batch)
+    
+    async def _get_connection(self) -> aiosqlite.Connection:
+        if self._conn is None:
+            # isolation_level=None：由合併器自行控制 BEGIN / COMMIT
+            self._conn = await _connect(isolation_level=None)
+        return self._conn
+    
+    async def _apply_one(self, db: aiosqlite.Connection, item: tuple, succeeded: list):
+        """以獨立 SAVEPOINT 依序執行單一批次，失敗時只回滾該批次"""
+        ops, future, submitted_at = item
+        await db.execute("SAVEPOINT write_batch")
+        try:
+            for method, sql_or_fn, params in ops:
+                if method == "execute":
+                    await db.execute(sql_or_fn, params)
+                elif method == "executemany":
+                    await db.executemany(sql_or_fn, params)
+                else:
+                    await sql_or_fn(db)
+        except Exception as e:
+            # 只回滾這一個批次，其他批次照常提交
+            await db.execute("ROLLBACK TO write_batch")
+            await db.execute("RELEASE write_batch")
+            self.failed_batches += 1
+            if not future.done():
+                future.set_exception(e)
+            return
+        await db.execute("RELEASE write_batch")
+        succeeded.append((future, submitted_at))
+    
+    async def _apply_segment(self, db: aiosqlite.Connection, segment: list, succeeded: list):
+        """
+        執行一段連續的純 SQL 批次
+        
+        整段只用一個 SAVEPOINT，省去每個批次各自 SAVEPOINT / RELEASE 的往返；
+        語句逐條 await 依序執行，任一語句失敗即回滾整段，再逐批重跑以找出失敗的批次
+        """
+        if len(segment) <= 1:
+            for item in segment:
+                await self._apply_one(db, item, succeeded)
+            return
+        
+        await db.execute("SAVEPOINT write_segment")
+        try:
+            for ops, _, _ in segment:
+                for method, sql, params in ops:
+                    if method == "execute":
+                        await db.execute(sql, params)
+                    else:
+                        await db.executemany(sql, params)
+        except Exception:
+            await db.execute("ROLLBACK TO write_segment")
+            await db.execute("RELEASE write_segment")
+            for item in segment:
+                await self._apply_one(db, item, succeeded)
+            return
+        
+        await db.execute("RELEASE write_segment")
+        succeeded.extend((future, submitted_at) for _, future, submitted_at in segment)
+    
+    async def _flush(self, batch: list):
+        db = None
+        succeeded = []
+        
+        try:
+            # 連線或 PRAGMA 設定失敗（例如 database is locked）時也要通知所有等待中的批次
+            db = await self._get_connection()
+            await db.execute("BEGIN IMMEDIATE")
+            segment = []
+            for item in batch:
+                if any(method == "run" for method, _, _ in item[0]):
+                    # run() 需要依序查詢再寫入，單獨執行
+                    await self._apply_segment(db, segment, succeeded)
+                    segment = []
+                    await self._apply_one(db, item, succeeded)
+                else:
+                    segment.append(item)
+            await self._apply_segment(db, segment, succeeded)
+            await db.execute("COMMIT")
+        except Exception as e:
+            # 連線、BEGIN 或 COMMIT 失敗：整個時間窗的寫入都未生效
+            if db is not None:
+                try:
+                    await db.execute("ROLLBACK")
+                except Exception:
+                    pass
+            for _, future, _ in batch:
+                if not future.done():
+                    self.failed_batches += 1
+                    future.set_exception(e)
+            return
+        
+        self.commits += 1
+        now = time.perf_counter()
+        for future, submitted_at in succeeded:
+            self.batches += 1
+            self._latencies_ms.append((now - submitted_at) * 1000)
+            if not future.done():
+                future.set_result(None)
+    
+    def stats(self) -> dict:
+        """提交次數與寫入延遲統計"""
+        latencies = sorted(self._latencies_ms)
+        
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 3)
+        
+        return {
+            "commits": self.commits,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "batches_per_commit": round(self.batches / self.commits, 2) if self.commits else 0.0,
+            "latency_ms_p50": percentile(0.50),
+            "latency_ms_p99": percentile(0.99),
+        }
+    
+    async def close(self):
+        """送出尚未寫入的批次並關閉連線"""
+        if self._flush_task is not None and not self._flush_task.done():
+            self._full.set()
+            await self._flush_task
+        self._flush_task = None
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+        # Event 會綁定到第一次使用它的事件迴圈，關閉後重建以便重新啟動
+        self._full = asyncio.Event()
+
+
+write_coalescer = WriteCoalescer()
@@ -9,6 +9,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from config import get_settings, ensure_directories
 from database import init_db, close_db
 from routers import meetings, auth, admin
+from routers.auth import configure_token_cache
+from services import preload_lazy_modules
+from services.profiling import ProfilingMiddleware, request_profiler
+from services.storage import configure_artifact_cache, storage_compactor
 
 
 @asynccontextmanager
@@ -18,12 +22,22 @@ async def lifespan(app: FastAPI):
     print("🚀 啟動會議室 AI 系統...")
     ensure_directories()
     await init_db()
+    configure_token_cache()
+    configure_artifact_cache()
+    if settings.storage_compactor_enabled:
+        storage_compactor.start()
+    if settings.profiling_enabled:
+        request_profiler.start()
+    # 處理會議才需要的 SDK 在背景預先載入，不延長啟動時間，也不讓第一個請求等待匯入
+    preload_lazy_modules()
     print("✅ 系統準備就緒")
     
     yield
     
     # 關閉時
     print("👋 關閉系統...")
+    await storage_compactor.stop()
+    await request_profiler.stop()
     await close_db()
     print("✅ 系統已關閉")
 
@@ -50,6 +64,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 請求耗時拆分（Server-Timing）與慢請求取樣
+app.add_middleware(ProfilingMiddleware)
+
 
 # 註冊路由
 app.include_router(auth.router)  # 認證路由（已包含 /api/auth 前綴）
@@ -85,6 +85,22 @@ class MeetingStatusResponse(BaseModel):
     completed_at: Optional[datetime] = None
 
 
+MEETING_STATUS_BATCH_MAX = 500
+
+
+class MeetingStatusBatchRequest(BaseModel):
+    """批次查詢會議狀態請求"""
+    meeting_ids: List[str] = Field(
+        ..., min_length=1, max_length=MEETING_STATUS_BATCH_MAX, description="會議 ID 列表"
+    )
+
+
+class MeetingStatusBatchResponse(BaseModel):
+    """批次查詢會議狀態回應（依請求順序，不存在的 ID 列於 not_found）"""
+    meetings: List[MeetingStatusResponse]
+    not_found: List[str] = []
+
+
 class MeetingEndRequest(BaseModel):
     """結束會議請求（與會者可能有更新）"""
     attendees: Optional[List[AttendeeCreate]] = None
@@ -3,11 +3,22 @@
 查看所有用戶的會議概覽
 """
 
+from collections import defaultdict
 from fastapi import APIRouter, HTTPException, Header, Query
+from fastapi.responses import FileResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
-from database import get_db
-from datetime import datetime
+from typing import Dict, List, Literal, Optional
+from config import get_settings
+from database import get_db_session, write_coalescer
+from routers.auth import token_cache
+from services.digest import extract_key_points
+from services.export import EXPORT_FORMATS, export_meetings
+from services.profiling import request_profiler
+from services.storage import artifact_cache, read_texts_cached, storage_compactor
+from services.serialization import FastJSONResponse, rows_to_dicts
+from datetime import datetime, timedelta
+import asyncio
+import json
 
 router = APIRouter(prefix="/api/admin", tags=["管理員"])
 
@@ -67,6 +78,33 @@ def verify_admin_token(token: str) -> bool:
     return token in admin_tokens.values()
 
 
+# SQLite 單一語句的參數數量有上限，IN (...) 查詢需分批
+SQL_IN_BATCH_SIZE = 500
+
+
+async def _fetch_attendee_names(db, meeting_ids: List[str]) -> Dict[str, List[str]]:
+    """批次查詢多場會議的與會者顯示名稱"""
+    attendees_by_meeting: Dict[str, List[str]] = defaultdict(list)
+    
+    for i in range(0, len(meeting_ids), SQL_IN_BATCH_SIZE):
+        batch = meeting_ids[i:i + SQL_IN_BATCH_SIZE]
+        placeholders = ", ".join("?" for _ in batch)
+        cursor = await db.execute(
+            f"""
+            SELECT meeting_id, email, name FROM attendees
+            WHERE meeting_id IN ({placeholders})
+            ORDER BY id
+            """,
+            batch
+        )
+        for a in await cursor.fetchall():
+            attendees_by_meeting[a["meeting_id"]].append(
+                a["name"] or a["email"].split("@")[0]
+            )
+    
+    return attendees_by_meeting
+
+
 @router.post("/login", response_model=AdminLoginResponse)
 async def admin_login(request: AdminLoginRequest):
     """
@@ -112,16 +150,57 @@ async def admin_logout(authorization: str = Header(...)):
     return {"success": True, "message": "已登出"}
 
 
+async def _load_summaries(
+    meetings: list,
+    mode: str,
+    excerpt_chars: int,
+) -> Dict[str, Optional[str]]:
+    """
+    並行讀取多場會議的摘要（經由內容快取）
+
+    未命中的檔案由最多 admin_overview_read_workers 個背景執行緒分組讀取，不阻塞事件迴圈，
+    整體耗時取決於最慢的一組而非所有檔案的總和
+    """
+    if mode == "none":
+        return {}
+    
+    if mode == "key_points":
+        view, parse = "key_points", extract_key_points
+    elif mode == "excerpt":
+        view, parse = f"excerpt:{excerpt_chars}", lambda text: text[:excerpt_chars]
+    else:
+        view, parse = "text", None
+    
+    with_summary = [m for m in meetings if m["summary_path"]]
+    contents = await read_texts_cached(
+        [m["summary_path"] for m in with_summary],
+        view=view,
+        parse=parse,
+        workers=get_settings().admin_overview_read_workers,
+    )
+    
+    summaries = {}
+    for meeting, content in zip(with_summary, contents):
+        if mode == "key_points":
+            content = "\n".join(content)
+        summaries[meeting["id"]] = content or None
+    return summaries
+
+
 @router.get("/daily-overview", response_model=DailyOverviewResponse)
 async def get_daily_overview(
     date: Optional[str] = Query(None, description="日期 (YYYY-MM-DD)，預設今天"),
+    summary_mode: Literal["full", "excerpt", "key_points", "none"] = Query(
+        "full", description="摘要內容：完整、開頭節錄、重點或不回傳"
+    ),
+    excerpt_chars: int = Query(300, ge=20, le=5000, description="節錄字數（summary_mode=excerpt）"),
     authorization: str = Header(...)
 ):
     """
     獲取每日會議概覽
     - 顯示所有用戶當天的會議
     - 每個用戶開了幾場會議
-    - 每場會議的摘要
+    - 每場會議的摘要（讀取 meetings.summary_path，可只回傳節錄或重點）
     """
     # 驗證管理員權限
     if not authorization.startswith("Bearer "):
@@ -142,98 +221,87 @@ async def get_daily_overview(
     
     date_str = target_date.strftime("%Y-%m-%d")
     
-    db = await get_db()
-    
-    # 獲取所有用戶
-    cursor = await db.execute("SELECT id, email, name FROM users ORDER BY email")
-    users = await cursor.fetchall()
-    
-    user_overviews = []
-    total_meetings = 0
+    # 以範圍條件查詢，才能使用 start_time 索引（DATE(start_time) = ? 無法使用索引）
+    start_of_day = datetime.combine(target_date, datetime.min.time())
+    end_of_day = start_of_day + timedelta(days=1)
     
-    for user in users:
-        user_id = user["id"]
+    async with get_db_session(readonly=True) as db:
+        # 獲取所有用戶
+        cursor = await db.execute("SELECT id, email, name FROM users ORDER BY email")
+        users = await cursor.fetchall()
         
-        # 獲取該用戶當天的會議
+        # 一次取出當天所有已完成的會議
+        # （+m.status 讓查詢規劃器改用 start_time 範圍索引，而非選擇性低的 status 索引）
         cursor = await db.execute(
             """
-            SELECT m.id, m.room, m.topic, m.start_time, m.end_time, m.status
+            SELECT m.id, m.user_id, m.room, m.topic, m.start_time, m.end_time, m.summary_path
             FROM meetings m
-            WHERE m.user_id = ?
-            AND DATE(m.start_time) = ?
-            AND m.status = 'completed'
+            WHERE m.start_time >= ?
+            AND m.start_time < ?
+            AND +m.status = 'completed'
+            AND m.user_id IS NOT NULL
             ORDER BY m.start_time
             """,
-            (user_id, date_str)
+            (start_of_day.isoformat(), end_of_day.isoformat())
         )
         meetings = await cursor.fetchall()
         
-        meeting_items = []
-        for meeting in meetings:
-            meeting_id = meeting["id"]
-            
-            # 獲取會議摘要
-            summary = None
-            if meeting["status"] == "completed":
-                try:
-                    summary_path = f"data/summaries/{meeting_id}.txt"
-                    import os
-                    if os.path.exists(summary_path):
-                        with open(summary_path, "r", encoding="utf-8") as f:
-                            summary = f.read()
-                except:
-                    pass
-            
-            # 獲取與會者
-            cursor2 = await db.execute(
-                "SELECT email, name FROM attendees WHERE meeting_id = ?",
-                (meeting_id,)
-            )
-            attendees = await cursor2.fetchall()
-            attendee_list = [
-                a["name"] or a["email"].split("@")[0] 
-                for a in attendees
-            ]
-            
-            meeting_items.append(MeetingSummaryItem(
-                meeting_id=meeting_id,
-                topic=meeting["topic"],
-                room=meeting["room"],
-                start_time=meeting["start_time"],
-                end_time=meeting["end_time"],
-                summary=summary,
-                attendees=attendee_list
-            ))
+        # 批次取出這些會議的與會者
+        attendees_by_meeting = await _fetch_attendee_names(db, [m["id"] for m in meetings])
+    
+    # 並行讀取摘要（查詢條件已限定為已完成的會議）
+    summaries = await _load_summaries(meetings, summary_mode, excerpt_chars)
+    
+    # 直接組成 dict 並以 FastJSONResponse 編碼，不逐筆建立 Pydantic 模型
+    # （response_model 仍保留作為 API 文件）
+    meetings_by_user: Dict[int, List[dict]] = defaultdict(list)
+    for meeting in meetings:
+        meeting_id = meeting["id"]
         
+        meetings_by_user[meeting["user_id"]].append({
+            "meeting_id": meeting_id,
+            "topic": meeting["topic"],
+            "room": meeting["room"],
+            "start_time": meeting["start_time"],
+            "end_time": meeting["end_time"],
+            "summary": summaries.get(meeting_id),
+            "attendees": attendees_by_meeting.get(meeting_id, [])
+        })
+    
+    user_overviews = []
+    total_meetings = 0
+    
+    for user_id, email, name in users:
+        meeting_items = meetings_by_user.get(user_id, [])
         total_meetings += len(meeting_items)
         
-        user_overviews.append(UserMeetingOverview(
-            user_id=user_id,
-            email=user["email"],
-            name=user["name"],
-            meeting_count=len(meeting_items),
-            meetings=meeting_items
-        ))
+        user_overviews.append({
+            "user_id": user_id,
+            "email": email,
+            "name": name,
+            "meeting_count": len(meeting_items),
+            "meetings": meeting_items
+        })
     
     # 只返回有會議的用戶（放在最前面），沒有會議的用戶放後面
-    user_overviews.sort(key=lambda x: (-x.meeting_count, x.email))
+    user_overviews.sort(key=lambda x: (-x["meeting_count"], x["email"]))
     
-    return DailyOverviewResponse(
-        date=date_str,
-        total_users=len([u for u in user_overviews if u.meeting_count > 0]),
-        total_meetings=total_meetings,
-        users=user_overviews
-    )
+    return FastJSONResponse({
+        "date": date_str,
+        "total_users": sum(1 for u in user_overviews if u["meeting_count"] > 0),
+        "total_meetings": total_meetings,
+        "users": user_overviews
+    })
 
 
-@router.get("/user/{user_id}/meetings")
-async def get_user_meetings(
-    user_id: int,
-    date: Optional[str] = Query(None),
+@router.get("/daily-stats")
+async def get_daily_stats(
+    date: Optional[str] = Query(None, description="日期 (YYYY-MM-DD)，預設今天"),
     authorization: str = Header(...)
 ):
     """
-    獲取特定用戶的會議詳情
+    獲取每日統計
+    - 讀取 daily_user_stats 彙總表，只涉及當天有會議的用戶
     """
     # 驗證管理員權限
     if not authorization.startswith("Bearer "):
@@ -243,59 +311,322 @@ async def get_user_meetings(
     if not verify_admin_token(token):
         raise HTTPException(status_code=401, detail="管理員認證無效")
     
-    db = await get_db()
-    
-    # 獲取用戶資訊
-    cursor = await db.execute(
-        "SELECT id, email, name FROM users WHERE id = ?",
-        (user_id,)
-    )
-    user = await cursor.fetchone()
+    # 解析日期
+    if date:
+        try:
+            target_date = datetime.strptime(date, "%Y-%m-%d").date()
+        except ValueError:
+            raise HTTPException(status_code=400, detail="日期格式錯誤，請使用 YYYY-MM-DD")
+    else:
+        target_date = datetime.now().date()
     
-    if not user:
-        raise HTTPException(status_code=404, detail="用戶不存在")
+    date_str = target_date.strftime("%Y-%m-%d")
     
-    # 構建查詢
-    if date:
+    async with get_db_session(readonly=True) as db:
         cursor = await db.execute(
             """
-            SELECT id, room, topic, start_time, end_time, status
-            FROM meetings
-            WHERE user_id = ? AND DATE(start_time) = ?
-            ORDER BY start_time DESC
+            SELECT s.user_id, u.email, u.name, s.meeting_count, s.failed_count,
+                   s.audio_minutes, s.transcript_chars, s.processing_seconds
+            FROM daily_user_stats s
+            JOIN users u ON u.id = s.user_id
+            WHERE s.date = ?
+            ORDER BY s.meeting_count DESC, u.email
             """,
-            (user_id, date)
+            (date_str,)
         )
-    else:
+        rows = await cursor.fetchall()
+    
+    users = [
+        {
+            "user_id": r["user_id"],
+            "email": r["email"],
+            "name": r["name"],
+            "meeting_count": r["meeting_count"],
+            "failed_count": r["failed_count"],
+            "audio_minutes": round(r["audio_minutes"], 1),
+            "transcript_chars": r["transcript_chars"],
+            "processing_seconds": round(r["processing_seconds"], 1),
+        }
+        for r in rows
+    ]
+    
+    return {
+        "date": date_str,
+        "total_users": len([u for u in users if u["meeting_count"] > 0]),
+        "total_meetings": sum(u["meeting_count"] for u in users),
+        "total_failed": sum(u["failed_count"] for u in users),
+        "total_audio_minutes": round(sum(u["audio_minutes"] for u in users), 1),
+        "users": users
+    }
+
+
+USER_MEETING_FIELDS = ("id", "room", "topic", "start_time", "end_time", "status")
+
+
+@router.get("/user/{user_id}/meetings")
+async def get_user_meetings(
+    user_id: int,
+    date: Optional[str] = Query(None),
+    authorization: str = Header(...)
+):
+    """
+    獲取特定用戶的會議詳情
+    """
+    # 驗證管理員權限
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="無效的認證格式")
+    
+    token = authorization[7:]
+    if not verify_admin_token(token):
+        raise HTTPException(status_code=401, detail="管理員認證無效")
+    
+    # 解析日期
+    start_of_day = None
+    if date:
+        try:
+            start_of_day = datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            raise HTTPException(status_code=400, detail="日期格式錯誤，請使用 YYYY-MM-DD")
+    
+    async with get_db_session(readonly=True) as db:
+        # 獲取用戶資訊
         cursor = await db.execute(
-            """
-            SELECT id, room, topic, start_time, end_time, status
-            FROM meetings
-            WHERE user_id = ?
-            ORDER BY start_time DESC
-            LIMIT 50
-            """,
+            "SELECT id, email, name FROM users WHERE id = ?",
             (user_id,)
         )
+        user = await cursor.fetchone()
     
-    meetings = await cursor.fetchall()
+        if not user:
+            raise HTTPException(status_code=404, detail="用戶不存在")
     
-    return {
+        # 構建查詢
+        if start_of_day:
+            end_of_day = start_of_day + timedelta(days=1)
+            cursor = await db.execute(
+                f"""
+                SELECT {", ".join(USER_MEETING_FIELDS)}
+                FROM meetings
+                WHERE user_id = ? AND start_time >= ? AND start_time < ?
+                ORDER BY start_time DESC
+                """,
+                (user_id, start_of_day.isoformat(), end_of_day.isoformat())
+            )
+        else:
+            cursor = await db.execute(
+                f"""
+                SELECT {", ".join(USER_MEETING_FIELDS)}
+                FROM meetings
+                WHERE user_id = ?
+                ORDER BY start_time DESC
+                LIMIT 50
+                """,
+                (user_id,)
+            )
+    
+        meetings = await cursor.fetchall()
+    
+    return FastJSONResponse({
         "user": {
             "id": user["id"],
             "email": user["email"],
             "name": user["name"]
         },
-        "meetings": [
-            {
-                "id": m["id"],
-                "room": m["room"],
-                "topic": m["topic"],
-                "start_time": m["start_time"],
-                "end_time": m["end_time"],
-                "status": m["status"]
-            }
-            for m in meetings
-        ]
+        "meetings": rows_to_dicts(meetings, USER_MEETING_FIELDS)
+    })
+
+
+@router.get("/cache-stats")
+async def get_cache_stats(authorization: str = Header(...)):
+    """
+    獲取程序內快取的命中率統計
+    """
+    # 驗證管理員權限
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="無效的認證格式")
+    
+    token = authorization[7:]
+    if not verify_admin_token(token):
+        raise HTTPException(status_code=401, detail="管理員認證無效")
+    
+    return {
+        "auth_token": token_cache.stats(),
+        "artifacts": artifact_cache.stats(),
+    }
+
+
+@router.get("/db-stats")
+async def get_db_stats(authorization: str = Header(...)):
+    """
+    獲取資料庫寫入合併統計（每次 COMMIT 合併的批次數與寫入延遲）
+    """
+    # 驗證管理員權限
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="無效的認證格式")
+    
+    token = authorization[7:]
+    if not verify_admin_token(token):
+        raise HTTPException(status_code=401, detail="管理員認證無效")
+    
+    return {
+        "write_coalescer": write_coalescer.stats(),
+    }
+
+
+@router.get("/storage-stats")
+async def get_storage_stats(authorization: str = Header(...)):
+    """
+    獲取分層儲存統計（各儲存層的檔案數與大小、背景壓縮器狀態）
+    """
+    # 驗證管理員權限
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="無效的認證格式")
+    
+    token = authorization[7:]
+    if not verify_admin_token(token):
+        raise HTTPException(status_code=401, detail="管理員認證無效")
+    
+    async with get_db_session(readonly=True) as db:
+        cursor = await db.execute(
+            """
+            SELECT tier, kind, COUNT(*) AS count,
+                   COALESCE(SUM(size_bytes), 0) AS size_bytes,
+                   COALESCE(SUM(stored_bytes), 0) AS stored_bytes
+            FROM meeting_artifacts
+            GROUP BY tier, kind
+            ORDER BY tier, kind
+            """
+        )
+        tiers = [dict(row) for row in await cursor.fetchall()]
+    
+    return {
+        "tiers": tiers,
+        "compactor": storage_compactor.stats(),
     }
 
+
+@router.get("/export")
+async def export_meeting_data(
+    format: Literal["ndjson", "csv", "zip"] = Query("ndjson", description="匯出格式"),
+    start: Optional[str] = Query(None, description="起始日期 (YYYY-MM-DD，含)"),
+    end: Optional[str] = Query(None, description="結束日期 (YYYY-MM-DD，含)"),
+    user_id: Optional[int] = Query(None, description="只匯出該用戶的會議"),
+    include_transcript: bool = Query(True, description="是否包含逐字稿"),
+    authorization: str = Header(...)
+):
+    """
+    批次匯出會議資料（基本資料、與會者、摘要、逐字稿），供合規稽核使用
+    - 串流輸出 NDJSON、CSV 或 ZIP，記憶體用量與匯出筆數無關
+    - 未指定日期時匯出全部會議
+    """
+    # 驗證管理員權限
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="無效的認證格式")
+    
+    token = authorization[7:]
+    if not verify_admin_token(token):
+        raise HTTPException(status_code=401, detail="管理員認證無效")
+    
+    # 解析日期
+    try:
+        start_date = datetime.strptime(start, "%Y-%m-%d").date() if start else None
+        end_date = datetime.strptime(end, "%Y-%m-%d").date() if end else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="日期格式錯誤，請使用 YYYY-MM-DD")
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="起始日期不可晚於結束日期")
+    
+    filename = "_".join(["meetings", start or "all", end or "all"]) + f".{format}"
+    return StreamingResponse(
+        export_meetings(format, start_date, end_date, user_id, include_transcript),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/profiles")
+async def list_profiles(authorization: str = Header(...)):
+    """
+    列出已儲存的請求剖析檔（新的在前）與取樣器狀態
+    - slow_request：耗時超過 PROFILING_SLOW_REQUEST_MS 的請求，含 DB / 檔案 I/O / 處理時間拆分
+    - window：由 POST /profiles/sampling 觸發的取樣時間窗
+    """
+    # 驗證管理員權限
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="無效的認證格式")
+    
+    token = authorization[7:]
+    if not verify_admin_token(token):
+        raise HTTPException(status_code=401, detail="管理員認證無效")
+    
+    return FastJSONResponse({
+        "profiler": request_profiler.stats(),
+        "profiles": request_profiler.list_profiles(),
+    })
+
+
+@router.post("/profiles/sampling")
+async def start_profile_sampling(
+    seconds: float = Query(30, gt=0, le=300, description="取樣秒數"),
+    authorization: str = Header(...)
+):
+    """
+    開始取樣時間窗：在指定秒數內持續取樣事件迴圈的呼叫堆疊（不論請求快慢），
+    結束後存成一份剖析檔，可由 GET /profiles 查詢
+    """
+    # 驗證管理員權限
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="無效的認證格式")
+    
+    token = authorization[7:]
+    if not verify_admin_token(token):
+        raise HTTPException(status_code=401, detail="管理員認證無效")
+    
+    if not request_profiler.running:
+        raise HTTPException(status_code=503, detail="請求剖析未啟用（PROFILING_ENABLED=false）")
+    if not request_profiler.start_window(seconds):
+        raise HTTPException(status_code=409, detail="已有取樣時間窗進行中")
+    
+    return {
+        "success": True,
+        "seconds": seconds,
+        "profiler": request_profiler.stats(),
+    }
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(
+    profile_id: str,
+    format: Literal["json", "folded"] = Query("json", description="json：含耗時拆分；folded：供 speedscope/flamegraph.pl 使用"),
+    authorization: str = Header(...)
+):
+    """
+    下載剖析檔
+    """
+    # 驗證管理員權限
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="無效的認證格式")
+    
+    token = authorization[7:]
+    if not verify_admin_token(token):
+        raise HTTPException(status_code=401, detail="管理員認證無效")
+    
+    path = request_profiler.profile_path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="剖析檔不存在")
+    
+    if format == "json":
+        return FileResponse(path, media_type="application/json", filename=f"{profile_id}.json")
+    
+    def to_folded() -> str:
+        profile = json.loads(path.read_text(encoding="utf-8"))
+        return "".join(f"{item['stack']} {item['count']}\n" for item in profile["stacks"])
+    
+    try:
+        folded = await asyncio.to_thread(to_folded)
+    except FileNotFoundError:
+        # 在檢查與讀取之間被清理
+        raise HTTPException(status_code=404, detail="剖析檔不存在")
+    return PlainTextResponse(
+        folded,
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'},
+    )
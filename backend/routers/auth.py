@@ -6,12 +6,32 @@
 from fastapi import APIRouter, HTTPException, Header
 from pydantic import BaseModel, EmailStr
 from typing import Optional
-from database import get_db
+from config import get_settings
+from database import get_db_session, WriteBatch
+from services.cache import TTLCache
+import hashlib
 import secrets
 from datetime import datetime
 
 router = APIRouter(prefix="/api/auth", tags=["認證"])
 
+# Token → 用戶快取（以 Token 雜湊為鍵）
+# 注意：快取為單一程序內，多個 worker 時登出最多延遲 TTL 秒才在其他 worker 生效
+# 容量與存活時間於啟動時由 configure_token_cache() 套用設定，匯入本模組時不讀取設定
+token_cache = TTLCache(max_size=0, ttl_seconds=0)
+
+
+def configure_token_cache():
+    """依設定套用 Token 快取的容量與存活時間（應用程式啟動時呼叫）"""
+    settings = get_settings()
+    token_cache.max_size = settings.auth_cache_size
+    token_cache.ttl_seconds = settings.auth_cache_ttl_seconds
+
+
+def hash_token(token: str) -> str:
+    """Token 雜湊（資料庫與快取只保存雜湊值）"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
 
 class LoginRequest(BaseModel):
     """登入請求"""
@@ -68,56 +88,55 @@ async def login(request: LoginRequest):
             detail=f"此 Email 網域不允許登入。請使用公司 Email。"
         )
     
-    db = await get_db()
+    new_token = secrets.token_urlsafe(32)
+    login = {}
     
-    # 查找用戶
-    cursor = await db.execute(
-        "SELECT id, email, name, auth_token FROM users WHERE email = ?",
-        (email,)
-    )
-    user = await cursor.fetchone()
-    
-    if user:
-        # 用戶已存在，更新登入時間和 Token
-        new_token = secrets.token_urlsafe(32)
-        await db.execute(
-            """
-            UPDATE users 
-            SET auth_token = ?, last_login_at = ?, name = COALESCE(?, name)
-            WHERE id = ?
-            """,
-            (new_token, datetime.now().isoformat(), request.name, user["id"])
-        )
-        await db.commit()
-        
-        return LoginResponse(
-            success=True,
-            token=new_token,
-            user_id=user["id"],
-            email=email,
-            name=request.name or user["name"],
-            message="登入成功"
-        )
-    else:
-        # 創建新用戶
-        new_token = secrets.token_urlsafe(32)
-        cursor = await db.execute(
-            """
-            INSERT INTO users (email, name, auth_token, last_login_at)
-            VALUES (?, ?, ?, ?)
-            """,
-            (email, request.name, new_token, datetime.now().isoformat())
+    async def upsert_user(conn):
+        # 查詢與寫入在同一交易內，同一 Email 同時登入也不會重複建立用戶
+        cursor = await conn.execute(
+            "SELECT id, email, name, auth_token FROM users WHERE email = ?",
+            (email,)
         )
-        await db.commit()
+        user = await cursor.fetchone()
         
-        return LoginResponse(
-            success=True,
-            token=new_token,
-            user_id=cursor.lastrowid,
-            email=email,
-            name=request.name,
-            message="帳號已創建並登入"
-        )
+        if user:
+            # 用戶已存在，更新登入時間和 Token
+            await conn.execute(
+                """
+                UPDATE users 
+                SET auth_token = ?, last_login_at = ?, name = COALESCE(?, name)
+                WHERE id = ?
+                """,
+                (hash_token(new_token), datetime.now().isoformat(), request.name, user["id"])
+            )
+            login.update(user_id=user["id"], name=request.name or user["name"],
+                         old_token=user["auth_token"], created=False)
+        else:
+            # 創建新用戶
+            cursor = await conn.execute(
+                """
+                INSERT INTO users (email, name, auth_token, last_login_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (email, request.name, hash_token(new_token), datetime.now().isoformat())
+            )
+            login.update(user_id=cursor.lastrowid, name=request.name,
+                         old_token=None, created=True)
+    
+    await WriteBatch().run(upsert_user).commit()
+    
+    # 舊 Token 已失效
+    if login["old_token"]:
+        token_cache.invalidate(login["old_token"])
+    
+    return LoginResponse(
+        success=True,
+        token=new_token,
+        user_id=login["user_id"],
+        email=email,
+        name=login["name"],
+        message="帳號已創建並登入" if login["created"] else "登入成功"
+    )
 
 
 @router.get("/me", response_model=UserInfo)
@@ -132,12 +151,7 @@ async def get_current_user(authorization: str = Header(...)):
     
     token = authorization[7:]  # 移除 "Bearer " 前綴
     
-    db = await get_db()
-    cursor = await db.execute(
-        "SELECT id, email, name, company, created_at FROM users WHERE auth_token = ?",
-        (token,)
-    )
-    user = await cursor.fetchone()
+    user = await get_user_by_token(token)
     
     if not user:
         raise HTTPException(status_code=401, detail="認證已過期，請重新登入")
@@ -159,14 +173,13 @@ async def logout(authorization: str = Header(...)):
     if not authorization.startswith("Bearer "):
         raise HTTPException(status_code=401, detail="無效的認證格式")
     
-    token = authorization[7:]
+    token_hash = hash_token(authorization[7:])
     
-    db = await get_db()
-    await db.execute(
+    await WriteBatch().execute(
         "UPDATE users SET auth_token = NULL WHERE auth_token = ?",
-        (token,)
-    )
-    await db.commit()
+        (token_hash,)
+    ).commit()
+    token_cache.invalidate(token_hash)
     
     return {"success": True, "message": "已登出"}
 
@@ -174,23 +187,36 @@ async def logout(authorization: str = Header(...)):
 async def get_user_by_token(token: str) -> Optional[dict]:
     """
     通過 Token 獲取用戶（供其他模組使用）
+    
+    結果會快取 auth_cache_ttl_seconds 秒；登入換發與登出時主動失效
     """
     if not token:
         return None
-        
-    db = await get_db()
-    cursor = await db.execute(
-        "SELECT id, email, name FROM users WHERE auth_token = ?",
-        (token,)
-    )
-    user = await cursor.fetchone()
     
-    if user:
-        return {
-            "id": user["id"],
-            "email": user["email"],
-            "name": user["name"]
-        }
-    return None
-
-
+    token_hash = hash_token(token)
+    user = token_cache.get(token_hash)
+    if user is not None:
+        return dict(user)
+    
+    # 查詢期間若有登出/換發，結果可能已過時，不寫入快取
+    invalidations = token_cache.invalidations
+    async with get_db_session(readonly=True) as db:
+        cursor = await db.execute(
+            "SELECT id, email, name, company, created_at FROM users WHERE auth_token = ?",
+            (token_hash,)
+        )
+        row = await cursor.fetchone()
+    
+    if not row:
+        return None
+    
+    user = {
+        "id": row["id"],
+        "email": row["email"],
+        "name": row["name"],
+        "company": row["company"],
+        "created_at": row["created_at"]
+    }
+    if token_cache.invalidations == invalidations:
+        token_cache.set(token_hash, user)
+    return dict(user)
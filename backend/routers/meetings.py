@@ -2,19 +2,29 @@
 會議相關 API 路由
 """
 
+from contextlib import aclosing
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List
+from typing import AsyncIterator, Optional, Tuple
 
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks, Header
+from fastapi import (
+    APIRouter, HTTPException, UploadFile, File, Form, BackgroundTasks, Header, Query,
+    Response, WebSocket, WebSocketDisconnect,
+)
+from fastapi.responses import FileResponse, StreamingResponse
+import asyncio
+import base64
+import hashlib
 import json
 
 from config import get_settings
-from database import get_db
+from database import get_db, get_db_session, WriteBatch
 from models.meeting import (
     MeetingCreate,
     MeetingResponse,
     MeetingStatusResponse,
+    MeetingStatusBatchRequest,
+    MeetingStatusBatchResponse,
     MeetingStatus,
     ProcessingSteps,
     ProcessingStep,
@@ -22,10 +32,19 @@ from models.meeting import (
     AttendeeCreate,
 )
 from services.processor import process_meeting
-from routers.auth import get_user_by_token
+from services.ids import new_ulid
+from services.storage import (
+    ARTIFACT_COLUMNS, artifact_version, encoded_variants, gzip_cached, read_text, read_text_cached,
+    read_text_page, register_artifact,
+)
+from services.events import meeting_events
+from services.serialization import FastJSONResponse, json_dumps, rows_to_dicts
+from services.search import search_meetings
+from services.digest import get_daily_digest
+from services.profiling import track_io
+from routers.auth import get_user_by_token, hash_token, token_cache
 
 router = APIRouter()
-settings = get_settings()
 
 
 async def get_current_user_id(authorization: Optional[str] = None) -> Optional[int]:
@@ -38,10 +57,41 @@ async def get_current_user_id(authorization: Optional[str] = None) -> Optional[i
     return user["id"] if user else None
 
 
+def _make_etag(*parts) -> str:
+    """由版本資訊組成弱 ETag（內容相同即可，不要求位元組完全一致）"""
+    digest = hashlib.sha1("\x1f".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 是否包含目前的 ETag（弱比對）"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    target = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == target for tag in if_none_match.split(","))
+
+
+def _set_etag(response: Response, etag: str):
+    response.headers["ETag"] = etag
+    # 允許快取但每次都需向伺服器確認
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def _not_modified(etag: str) -> Response:
+    response = Response(status_code=304)
+    _set_etag(response, etag)
+    return response
+
+
 def generate_meeting_id() -> str:
-    """產生會議 ID"""
-    now = datetime.now()
-    return f"mtg_{now.strftime('%Y%m%d_%H%M%S')}"
+    """
+    產生會議 ID（mtg_ + ULID）
+
+    依時間排序且同一秒內多場會議同時開始也不會重複
+    """
+    return f"mtg_{new_ulid()}"
 
 
 @router.post("/start", response_model=MeetingResponse)
@@ -57,8 +107,6 @@ async def start_meeting(
     - 關聯當前登入用戶（如有）
     - 回傳 meeting_id 供前端使用
     """
-    db = await get_db()
-    
     # 獲取當前用戶 ID（可選）
     user_id = await get_current_user_id(authorization)
     
@@ -67,11 +115,13 @@ async def start_meeting(
     start_time = datetime.now()
     
     # 建立會議目錄
-    meeting_dir = Path(settings.storage_path) / meeting_id
+    meeting_dir = Path(get_settings().storage_path) / meeting_id
     meeting_dir.mkdir(parents=True, exist_ok=True)
     
+    batch = WriteBatch()
+    
     # 插入會議記錄（包含 user_id 和 topic）
-    await db.execute(
+    batch.execute(
         """
         INSERT INTO meetings (id, user_id, room, topic, start_time, status)
         VALUES (?, ?, ?, ?, ?, ?)
@@ -80,16 +130,15 @@ async def start_meeting(
     )
     
     # 插入與會者
-    for attendee in request.attendees:
-        await db.execute(
-            """
-            INSERT INTO attendees (meeting_id, email, name)
-            VALUES (?, ?, ?)
-            """,
-            (meeting_id, attendee.email, attendee.name)
-        )
+    batch.executemany(
+        """
+        INSERT INTO attendees (meeting_id, email, name)
+        VALUES (?, ?, ?)
+        """,
+        [(meeting_id, attendee.email, attendee.name) for attendee in request.attendees]
+    )
     
-    await db.commit()
+    await batch.commit()
     
     return MeetingResponse(
         meeting_id=meeting_id,
@@ -100,6 +149,28 @@ async def start_meeting(
     )
 
 
+def _detect_audio_ext(filename: Optional[str], content: bytes) -> str:
+    """從檔名或檔案開頭判斷音檔副檔名"""
+    original_filename = filename or "audio.m4a"
+    if original_filename.endswith('.m4a'):
+        return '.m4a'
+    elif original_filename.endswith('.webm'):
+        return '.webm'
+    elif original_filename.endswith('.wav'):
+        return '.wav'
+    elif original_filename.endswith('.mp3'):
+        return '.mp3'
+    
+    # 檢查文件頭來判斷格式
+    if content[:4] == b'ftyp' or content[4:8] == b'ftyp':
+        return '.m4a'  # MP4/M4A 格式
+    elif content[:4] == b'RIFF':
+        return '.wav'
+    elif content[:3] == b'ID3' or content[:2] == b'\xff\xfb':
+        return '.mp3'
+    return '.m4a'  # 預設使用 m4a
+
+
 @router.post("/{meeting_id}/end")
 async def end_meeting(
     meeting_id: str,
@@ -130,62 +201,42 @@ async def end_meeting(
         raise HTTPException(status_code=400, detail="會議狀態不正確，無法結束")
     
     # 儲存音檔
-    meeting_dir = Path(settings.storage_path) / meeting_id
+    meeting_dir = Path(get_settings().storage_path) / meeting_id
     meeting_dir.mkdir(parents=True, exist_ok=True)
     
     # 根據上傳的檔案類型決定副檔名
     content = await audio.read()
-    
-    # 從檔名或 content-type 獲取副檔名
-    original_filename = audio.filename or "audio.m4a"
-    if original_filename.endswith('.m4a'):
-        ext = '.m4a'
-    elif original_filename.endswith('.webm'):
-        ext = '.webm'
-    elif original_filename.endswith('.wav'):
-        ext = '.wav'
-    elif original_filename.endswith('.mp3'):
-        ext = '.mp3'
-    else:
-        # 檢查文件頭來判斷格式
-        if content[:4] == b'ftyp' or content[4:8] == b'ftyp':
-            ext = '.m4a'  # MP4/M4A 格式
-        elif content[:4] == b'RIFF':
-            ext = '.wav'
-        elif content[:3] == b'ID3' or content[:2] == b'\xff\xfb':
-            ext = '.mp3'
-        else:
-            ext = '.m4a'  # 預設使用 m4a
+    ext = _detect_audio_ext(audio.filename, content)
     
     audio_path = meeting_dir / f"audio{ext}"
     
-    with open(audio_path, "wb") as f:
-        f.write(content)
+    await track_io(asyncio.to_thread(audio_path.write_bytes, content))
+    
+    batch = WriteBatch()
     
     # 更新與會者（如有提供）
     if attendees:
         try:
             attendee_list = json.loads(attendees)
             # 先刪除舊的與會者
-            await db.execute(
+            batch.execute(
                 "DELETE FROM attendees WHERE meeting_id = ?",
                 (meeting_id,)
             )
             # 插入新的與會者
-            for att in attendee_list:
-                await db.execute(
-                    """
-                    INSERT INTO attendees (meeting_id, email, name)
-                    VALUES (?, ?, ?)
-                    """,
-                    (meeting_id, att.get("email"), att.get("name"))
-                )
+            batch.executemany(
+                """
+                INSERT INTO attendees (meeting_id, email, name)
+                VALUES (?, ?, ?)
+                """,
+                [(meeting_id, att.get("email"), att.get("name")) for att in attendee_list]
+            )
         except json.JSONDecodeError:
             pass  # 忽略無效的 JSON
     
     # 更新會議狀態
     end_time = datetime.now()
-    await db.execute(
+    batch.execute(
         """
         UPDATE meetings 
         SET status = ?, end_time = ?, audio_path = ?, updated_at = ?
@@ -199,8 +250,14 @@ async def end_meeting(
             meeting_id
         )
     )
+    register_artifact(batch, meeting_id, "audio", audio_path)
     
-    await db.commit()
+    await batch.commit()
+    meeting_events.publish(meeting_id, {
+        "status": MeetingStatus.PROCESSING.value,
+        "transcript_path": None,
+        "summary_path": None,
+    })
     
     # 觸發背景處理任務
     background_tasks.add_task(process_meeting, meeting_id)
@@ -213,33 +270,57 @@ async def end_meeting(
     }
 
 
+def _status_etag(meeting_id: str, meeting) -> str:
+    # 狀態、步驟（逐字稿/摘要路徑）、錯誤訊息與與會者的變更都會一併更新 updated_at
+    return _make_etag("status", meeting_id, meeting["status"], meeting["updated_at"])
+
+
 @router.get("/{meeting_id}/status", response_model=MeetingStatusResponse)
-async def get_meeting_status(meeting_id: str):
+async def get_meeting_status(
+    meeting_id: str,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+):
     """
     查詢會議處理狀態
     
     - 回傳會議基本資訊
     - 回傳各處理步驟狀態
+    - 支援 If-None-Match：狀態未變時回傳 304，只需查詢兩個欄位
     """
-    db = await get_db()
-    
-    # 查詢會議
-    cursor = await db.execute(
-        "SELECT * FROM meetings WHERE id = ?",
-        (meeting_id,)
-    )
-    meeting = await cursor.fetchone()
+    async with get_db_session(readonly=True) as db:
+        if if_none_match:
+            cursor = await db.execute(
+                "SELECT status, updated_at FROM meetings WHERE id = ?",
+                (meeting_id,)
+            )
+            version = await cursor.fetchone()
+            if version and _etag_matches(if_none_match, _status_etag(meeting_id, version)):
+                return _not_modified(_status_etag(meeting_id, version))
+        
+        # 查詢會議
+        cursor = await db.execute(
+            "SELECT * FROM meetings WHERE id = ?",
+            (meeting_id,)
+        )
+        meeting = await cursor.fetchone()
     
-    if not meeting:
-        raise HTTPException(status_code=404, detail="會議不存在")
+        if not meeting:
+            raise HTTPException(status_code=404, detail="會議不存在")
     
-    # 查詢與會者
-    cursor = await db.execute(
-        "SELECT * FROM attendees WHERE meeting_id = ?",
-        (meeting_id,)
-    )
-    attendee_rows = await cursor.fetchall()
+        # 查詢與會者
+        cursor = await db.execute(
+            "SELECT * FROM attendees WHERE meeting_id = ?",
+            (meeting_id,)
+        )
+        attendee_rows = await cursor.fetchall()
     
+    _set_etag(response, _status_etag(meeting_id, meeting))
+    return _build_status_response(meeting, attendee_rows)
+
+
+def _build_status_response(meeting, attendee_rows) -> MeetingStatusResponse:
+    """由 meetings 與 attendees 資料列組成狀態回應"""
     attendees = [
         Attendee(
             id=row["id"],
@@ -256,7 +337,7 @@ async def get_meeting_status(meeting_id: str):
     steps = _calculate_processing_steps(status, meeting)
     
     return MeetingStatusResponse(
-        meeting_id=meeting_id,
+        meeting_id=meeting["id"],
         status=status,
         steps=steps,
         start_time=datetime.fromisoformat(meeting["start_time"]),
@@ -268,96 +349,630 @@ async def get_meeting_status(meeting_id: str):
     )
 
 
+# SQLite 單一語句的參數數量有上限，IN (...) 查詢需分批
+SQL_IN_BATCH_SIZE = 500
+
+
+@router.post("/status:batch", response_model=MeetingStatusBatchResponse)
+async def get_meeting_status_batch(
+    request: MeetingStatusBatchRequest,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    批次查詢多場會議的處理狀態（例如接待看板同時追蹤多間會議室）
+    
+    - 以固定次數的 IN (...) 查詢取代每場會議各自呼叫 /{meeting_id}/status
+    - ETag 由所有會議的狀態與 updated_at 組成，未變更時回傳 304，不查詢與會者
+    """
+    meeting_ids = list(dict.fromkeys(request.meeting_ids))
+    meetings_by_id = {}
+    attendees_by_meeting = {meeting_id: [] for meeting_id in meeting_ids}
+    
+    async with get_db_session(readonly=True) as db:
+        for i in range(0, len(meeting_ids), SQL_IN_BATCH_SIZE):
+            batch = meeting_ids[i:i + SQL_IN_BATCH_SIZE]
+            placeholders = ", ".join("?" for _ in batch)
+            cursor = await db.execute(
+                f"SELECT * FROM meetings WHERE id IN ({placeholders})",
+                batch
+            )
+            for meeting in await cursor.fetchall():
+                meetings_by_id[meeting["id"]] = meeting
+        
+        etag = _make_etag(
+            "status-batch",
+            *(
+                f"{meeting_id}:{meetings_by_id[meeting_id]['status']}:{meetings_by_id[meeting_id]['updated_at']}"
+                if meeting_id in meetings_by_id else f"{meeting_id}:-"
+                for meeting_id in meeting_ids
+            )
+        )
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        
+        found_ids = [meeting_id for meeting_id in meeting_ids if meeting_id in meetings_by_id]
+        for i in range(0, len(found_ids), SQL_IN_BATCH_SIZE):
+            batch = found_ids[i:i + SQL_IN_BATCH_SIZE]
+            placeholders = ", ".join("?" for _ in batch)
+            cursor = await db.execute(
+                f"SELECT * FROM attendees WHERE meeting_id IN ({placeholders}) ORDER BY id",
+                batch
+            )
+            for row in await cursor.fetchall():
+                attendees_by_meeting[row["meeting_id"]].append(row)
+    
+    _set_etag(response, etag)
+    return MeetingStatusBatchResponse(
+        meetings=[
+            _build_status_response(meetings_by_id[meeting_id], attendees_by_meeting[meeting_id])
+            for meeting_id in found_ids
+        ],
+        not_found=[meeting_id for meeting_id in meeting_ids if meeting_id not in meetings_by_id],
+    )
+
+
+async def _load_meeting_state(meeting_id: str) -> Optional[dict]:
+    """讀取計算處理步驟所需的欄位"""
+    async with get_db_session(readonly=True) as db:
+        cursor = await db.execute(
+            "SELECT status, transcript_path, summary_path, error_message FROM meetings WHERE id = ?",
+            (meeting_id,)
+        )
+        row = await cursor.fetchone()
+    return dict(row) if row else None
+
+
+def _status_event(meeting_id: str, state: dict) -> dict:
+    """將狀態快照轉為推送給前端的事件（欄位與 /status 回應相同）"""
+    status = MeetingStatus(state["status"])
+    return {
+        "meeting_id": meeting_id,
+        "status": status.value,
+        "steps": _calculate_processing_steps(status, state).model_dump(mode="json"),
+        "error": state.get("error_message"),
+    }
+
+
+async def _meeting_status_events(meeting_id: str) -> AsyncIterator[Optional[dict]]:
+    """
+    產生會議狀態事件，狀態變化時送出事件，閒置時送出 None 作為心跳
+
+    先訂閱再讀取目前狀態，避免兩者之間發生的變化被漏掉；
+    處理可能由其他 worker 程序執行（收不到程序內事件），因此每次心跳也會重新查詢一次 DB。
+    會議完成或失敗後結束
+    """
+    async with meeting_events.subscribe(meeting_id) as queue:
+        state = await _load_meeting_state(meeting_id)
+        last_event = None
+        while state is not None:
+            event = _status_event(meeting_id, state)
+            if event != last_event:
+                yield event
+                last_event = event
+            if event["status"] in (MeetingStatus.COMPLETED.value, MeetingStatus.FAILED.value):
+                return
+            
+            try:
+                state = await asyncio.wait_for(queue.get(), timeout=get_settings().events_heartbeat_seconds)
+            except asyncio.TimeoutError:
+                yield None
+                state = await _load_meeting_state(meeting_id)
+
+
+@router.get("/{meeting_id}/events")
+async def stream_meeting_events(meeting_id: str):
+    """
+    以 Server-Sent Events 推送會議處理狀態（取代輪詢 /status）
+    
+    - event: status，data 與 /status 的 meeting_id / status / steps / error 相同
+    - 會議完成或失敗後伺服器關閉連線
+    """
+    if await _load_meeting_state(meeting_id) is None:
+        raise HTTPException(status_code=404, detail="會議不存在")
+    
+    async def event_stream():
+        # 斷線時瀏覽器 EventSource 的重連間隔
+        yield "retry: 3000\n\n"
+        async with aclosing(_meeting_status_events(meeting_id)) as events:
+            async for event in events:
+                if event is None:
+                    yield ": keep-alive\n\n"
+                else:
+                    yield f"event: status\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",  # 避免 nginx 緩衝
+        },
+    )
+
+
+@router.websocket("/{meeting_id}/ws")
+async def meeting_events_websocket(websocket: WebSocket, meeting_id: str):
+    """
+    以 WebSocket 推送會議處理狀態（內容同 /events，另以 type 區分 status / ping）
+    """
+    await websocket.accept()
+    if await _load_meeting_state(meeting_id) is None:
+        await websocket.close(code=4404, reason="會議不存在")
+        return
+    
+    try:
+        async with aclosing(_meeting_status_events(meeting_id)) as events:
+            async for event in events:
+                if event is None:
+                    await websocket.send_json({"type": "ping"})
+                else:
+                    await websocket.send_json({"type": "status", **event})
+        await websocket.close()
+    except (WebSocketDisconnect, RuntimeError):
+        pass  # 用戶端已斷線
+
+
+# JSON 摘要回應的壓縮（每個 ETag 只壓縮一次並快取；原檔下載則直接傳送寫入時預先壓縮的版本）
+SUMMARY_GZIP_LEVEL = 6
+
+
 @router.get("/{meeting_id}/summary")
-async def get_meeting_summary(meeting_id: str):
+async def get_meeting_summary(
+    meeting_id: str,
+    include_transcript: bool = Query(False, description="一併回傳完整逐字稿（長會議可能達數 MB，建議改用 /transcript 分頁讀取）"),
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
     """
     獲取會議摘要內容
+    
+    預設只回傳摘要；逐字稿請以 /{meeting_id}/transcript 分頁讀取。
+    ETag 由檔案的修改時間與大小組成，未變更時回傳 304，不讀取檔案內容。
+    用戶端接受 gzip 時回傳快取的壓縮本文（每個 ETag 只在背景執行緒壓縮一次）
     """
-    db = await get_db()
+    async with get_db_session(readonly=True) as db:
+        # 檢查會議是否存在
+        cursor = await db.execute(
+            "SELECT summary_path, transcript_path FROM meetings WHERE id = ?",
+            (meeting_id,)
+        )
+        meeting = await cursor.fetchone()
     
-    # 檢查會議是否存在
-    cursor = await db.execute(
-        "SELECT * FROM meetings WHERE id = ?",
-        (meeting_id,)
-    )
-    meeting = await cursor.fetchone()
+    if not meeting:
+        raise HTTPException(status_code=404, detail="會議不存在")
+    
+    meeting_dir = Path(get_settings().storage_path) / meeting_id
+    summary_file = meeting["summary_path"] or meeting_dir / "summary.md"
+    transcript_file = meeting["transcript_path"] or meeting_dir / "transcript.txt"
+    
+    etag_parts = ["summary", meeting_id, artifact_version(summary_file)]
+    if include_transcript:
+        etag_parts.append(artifact_version(transcript_file))
+    etag = _make_etag(*etag_parts)
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
+    
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    
+    if "gzip" in _accepted_encodings(accept_encoding):
+        def build_body() -> bytes:
+            result = {"meeting_id": meeting_id, "summary": read_text(summary_file)}
+            if include_transcript:
+                result["transcript"] = read_text(transcript_file)
+            return json_dumps(result)
+        
+        # 未命中時才讀檔並壓縮；摘要尚未產生（檔案不存在）時改走下方未壓縮的流程
+        view = "summary+transcript.json.gz" if include_transcript else "summary.json.gz"
+        body = await gzip_cached(summary_file, etag, build_body, view=view, level=SUMMARY_GZIP_LEVEL)
+        if body is not None:
+            headers["Content-Encoding"] = "gzip"
+            return Response(body, media_type="application/json", headers=headers)
+    
+    # 讀取摘要檔案（經由內容快取；可能已被壓縮，會自動解壓）
+    result = {
+        "meeting_id": meeting_id,
+        "summary": await read_text_cached(summary_file),
+    }
+    if include_transcript:
+        result["transcript"] = await read_text_cached(transcript_file)
+    
+    return Response(json_dumps(result), media_type="application/json", headers=headers)
+
+
+TRANSCRIPT_PAGE_CHARS = 16000
+TRANSCRIPT_MAX_CHARS = 200000
+
+
+def _encode_transcript_cursor(byte_offset: int) -> str:
+    """將逐字稿的位元組偏移編碼為分頁游標"""
+    raw = json.dumps([byte_offset]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_transcript_cursor(cursor: str) -> int:
+    """解析逐字稿分頁游標，格式錯誤時回傳 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        (byte_offset,) = json.loads(raw)
+        if not isinstance(byte_offset, int) or byte_offset < 0:
+            raise ValueError(byte_offset)
+        return byte_offset
+    except Exception:
+        raise HTTPException(status_code=400, detail="無效的分頁游標")
+
+
+@router.get("/{meeting_id}/transcript")
+async def get_meeting_transcript(
+    meeting_id: str,
+    response: Response,
+    cursor: Optional[str] = Query(None, description="上一頁回傳的 next_cursor"),
+    offset: Optional[int] = Query(None, ge=0, description="起始字元位置"),
+    line: Optional[int] = Query(None, ge=0, description="起始行號（從 0 開始）"),
+    lines: Optional[int] = Query(None, ge=1, le=10000, description="最多回傳的行數"),
+    limit: int = Query(TRANSCRIPT_PAGE_CHARS, ge=1, le=TRANSCRIPT_MAX_CHARS, description="最多回傳的字元數"),
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    分頁讀取會議逐字稿
+    
+    - 游標分頁：不帶參數取得第一頁，之後以 next_cursor 取得下一頁（直接 seek，不重新掃描）
+    - 字元範圍：offset + limit
+    - 行範圍：line + lines（單行超過 limit 時在行中截斷，可用 next_cursor 接續）
+    
+    cursor、offset、line 三者擇一；只讀取需要的部分，不載入整份逐字稿
+    """
+    if sum(value is not None for value in (cursor, offset, line)) > 1:
+        raise HTTPException(status_code=400, detail="cursor、offset、line 只能擇一使用")
+    byte_offset = _decode_transcript_cursor(cursor) if cursor else 0
+    
+    async with get_db_session(readonly=True) as db:
+        db_cursor = await db.execute(
+            "SELECT transcript_path FROM meetings WHERE id = ?",
+            (meeting_id,)
+        )
+        meeting = await db_cursor.fetchone()
     
     if not meeting:
         raise HTTPException(status_code=404, detail="會議不存在")
     
-    # 讀取摘要檔案
-    summary_content = ""
-    transcript_content = ""
+    transcript_file = (
+        meeting["transcript_path"] or Path(get_settings().storage_path) / meeting_id / "transcript.txt"
+    )
     
-    meeting_dir = Path(settings.storage_path) / meeting_id
+    etag = _make_etag(
+        "transcript", meeting_id, artifact_version(transcript_file),
+        byte_offset, offset, line, lines, limit,
+    )
+    if _etag_matches(if_none_match, etag):
+        return _not_modified(etag)
     
-    summary_path = meeting_dir / "summary.md"
-    if summary_path.exists():
-        summary_content = summary_path.read_text(encoding="utf-8")
+    try:
+        page = await track_io(asyncio.to_thread(
+            read_text_page,
+            transcript_file,
+            byte_offset=byte_offset,
+            skip_chars=offset or 0,
+            skip_lines=line or 0,
+            max_chars=limit,
+            max_lines=lines,
+        ))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="無效的分頁游標")
     
-    transcript_path = meeting_dir / "transcript.txt"
-    if transcript_path.exists():
-        transcript_content = transcript_path.read_text(encoding="utf-8")
+    if page is None:
+        page = {"text": "", "start": 0, "end": 0, "eof": True}
     
+    _set_etag(response, etag)
     return {
         "meeting_id": meeting_id,
-        "summary": summary_content,
-        "transcript": transcript_content,
+        "text": page["text"],
+        "has_more": not page["eof"],
+        "next_cursor": None if page["eof"] else _encode_transcript_cursor(page["end"]),
     }
 
 
+def _accepted_encodings(accept_encoding: Optional[str]) -> set:
+    """解析 Accept-Encoding，回傳可接受的 content-coding（q=0 視為不接受）"""
+    accepted = set()
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(coding)
+    if "*" in accepted:
+        accepted |= {"br", "gzip"}
+    return accepted
+
+
+async def _serve_artifact(
+    meeting_id: str,
+    kind: str,
+    media_type: str,
+    accept_encoding: Optional[str],
+    if_none_match: Optional[str],
+) -> Response:
+    """
+    以原始檔案傳送逐字稿或摘要
+
+    用戶端接受時直接傳送寫入時預先壓縮的 .br / .gz（不需即時壓縮）；
+    compressed 層只剩 .gz 而用戶端不接受 gzip 時才解壓後傳送
+    """
+    column = ARTIFACT_COLUMNS[kind]
+    async with get_db_session(readonly=True) as db:
+        cursor = await db.execute(
+            f"SELECT {column} FROM meetings WHERE id = ?",
+            (meeting_id,)
+        )
+        meeting = await cursor.fetchone()
+    
+    if not meeting:
+        raise HTTPException(status_code=404, detail="會議不存在")
+    
+    variants = encoded_variants(meeting[column])
+    if not variants:
+        raise HTTPException(status_code=404, detail="檔案不存在")
+    
+    headers = {"Vary": "Accept-Encoding", "Cache-Control": "no-cache"}
+    accepted = _accepted_encodings(accept_encoding)
+    for coding in ("br", "gzip", "identity"):
+        if coding not in variants or (coding != "identity" and coding not in accepted):
+            continue
+        path, stat = variants[coding]
+        if coding != "identity":
+            headers["Content-Encoding"] = coding
+        response = FileResponse(path, media_type=media_type, stat_result=stat, headers=headers)
+        etag = response.headers["etag"]
+        if _etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers={**headers, "ETag": etag})
+        return response
+    
+    # 只剩壓縮檔且用戶端不接受壓縮
+    etag = _make_etag(kind, meeting_id, artifact_version(meeting[column]))
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={**headers, "ETag": etag})
+    content = await read_text_cached(meeting[column])
+    return Response(content, media_type=media_type, headers={**headers, "ETag": etag})
+
+
+@router.api_route("/{meeting_id}/summary.md", methods=["GET", "HEAD"])
+async def get_meeting_summary_file(
+    meeting_id: str,
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    """以 Markdown 原檔傳送會議摘要（依 Accept-Encoding 傳送預先壓縮的版本）"""
+    return await _serve_artifact(
+        meeting_id, "summary", "text/markdown; charset=utf-8", accept_encoding, if_none_match
+    )
+
+
+@router.api_route("/{meeting_id}/transcript.txt", methods=["GET", "HEAD"])
+async def get_meeting_transcript_file(
+    meeting_id: str,
+    accept_encoding: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
+):
+    """以純文字原檔傳送完整逐字稿（依 Accept-Encoding 傳送預先壓縮的版本）"""
+    return await _serve_artifact(
+        meeting_id, "transcript", "text/plain; charset=utf-8", accept_encoding, if_none_match
+    )
+
+
+AUDIO_MEDIA_TYPES = {
+    ".m4a": "audio/mp4",
+    ".mp4": "audio/mp4",
+    ".webm": "audio/webm",
+    ".wav": "audio/wav",
+    ".mp3": "audio/mpeg",
+}
+AUDIO_CACHE_CONTROL = "private, max-age=86400"  # 音檔上傳後不再變更
+
+
+def _accel_redirect_uri(audio_path: Path) -> Optional[str]:
+    """音檔對應的 nginx internal location（未設定或不在 root 目錄下時回傳 None）"""
+    settings = get_settings()
+    if not settings.audio_accel_redirect_prefix:
+        return None
+    try:
+        relative = audio_path.resolve().relative_to(Path(settings.audio_accel_redirect_root).resolve())
+    except ValueError:
+        return None
+    return f"{settings.audio_accel_redirect_prefix.rstrip('/')}/{relative.as_posix()}"
+
+
+@router.api_route("/{meeting_id}/audio", methods=["GET", "HEAD"])
+async def get_meeting_audio(
+    meeting_id: str,
+    if_none_match: Optional[str] = Header(None),
+):
+    """
+    播放會議錄音
+    
+    - 支援 Range / If-Range（206、多段範圍、416），播放器拖曳時只傳送需要的片段
+    - 伺服器支援 ASGI pathsend 擴充時由伺服器直接傳送檔案；
+      設定 audio_accel_redirect_prefix 時改以 X-Accel-Redirect 交給 nginx 以 sendfile 傳送
+    - 音檔可能已被移至封存層，一律以 meetings.audio_path 為準
+    """
+    # 壓縮器可能在查詢與讀取之間搬移音檔，找不到時重新查詢一次
+    for _ in range(2):
+        async with get_db_session(readonly=True) as db:
+            cursor = await db.execute(
+                "SELECT audio_path FROM meetings WHERE id = ?",
+                (meeting_id,)
+            )
+            meeting = await cursor.fetchone()
+        
+        if not meeting:
+            raise HTTPException(status_code=404, detail="會議不存在")
+        if not meeting["audio_path"]:
+            raise HTTPException(status_code=404, detail="尚未上傳錄音")
+        
+        audio_path = Path(meeting["audio_path"])
+        try:
+            stat = audio_path.stat()
+            break
+        except FileNotFoundError:
+            continue
+    else:
+        raise HTTPException(status_code=404, detail="錄音檔不存在")
+    
+    media_type = AUDIO_MEDIA_TYPES.get(audio_path.suffix.lower(), "application/octet-stream")
+    
+    accel_uri = _accel_redirect_uri(audio_path)
+    if accel_uri:
+        # Range、Content-Length 等由 nginx 處理
+        return Response(
+            media_type=media_type,
+            headers={"X-Accel-Redirect": accel_uri, "Cache-Control": AUDIO_CACHE_CONTROL},
+        )
+    
+    response = FileResponse(
+        audio_path,
+        media_type=media_type,
+        stat_result=stat,
+        headers={"Cache-Control": AUDIO_CACHE_CONTROL},
+    )
+    etag = response.headers["etag"]
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag, "Cache-Control": AUDIO_CACHE_CONTROL})
+    return response
+
+
+def _encode_list_cursor(created_at: str, meeting_id: str) -> str:
+    """將最後一筆的排序鍵編碼為分頁游標"""
+    raw = json.dumps([created_at, meeting_id], ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_list_cursor(cursor: str) -> Tuple[str, str]:
+    """解析分頁游標，格式錯誤時回傳 400"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, meeting_id = json.loads(raw)
+        return str(created_at), str(meeting_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="無效的分頁游標")
+
+
+MEETING_LIST_FIELDS = ("id", "room", "start_time", "end_time", "status", "created_at")
+
+
 @router.get("/my/list")
 async def get_my_meetings(
     authorization: str = Header(...),
-    limit: int = 50,
-    offset: int = 0
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
 ):
     """
     獲取當前用戶的會議列表
     需要登入
+    
+    - cursor: 上一頁回傳的 next_cursor（keyset 分頁，深頁也只需一次索引查找）
+    - offset: 舊版分頁參數，未提供 cursor 時使用
+    - ETag 由 users.meetings_version（觸發器維護）與分頁參數組成，未變更時回傳 304
+    - 資料列直接轉為 dict 並以 FastJSONResponse 編碼，不經 jsonable_encoder
     """
     user_id = await get_current_user_id(authorization)
     
     if not user_id:
         raise HTTPException(status_code=401, detail="請先登入")
     
-    db = await get_db()
+    # 多取一筆以判斷是否還有下一頁
+    if cursor:
+        after_created_at, after_id = _decode_list_cursor(cursor)
+        query = f"""
+            SELECT {", ".join(MEETING_LIST_FIELDS)}
+            FROM meetings
+            WHERE user_id = ? AND (created_at, id) < (?, ?)
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+            """
+        params = (user_id, after_created_at, after_id, limit + 1)
+    else:
+        query = f"""
+            SELECT {", ".join(MEETING_LIST_FIELDS)}
+            FROM meetings
+            WHERE user_id = ?
+            ORDER BY created_at DESC, id DESC
+            LIMIT ? OFFSET ?
+            """
+        params = (user_id, limit + 1, offset)
     
-    # 查詢用戶的會議
-    cursor = await db.execute(
-        """
-        SELECT id, room, start_time, end_time, status, created_at
-        FROM meetings 
-        WHERE user_id = ?
-        ORDER BY created_at DESC
-        LIMIT ? OFFSET ?
-        """,
-        (user_id, limit, offset)
-    )
-    meetings = await cursor.fetchall()
+    async with get_db_session(readonly=True) as db:
+        # 獲取總數與版本（由觸發器維護的欄位）；須在查詢列表之前讀取，
+        # 確保 ETag 不會比回應內容新
+        db_cursor = await db.execute(
+            "SELECT meeting_count, meetings_version FROM users WHERE id = ?",
+            (user_id,)
+        )
+        user_row = await db_cursor.fetchone()
+        if user_row is None:
+            # 用戶已被刪除但 Token 仍在快取中：讓快取失效並要求重新登入
+            token_cache.invalidate(hash_token(authorization[7:]))
+            raise HTTPException(status_code=401, detail="用戶不存在，請重新登入")
+        total = user_row["meeting_count"]
+        etag = _make_etag("list", user_id, user_row["meetings_version"], total, limit, offset, cursor)
+        if _etag_matches(if_none_match, etag):
+            return _not_modified(etag)
+        
+        # 查詢用戶的會議
+        db_cursor = await db.execute(query, params)
+        meetings = await db_cursor.fetchall()
     
-    # 獲取總數
-    cursor = await db.execute(
-        "SELECT COUNT(*) as count FROM meetings WHERE user_id = ?",
-        (user_id,)
+    has_more = len(meetings) > limit
+    meetings = meetings[:limit]
+    next_cursor = (
+        _encode_list_cursor(meetings[-1]["created_at"], meetings[-1]["id"])
+        if has_more else None
     )
-    total = (await cursor.fetchone())["count"]
     
-    return {
-        "meetings": [
-            {
-                "id": m["id"],
-                "room": m["room"],
-                "start_time": m["start_time"],
-                "end_time": m["end_time"],
-                "status": m["status"],
-                "created_at": m["created_at"]
-            }
-            for m in meetings
-        ],
+    response = FastJSONResponse({
+        "meetings": rows_to_dicts(meetings, MEETING_LIST_FIELDS),
         "total": total,
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_cursor": next_cursor
+    })
+    _set_etag(response, etag)
+    return response
+
+
+@router.get("/search")
+async def search_my_meetings(
+    q: str = Query(..., min_length=1, max_length=200, description="搜尋關鍵字（空白分隔多個詞）"),
+    limit: int = Query(20, ge=1, le=100),
+    authorization: str = Header(...)
+):
+    """
+    搜尋當前用戶的會議逐字稿與摘要
+    需要登入
+    
+    - 依相關度排序
+    - 片段已跳脫 HTML，關鍵字以 <mark></mark> 標示，可直接以 HTML 顯示
+    """
+    user_id = await get_current_user_id(authorization)
+    
+    if not user_id:
+        raise HTTPException(status_code=401, detail="請先登入")
+    
+    async with get_db_session(readonly=True) as db:
+        results = await search_meetings(db, user_id, q, limit)
+    
+    return {
+        "query": q,
+        "results": results,
+        "count": len(results)
     }
 
 
@@ -418,6 +1033,7 @@ async def get_daily_summary(
     
     - date: 日期格式 YYYY-MM-DD，預設為今天
     - 返回該日所有已完成會議的合併摘要
+    - 重點取自 daily_digests（會議完成時預先整理），一般情況只需一次索引查詢
     """
     user_id = await get_current_user_id(authorization)
     
@@ -425,7 +1041,6 @@ async def get_daily_summary(
         raise HTTPException(status_code=401, detail="請先登入")
     
     # 解析日期
-    from datetime import datetime, timedelta
     if date:
         try:
             target_date = datetime.strptime(date, "%Y-%m-%d")
@@ -434,76 +1049,33 @@ async def get_daily_summary(
     else:
         target_date = datetime.now()
     
-    # 當天的時間範圍
-    start_of_day = target_date.replace(hour=0, minute=0, second=0, microsecond=0)
-    end_of_day = start_of_day + timedelta(days=1)
-    
-    db = await get_db()
+    digest = await get_daily_digest(user_id, target_date.date())
+    user, items = digest if digest else (None, [])
     
-    # 查詢當天已完成的會議
-    cursor = await db.execute(
-        """
-        SELECT id, room, topic, start_time, end_time, summary_path
-        FROM meetings
-        WHERE user_id = ? 
-          AND status = 'completed'
-          AND start_time >= ?
-          AND start_time < ?
-        ORDER BY start_time ASC
-        """,
-        (user_id, start_of_day.isoformat(), end_of_day.isoformat())
-    )
-    meetings = await cursor.fetchall()
-    
-    if not meetings:
+    if not items:
         return {
             "summary": "今天還沒有已完成的會議記錄。",
             "date": target_date.strftime("%Y-%m-%d"),
             "meeting_count": 0
         }
     
-    # 獲取用戶名稱
-    cursor = await db.execute("SELECT email, name FROM users WHERE id = ?", (user_id,))
-    user = await cursor.fetchone()
     user_name = user["name"] if user and user["name"] else user["email"].split("@")[0].split(".")[0].capitalize() if user else "用戶"
     
     # 生成每日總結
     date_str = target_date.strftime("%-m/%-d")
     summary_lines = [f"📅 {date_str} {user_name} 業務日誌\n"]
     
-    for idx, meeting in enumerate(meetings, 1):
-        topic = meeting["topic"] or meeting["room"]
-        time_str = datetime.fromisoformat(meeting["start_time"]).strftime("%H:%M")
+    for idx, item in enumerate(items, 1):
+        topic = item["topic"] or item["room"]
+        time_str = datetime.fromisoformat(item["start_time"]).strftime("%H:%M")
         
         summary_lines.append(f"{idx}. {topic}")
-        
-        # 讀取會議摘要
-        if meeting["summary_path"]:
-            summary_path = Path(settings.storage_path) / meeting["id"] / meeting["summary_path"]
-            if summary_path.exists():
-                try:
-                    with open(summary_path, "r", encoding="utf-8") as f:
-                        meeting_summary = f.read()
-                    # 提取摘要重點（簡化）
-                    lines = meeting_summary.split("\n")
-                    key_points = []
-                    for line in lines:
-                        line = line.strip()
-                        if line.startswith("-") or line.startswith("•"):
-                            key_points.append(line)
-                        if len(key_points) >= 3:
-                            break
-                    if key_points:
-                        for point in key_points:
-                            summary_lines.append(f"   {point}")
-                except Exception:
-                    pass
-        
+        for point in item["key_points"]:
+            summary_lines.append(f"   {point}")
         summary_lines.append(f"   ⏰ {time_str}\n")
     
     return {
         "summary": "\n".join(summary_lines),
         "date": target_date.strftime("%Y-%m-%d"),
-        "meeting_count": len(meetings)
+        "meeting_count": len(items)
     }
-
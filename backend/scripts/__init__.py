@@ -0,0 +1 @@
+"""維運指令模組（於 backend 目錄下以 python -m scripts.<name> 執行）"""
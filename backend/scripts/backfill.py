@@ -0,0 +1,323 @@
+"""
+批次重跑會議處理流程
+依條件挑選歷史會議，以可控的併發數與速率上限重新產生摘要
+
+使用方式（於 backend 目錄下）：
+
+    # 先估算 token 與所需時間
+    python -m scripts.backfill --date-from 2024-01-01 --date-to 2024-03-31 --dry-run
+
+    # 正式執行，4 個併發、每分鐘最多 30 場
+    python -m scripts.backfill --date-from 2024-01-01 --date-to 2024-03-31 \\
+        --concurrency 4 --rate 30
+
+中斷後以相同指令重新執行即可從上次進度繼續。進度檔預設依篩選條件、處理參數、
+摘要提示詞與模型命名（見 run_key()），條件或提示詞改變後的批次會自動使用新的進度檔，
+不會略過先前批次已完成的會議；也可以 --state-file 指定。
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from config import get_settings, ensure_directories
+from database import init_db, close_db, get_db
+from models.meeting import MeetingStatus
+from services.processor import process_meeting
+from services.storage import artifact_exists, read_text
+from services.summary import SUMMARY_PROMPT
+
+# 摘要輸出上限（與 services/summary.py 的 max_tokens 一致）
+SUMMARY_MAX_OUTPUT_TOKENS = 2000
+
+# 估算用：英數字約 4 字元一個 token，中日韓文字約 1 字一個 token
+ASCII_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算文字的 token 數（僅供 dry-run 使用）"""
+    cjk = sum(1 for ch in text if ord(ch) > 0x2E80)
+    return cjk + (len(text) - cjk) // ASCII_CHARS_PER_TOKEN
+
+
+class RateLimiter:
+    """簡易速率限制器：保證兩次啟動之間至少間隔 60/rate 秒"""
+
+    def __init__(self, per_minute: Optional[float]):
+        self._interval = 60.0 / per_minute if per_minute else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        if not self._interval:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            if self._next_at > now:
+                await asyncio.sleep(self._next_at - now)
+            self._next_at = max(now, self._next_at) + self._interval
+
+
+def run_parameters(args) -> dict:
+    """決定重跑結果的參數（篩選條件、處理選項、提示詞與模型），不含併發數等執行速度設定"""
+    settings = get_settings()
+    return {
+        "date_from": args.date_from.date().isoformat() if args.date_from else None,
+        "date_to": args.date_to.date().isoformat() if args.date_to else None,
+        "user": args.user,
+        "room": args.room,
+        "status": sorted(args.status),
+        "reuse_transcript": args.reuse_transcript,
+        "send_email": args.send_email,
+        "summary_prompt": hashlib.sha256(SUMMARY_PROMPT.encode("utf-8")).hexdigest(),
+        "gpt_model": settings.gpt_model,
+        "whisper_model": settings.whisper_model,
+    }
+
+
+def run_key(params: dict) -> str:
+    """參數的雜湊（預設進度檔名用）"""
+    raw = json.dumps(params, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:16]
+
+
+class BackfillState:
+    """斷點續跑的進度檔"""
+
+    def __init__(self, path: Path, params: Optional[dict] = None):
+        self.path = path
+        self.params = params or {}
+        self.completed: set = set()
+        self.failed: dict = {}
+
+    def load(self):
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.completed = set(data.get("completed", []))
+            self.failed = data.get("failed", {})
+            stored = data.get("params")
+            if stored and self.params and stored != self.params:
+                print(f"⚠️ 進度檔 {self.path} 由不同參數的批次建立，已完成的會議仍會被略過（需要時請加上 --reset）")
+
+    def save(self):
+        # 先寫暫存檔再替換，避免中斷時留下損毀的進度檔
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {"params": self.params, "completed": sorted(self.completed), "failed": self.failed},
+                ensure_ascii=False,
+            ),
+            encoding="utf-8",
+        )
+        os.replace(tmp_path, self.path)
+
+
+async def select_meetings(args) -> List[dict]:
+    """依條件挑選會議"""
+    db = await get_db()
+
+    conditions = []
+    params: list = []
+
+    if args.date_from:
+        conditions.append("m.start_time >= ?")
+        params.append(args.date_from.isoformat())
+    if args.date_to:
+        conditions.append("m.start_time < ?")
+        params.append((args.date_to + timedelta(days=1)).isoformat())
+    if args.user:
+        if args.user.isdigit():
+            conditions.append("m.user_id = ?")
+            params.append(int(args.user))
+        else:
+            conditions.append("u.email = ?")
+            params.append(args.user.lower().strip())
+    if args.room:
+        conditions.append("m.room = ?")
+        params.append(args.room)
+    if args.status:
+        conditions.append(f"m.status IN ({', '.join('?' for _ in args.status)})")
+        params.extend(args.status)
+
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    cursor = await db.execute(
+        f"""
+        SELECT m.id, m.room, m.start_time, m.status, m.audio_path, m.transcript_path
+        FROM meetings m
+        LEFT JOIN users u ON u.id = m.user_id
+        {where}
+        ORDER BY m.start_time
+        """,
+        params,
+    )
+    return [dict(row) for row in await cursor.fetchall()]
+
+
+def dry_run(meetings: List[dict], args):
+    """估算 token 用量與預計時間，不實際處理"""
+    prompt_overhead = estimate_tokens(SUMMARY_PROMPT)
+    input_tokens = 0
+    need_transcription = 0
+    audio_bytes = 0
+
+    for meeting in meetings:
+        transcript_path = meeting["transcript_path"]
+        # 逐字稿可能已壓縮為 .gz，與 process_meeting 相同經由 storage 判斷與讀取
+        if args.reuse_transcript and artifact_exists(transcript_path):
+            text = read_text(transcript_path)
+            input_tokens += prompt_overhead + estimate_tokens(text)
+        else:
+            need_transcription += 1
+            input_tokens += prompt_overhead
+            if meeting["audio_path"] and Path(meeting["audio_path"]).exists():
+                audio_bytes += Path(meeting["audio_path"]).stat().st_size
+
+    output_tokens = len(meetings) * SUMMARY_MAX_OUTPUT_TOKENS
+    # 受併發數與速率上限兩者中較嚴格者限制
+    by_concurrency = len(meetings) * args.avg_seconds / args.concurrency
+    by_rate = len(meetings) * 60.0 / args.rate if args.rate else 0.0
+    eta_seconds = max(by_concurrency, by_rate)
+
+    print("🔍 Dry-run 估算結果")
+    print(f"   會議數: {len(meetings)}")
+    print(f"   需重新語音轉文字: {need_transcription} 場（音檔共 {audio_bytes / 1024 / 1024:.1f} MB）")
+    print(f"   輸入 token（估計，不含需轉錄者的逐字稿）: {input_tokens:,}")
+    print(f"   輸出 token（上限）: {output_tokens:,}")
+    print(f"   預計時間: {timedelta(seconds=int(eta_seconds))}")
+
+
+async def run_backfill(meetings: List[dict], state: BackfillState, args):
+    """以限定併發數與速率執行 process_meeting"""
+    pending = [m for m in meetings if m["id"] not in state.completed]
+    total = len(pending)
+    skipped = len(meetings) - total
+    if skipped:
+        print(f"⏭️  略過已完成的 {skipped} 場會議")
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    limiter = RateLimiter(args.rate)
+    started_at = time.monotonic()
+    done = 0
+
+    async def worker(meeting: dict):
+        nonlocal done
+        async with semaphore:
+            await limiter.wait()
+            meeting_id = meeting["id"]
+            try:
+                await process_meeting(
+                    meeting_id,
+                    reuse_transcript=args.reuse_transcript,
+                    send_email=args.send_email,
+                    keep_on_failure=True,
+                )
+                state.completed.add(meeting_id)
+                state.failed.pop(meeting_id, None)
+            except Exception as e:
+                state.failed[meeting_id] = str(e)
+            state.save()
+
+            done += 1
+            elapsed = time.monotonic() - started_at
+            remaining = (total - done) * elapsed / done
+            print(
+                f"📊 進度 {done}/{total}"
+                f"（失敗 {len(state.failed)}）"
+                f" 已耗時 {timedelta(seconds=int(elapsed))}"
+                f" 預計剩餘 {timedelta(seconds=int(remaining))}"
+            )
+
+    await asyncio.gather(*(worker(m) for m in pending))
+
+    print(f"🎉 批次處理結束：成功 {total - len(state.failed)}，失敗 {len(state.failed)}")
+    for meeting_id, error in state.failed.items():
+        print(f"   ❌ {meeting_id}: {error}")
+    if state.failed:
+        print("   失敗的會議維持原本的狀態與摘要，錯誤已記錄於進度檔；以相同指令重新執行即可重試")
+
+
+def _parse_date(value: str) -> datetime:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise argparse.ArgumentTypeError("日期格式錯誤，請使用 YYYY-MM-DD")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="批次重跑會議摘要")
+    parser.add_argument("--date-from", type=_parse_date, help="開始日期 YYYY-MM-DD（含）")
+    parser.add_argument("--date-to", type=_parse_date, help="結束日期 YYYY-MM-DD（含）")
+    parser.add_argument("--user", help="用戶 ID 或 Email")
+    parser.add_argument("--room", help="會議室名稱")
+    parser.add_argument(
+        "--status",
+        action="append",
+        choices=[s.value for s in MeetingStatus],
+        help="會議狀態，可重複指定（預設 completed）",
+    )
+    parser.add_argument("--concurrency", type=int, default=2, help="同時處理的會議數")
+    parser.add_argument("--rate", type=float, default=None, help="每分鐘最多啟動幾場會議")
+    parser.add_argument(
+        "--state-file",
+        type=Path,
+        default=None,
+        help="進度檔路徑（斷點續跑用，預設為 storage_path 同層、依參數雜湊命名的 backfill_state_<key>.json）",
+    )
+    parser.add_argument("--reset", action="store_true", help="忽略既有進度，從頭開始")
+    parser.add_argument(
+        "--no-reuse-transcript",
+        dest="reuse_transcript",
+        action="store_false",
+        help="即使已有逐字稿也重新語音轉文字",
+    )
+    parser.add_argument("--send-email", action="store_true", help="重跑後寄送摘要 Email")
+    parser.add_argument("--dry-run", action="store_true", help="只估算 token 與時間")
+    parser.add_argument(
+        "--avg-seconds",
+        type=float,
+        default=30.0,
+        help="dry-run 估算用的單場平均處理秒數",
+    )
+    return parser
+
+
+async def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    if not args.status:
+        args.status = [MeetingStatus.COMPLETED.value]
+    if args.concurrency < 1:
+        print("❌ --concurrency 必須大於 0")
+        return 2
+    params = run_parameters(args)
+    if args.state_file is None:
+        args.state_file = Path(get_settings().storage_path).parent / f"backfill_state_{run_key(params)}.json"
+
+    ensure_directories()
+    await init_db()
+    try:
+        meetings = await select_meetings(args)
+        print(f"📋 符合條件的會議: {len(meetings)} 場")
+
+        if args.dry_run:
+            dry_run(meetings, args)
+            return 0
+
+        state = BackfillState(args.state_file, params)
+        if not args.reset:
+            state.load()
+        print(f"💾 進度檔: {args.state_file}")
+        await run_backfill(meetings, state, args)
+        return 1 if state.failed else 0
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,64 @@
+"""
+手動執行分層儲存壓縮
+將超過保存期限的逐字稿/摘要壓縮、音檔移至封存層（與服務內的背景壓縮器相同邏輯）
+
+使用方式（於 backend 目錄下）：
+
+    python -m scripts.compact_storage
+    python -m scripts.compact_storage --io-mb-per-sec 50 --max-files 1000
+    python -m scripts.compact_storage --dry-run
+"""
+
+import argparse
+import asyncio
+import sys
+
+from config import ensure_directories, get_settings
+from database import init_db, close_db
+from services.storage import storage_compactor
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="分層儲存壓縮")
+    parser.add_argument("--io-mb-per-sec", type=float, default=None, help="讀寫頻寬上限（預設用設定值）")
+    parser.add_argument("--max-files", type=int, default=None, help="最多處理的檔案數")
+    parser.add_argument("--dry-run", action="store_true", help="只列出候選檔案")
+    args = parser.parse_args()
+
+    settings = get_settings()
+    if args.io_mb_per_sec is not None:
+        settings.storage_compactor_io_mb_per_sec = args.io_mb_per_sec
+
+    ensure_directories()
+    await init_db()
+    try:
+        if args.dry_run:
+            candidates = await storage_compactor.find_candidates(args.max_files or 1000)
+            for artifact in candidates:
+                print(f"   {artifact['start_time'][:10]}  {artifact['kind']:<10} {artifact['path']}")
+            print(f"📋 候選檔案: {len(candidates)} 個")
+            return 0
+
+        total = 0
+        while args.max_files is None or total < args.max_files:
+            batch_size = settings.storage_compactor_batch_size
+            if args.max_files is not None:
+                batch_size = min(batch_size, args.max_files - total)
+            moved = await storage_compactor.run_once(limit=batch_size)
+            total += moved
+            if moved == 0:
+                break
+            print(f"📊 已處理 {total} 個檔案")
+
+        stats = storage_compactor.stats()
+        print(
+            f"🎉 完成：壓縮 {stats['compressed']} 個、封存 {stats['archived']} 個，"
+            f"釋放 {stats['bytes_freed'] / 1024 / 1024:.1f} MB，失敗 {stats['errors']} 個"
+        )
+        return 0 if stats["errors"] == 0 else 1
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,56 @@
+"""
+批次匯出會議資料（與 /api/admin/export 相同的輸出），串流寫入檔案或標準輸出
+
+使用方式（於 backend 目錄下）：
+
+    python -m scripts.export_meetings --format ndjson --start 2024-01-01 --end 2024-03-31 -o q1.ndjson
+    python -m scripts.export_meetings --format zip --user-id 3 -o user3.zip
+    python -m scripts.export_meetings --format csv --no-transcript > meetings.csv
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from contextlib import redirect_stdout
+from datetime import date
+
+from database import init_db, close_db
+from services.export import EXPORT_FORMATS, export_meetings
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="批次匯出會議資料")
+    parser.add_argument("--format", choices=sorted(EXPORT_FORMATS), default="ndjson")
+    parser.add_argument("--start", type=date.fromisoformat, help="起始日期 (YYYY-MM-DD，含)")
+    parser.add_argument("--end", type=date.fromisoformat, help="結束日期 (YYYY-MM-DD，含)")
+    parser.add_argument("--user-id", type=int, help="只匯出該用戶的會議")
+    parser.add_argument("--no-transcript", action="store_true", help="不包含逐字稿")
+    parser.add_argument("-o", "--output", help="輸出檔案（預設為標準輸出）")
+    args = parser.parse_args()
+
+    output = open(args.output, "wb") if args.output else sys.stdout.buffer
+    # 其他訊息（含資料庫初始化的訊息）一律寫到 stderr，避免混入標準輸出的匯出內容
+    with redirect_stdout(sys.stderr):
+        await init_db()
+        started = time.perf_counter()
+        written = 0
+        try:
+            async for data in export_meetings(
+                args.format, args.start, args.end, args.user_id, not args.no_transcript
+            ):
+                output.write(data)
+                written += len(data)
+        finally:
+            if args.output:
+                output.close()
+            else:
+                output.flush()
+            await close_db()
+
+        print(f"🎉 匯出完成：{written / 1024 / 1024:,.1f} MB，耗時 {time.perf_counter() - started:.1f} 秒")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,64 @@
+"""
+為既有的逐字稿與摘要產生預先壓縮的版本（.gz / .br）
+新處理的會議在寫入時即會產生，此腳本只需在升級後執行一次
+
+使用方式（於 backend 目錄下）：
+
+    python -m scripts.precompress_artifacts
+    python -m scripts.precompress_artifacts --force
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from config import ensure_directories
+from database import init_db, close_db, get_db_session
+from services.storage import COMPRESSED_SUFFIX, TIER_HOT, precompress
+
+
+def _needs_precompress(path: Path) -> bool:
+    """沒有 .gz 或 .gz 比原檔舊"""
+    variant = path.with_name(path.name + COMPRESSED_SUFFIX)
+    try:
+        return variant.stat().st_mtime_ns < path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return True
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description="產生逐字稿/摘要的預先壓縮版本")
+    parser.add_argument("--force", action="store_true", help="已有壓縮版本時也重新產生")
+    args = parser.parse_args()
+
+    ensure_directories()
+    await init_db()
+    try:
+        async with get_db_session(readonly=True) as db:
+            cursor = await db.execute(
+                "SELECT path FROM meeting_artifacts WHERE tier = ? AND kind IN ('transcript', 'summary')",
+                (TIER_HOT,)
+            )
+            paths = [Path(row["path"]) for row in await cursor.fetchall()]
+
+        done = skipped = failed = 0
+        for path in paths:
+            if not path.exists() or not (args.force or _needs_precompress(path)):
+                skipped += 1
+                continue
+            try:
+                await asyncio.to_thread(precompress, path)
+                done += 1
+            except Exception as e:
+                failed += 1
+                print(f"⚠️ 壓縮失敗: {path}, 錯誤: {str(e)}")
+
+        print(f"🎉 完成：產生 {done} 個、略過 {skipped} 個、失敗 {failed} 個")
+        return 0 if failed == 0 else 1
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
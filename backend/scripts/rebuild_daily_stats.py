@@ -0,0 +1,35 @@
+"""
+重建每日統計彙總表
+由 meetings 全量重新計算 daily_user_stats（首次部署或資料修正後執行）
+
+使用方式（於 backend 目錄下）：
+
+    python -m scripts.rebuild_daily_stats
+"""
+
+import asyncio
+import sys
+
+from config import ensure_directories
+from database import init_db, close_db, get_db
+from services.stats import rebuild_daily_stats
+
+
+async def main() -> int:
+    ensure_directories()
+    await init_db()
+    try:
+        db = await get_db()
+        await rebuild_daily_stats(db)
+        await db.commit()
+
+        cursor = await db.execute("SELECT COUNT(*) AS count FROM daily_user_stats")
+        count = (await cursor.fetchone())["count"]
+        print(f"🎉 每日統計重建完成，共 {count} 列")
+        return 0
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,88 @@
+"""
+重建會議全文搜尋索引
+為既有會議（或索引損毀時）重新建立 meeting_search 內容
+
+使用方式（於 backend 目錄下）：
+
+    python -m scripts.rebuild_search_index
+
+可在服務執行中使用：每場會議以獨立的 WriteBatch 替換自己的索引列，舊索引在替換前
+仍可被搜尋；逐字稿與摘要在背景執行緒讀取，寫入交易內不做檔案 I/O，
+不會長時間佔住寫入鎖而讓服務的寫入等待
+"""
+
+import asyncio
+import sys
+from typing import List, Tuple
+
+from config import ensure_directories
+from database import init_db, close_db, get_db_session, WriteBatch
+from services.search import index_meeting
+from services.storage import read_text
+
+# 每次在背景執行緒讀檔的會議數
+BATCH_SIZE = 200
+
+
+def _read_contents(meetings: List[dict]) -> List[Tuple[str, str]]:
+    """讀取一組會議的逐字稿與摘要（於背景執行緒執行）"""
+    return [
+        (read_text(meeting["transcript_path"]), read_text(meeting["summary_path"]))
+        for meeting in meetings
+    ]
+
+
+async def _reindex(meeting_id: str, transcript: str, summary: str):
+    async def index(conn):
+        await index_meeting(conn, meeting_id, transcript=transcript, summary=summary)
+
+    await WriteBatch().run(index).commit()
+
+
+async def main() -> int:
+    ensure_directories()
+    await init_db()
+    try:
+        async with get_db_session(readonly=True) as db:
+            cursor = await db.execute(
+                """
+                SELECT id, transcript_path, summary_path FROM meetings
+                WHERE status = 'completed' ORDER BY start_time
+                """
+            )
+            meetings = [dict(row) for row in await cursor.fetchall()]
+        print(f"📋 需建立索引的會議: {len(meetings)} 場")
+
+        for start in range(0, len(meetings), BATCH_SIZE):
+            group = meetings[start:start + BATCH_SIZE]
+            contents = await asyncio.to_thread(_read_contents, group)
+            # 逐場提交：每個交易只包含一場會議，寫入鎖只佔用很短的時間
+            for meeting, (transcript, summary) in zip(group, contents):
+                await _reindex(meeting["id"], transcript, summary)
+            print(f"📊 進度 {start + len(group)}/{len(meetings)}")
+
+        # 移除已不是 completed 或已刪除的會議留下的索引列（先以唯讀連線找出 rowid）
+        async with get_db_session(readonly=True) as db:
+            cursor = await db.execute(
+                """
+                SELECT rowid FROM meeting_search
+                WHERE meeting_id NOT IN (SELECT id FROM meetings WHERE status = 'completed')
+                """
+            )
+            stale = [(row["rowid"],) for row in await cursor.fetchall()]
+        if stale:
+            await WriteBatch().executemany("DELETE FROM meeting_search WHERE rowid = ?", stale).commit()
+            print(f"🧹 移除過期索引 {len(stale)} 筆")
+
+        # 合併 FTS 內部的 b-tree 片段，提升查詢速度
+        await WriteBatch().execute(
+            "INSERT INTO meeting_search(meeting_search) VALUES ('optimize')"
+        ).commit()
+        print("🎉 搜尋索引重建完成")
+        return 0
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,14 +1,52 @@
-"""服務模組"""
+"""服務模組
 
-from .processor import process_meeting
-from .transcription import transcribe_audio
-from .summary import generate_summary
-from .email import send_summary_email
+子模組依需要才載入（例如 transcription/summary 會載入 openai SDK），
+`from services import process_meeting` 這類寫法在第一次存取時才匯入對應的子模組
 
-__all__ = [
-    "process_meeting",
-    "transcribe_audio",
-    "generate_summary",
-    "send_summary_email",
-]
+openai、aiosmtplib 載入約需 0.6 秒：服務啟動完成後由 preload_lazy_modules() 在背景執行緒預先載入，
+使用端再以 import_module_async() 取得，尚未載入完成時也不會阻塞事件迴圈
+"""
 
+import asyncio
+import importlib
+import threading
+
+_EXPORTS = {
+    "process_meeting": ".processor",
+    "transcribe_audio": ".transcription",
+    "generate_summary": ".summary",
+    "send_summary_email": ".email",
+}
+
+__all__ = list(_EXPORTS)
+
+# 只在處理會議時才需要的第三方套件
+LAZY_MODULES = ("openai", "aiosmtplib")
+
+
+async def import_module_async(name: str):
+    """
+    在背景執行緒匯入模組（已載入時只需取得 import lock 後直接回傳）
+
+    另一執行緒正在匯入同一模組時會等它完成，不會取得初始化到一半的模組
+    """
+    return await asyncio.to_thread(importlib.import_module, name)
+
+
+def _preload():
+    for name in LAZY_MODULES:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"⚠️ 預先載入 {name} 失敗: {str(e)}")
+
+
+def preload_lazy_modules():
+    """啟動完成後在背景執行緒預先載入 LAZY_MODULES，第一次處理會議時不必等待匯入"""
+    threading.Thread(target=_preload, name="preload-modules", daemon=True).start()
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
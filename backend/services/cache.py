@@ -0,0 +1,259 @@
+"""
+程序內快取
+- TTLCache：有容量上限與存活時間的 LRU 快取
+- ArtifactCache：以位元組為上限的檔案內容快取（依 mtime/大小失效，並合併同時的讀取）
+"""
+
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from .profiling import track_io
+
+
+class TTLCache:
+    """
+    LRU + TTL 快取
+
+    - 超過 max_size 時淘汰最久未使用的項目
+    - 項目存活超過 ttl_seconds 後視為過期
+    - 僅供單一事件迴圈使用（不需加鎖）
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """取得快取值，不存在或已過期時回傳 None"""
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any):
+        """寫入快取值"""
+        if self.max_size <= 0:
+            return
+        self._data[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable):
+        """移除指定項目"""
+        self.invalidations += 1
+        self._data.pop(key, None)
+
+    def clear(self):
+        """清空快取"""
+        self.invalidations += 1
+        self._data.clear()
+
+    def stats(self) -> dict:
+        """命中率統計"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+def _sizeof(value: Any) -> int:
+    """估算快取值佔用的記憶體（字串或字串清單）"""
+    size = sys.getsizeof(value)
+    if isinstance(value, (list, tuple)):
+        size += sum(sys.getsizeof(item) for item in value)
+    return size
+
+
+class ArtifactCache:
+    """
+    檔案內容 LRU 快取（以位元組為容量上限）
+
+    - 以檔案路徑 + 檢視名稱為鍵，同一檔案可快取原文與解析後的結果（例如摘要重點）
+    - 每次讀取先 stat 檔案，mtime 或大小改變即視為失效，不需主動通知
+    - 同一檔案同時有多個請求時只讀一次磁碟，其餘請求等待同一個結果（single-flight）
+    - 讀檔與解析在背景執行緒進行，不阻塞事件迴圈
+    - 僅供單一事件迴圈使用（不需加鎖）
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Tuple[str, str], tuple]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str, tuple], asyncio.Future] = {}
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def get(
+        self,
+        path: Path,
+        version: tuple,
+        load: Callable[[Path], Any],
+        view: str = "text",
+    ) -> Any:
+        """
+        取得檔案內容
+
+        Args:
+            path: 實際存在的檔案路徑
+            version: 檔案版本（mtime_ns, size），與快取不同時重新載入
+            load: 在背景執行緒中讀取並解析檔案的函式
+            view: 檢視名稱，區分同一檔案的不同解析結果
+        """
+        key = (str(path), view)
+        entry = self._data.get(key)
+        if entry is not None:
+            value, cached_version, size = entry
+            if cached_version == version:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return value
+            # 檔案已變更
+            self._remove(key)
+            self.invalidations += 1
+
+        flight_key = (str(path), view, version)
+        flight = self._inflight.get(flight_key)
+        if flight is None:
+            self.misses += 1
+            # 讀取在獨立的 task 中進行，發起的請求被取消時不影響其他等待者
+            flight = asyncio.ensure_future(self._load(key, flight_key, path, version, load))
+            self._inflight[flight_key] = flight
+        else:
+            self.coalesced += 1
+        return await track_io(asyncio.shield(flight))
+
+    async def get_many(
+        self,
+        requests: List[Tuple[Path, tuple]],
+        load: Callable[[Path], Any],
+        view: str = "text",
+        workers: int = 8,
+    ) -> List[Any]:
+        """
+        批次取得多個檔案內容
+
+        命中的直接回傳；未命中的平均分成最多 workers 組，每組在一個背景執行緒中依序讀取。
+        檔案多而小時，每個檔案各切換一次執行緒的成本會超過讀檔本身，分組後總耗時約為最慢的一組
+
+        Args:
+            requests: [(實際存在的檔案路徑, 檔案版本)]
+            load: 在背景執行緒中讀取並解析檔案的函式
+            view: 檢視名稱
+            workers: 同時讀取的執行緒數上限
+
+        Returns:
+            與 requests 順序相同的內容；讀取失敗的項目為該例外物件
+        """
+        results: List[Any] = [None] * len(requests)
+        missing = []
+        for i, (path, version) in enumerate(requests):
+            key = (str(path), view)
+            entry = self._data.get(key)
+            if entry is not None and entry[1] == version:
+                self._data.move_to_end(key)
+                self.hits += 1
+                results[i] = entry[0]
+            else:
+                missing.append(i)
+        if not missing:
+            return results
+
+        self.misses += len(missing)
+
+        def load_group(indexes: List[int]) -> list:
+            loaded = []
+            for i in indexes:
+                try:
+                    loaded.append((i, load(requests[i][0]), None))
+                except Exception as e:
+                    loaded.append((i, None, e))
+            return loaded
+
+        groups = [missing[k::workers] for k in range(min(workers, len(missing)))]
+        for loaded in await track_io(asyncio.gather(*(asyncio.to_thread(load_group, g) for g in groups))):
+            for i, value, error in loaded:
+                if error is not None:
+                    results[i] = error
+                    continue
+                path, version = requests[i]
+                self._store((str(path), view), value, version)
+                results[i] = value
+        return results
+
+    async def _load(self, key, flight_key, path: Path, version: tuple, load: Callable[[Path], Any]):
+        try:
+            value = await asyncio.to_thread(load, path)
+            self._store(key, value, version)
+            return value
+        finally:
+            del self._inflight[flight_key]
+
+    def _store(self, key: Tuple[str, str], value: Any, version: tuple):
+        size = _sizeof(value)
+        # 單一項目超過容量上限時不快取，避免清空整個快取
+        if size > self.max_bytes:
+            return
+        if key in self._data:
+            self._remove(key)
+        self._data[key] = (value, version, size)
+        self.size_bytes += size
+        while self.size_bytes > self.max_bytes:
+            evicted_key = next(iter(self._data))
+            self._remove(evicted_key)
+            self.evictions += 1
+
+    def _remove(self, key: Tuple[str, str]):
+        _, _, size = self._data.pop(key)
+        self.size_bytes -= size
+
+    def clear(self):
+        """清空快取"""
+        self.invalidations += len(self._data)
+        self._data.clear()
+        self.size_bytes = 0
+
+    def stats(self) -> dict:
+        """命中率統計"""
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "entries": len(self._data),
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round((self.hits + self.coalesced) / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
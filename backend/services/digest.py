@@ -0,0 +1,188 @@
+"""
+每日業務日誌
+維護 daily_digests 表（每位用戶每天一列），記錄當天已完成會議的摘要重點
+
+- 會議處理完成時，在同一交易中把該場會議的重點併入當天的日誌（不重新讀取其他會議的摘要檔）
+- 每列記錄建立時當天已完成會議的版本（場數與最大 updated_at）；會議被刪除、重跑或修改後版本不符，
+  由 /meetings/daily-summary 在讀取時重建
+"""
+
+import json
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Tuple
+
+from database import get_db_session, WriteBatch
+from .storage import read_text_cached
+
+# 當天已完成會議的版本：場數與最大 updated_at（走 meetings(user_id, start_time) 索引）
+_SOURCE_VERSION_SQL = """
+    SELECT COUNT(*) || '|' || COALESCE(MAX(updated_at), '')
+    FROM meetings
+    WHERE user_id = ? AND start_time >= ? AND start_time < ?
+    AND status = 'completed'
+"""
+
+_UPSERT_DIGEST_SQL = """
+    INSERT OR REPLACE INTO daily_digests (user_id, date, items, meeting_count, source_version, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+def extract_key_points(summary: str, limit: int = 3) -> List[str]:
+    """提取摘要重點（簡化：取前幾個項目符號行）"""
+    key_points = []
+    for line in summary.split("\n"):
+        line = line.strip()
+        if line.startswith("-") or line.startswith("•"):
+            key_points.append(line)
+        if len(key_points) >= limit:
+            break
+    return key_points
+
+
+def _day_range(day: date) -> Tuple[str, str]:
+    start_of_day = datetime.combine(day, datetime.min.time())
+    return start_of_day.isoformat(), (start_of_day + timedelta(days=1)).isoformat()
+
+
+def _digest_item(meeting, key_points: List[str]) -> dict:
+    return {
+        "meeting_id": meeting["id"],
+        "topic": meeting["topic"],
+        "room": meeting["room"],
+        "start_time": meeting["start_time"],
+        "updated_at": meeting["updated_at"],
+        "key_points": key_points,
+    }
+
+
+def _items_version(items: List[dict]) -> str:
+    """由日誌內容推算的版本，格式與 _SOURCE_VERSION_SQL 相同"""
+    return f"{len(items)}|{max((item['updated_at'] or '' for item in items), default='')}"
+
+
+async def update_daily_digest(db, meeting_id: str, key_points: List[str]):
+    """
+    將剛完成的會議併入當天的日誌（不 commit，由呼叫端決定交易邊界）
+
+    既有日誌與其他會議的現況一致時才增量更新；否則刪除該列，由下次讀取時重建
+
+    Args:
+        db: 寫入連線（會議狀態已在同一交易更新為 completed）
+        meeting_id: 會議 ID
+        key_points: 該場會議的摘要重點
+    """
+    cursor = await db.execute(
+        "SELECT id, user_id, room, topic, start_time, updated_at FROM meetings WHERE id = ?",
+        (meeting_id,)
+    )
+    meeting = await cursor.fetchone()
+    if not meeting or meeting["user_id"] is None:
+        return
+
+    day = datetime.fromisoformat(meeting["start_time"]).date()
+    start_of_day, end_of_day = _day_range(day)
+
+    cursor = await db.execute(
+        "SELECT items FROM daily_digests WHERE user_id = ? AND date = ?",
+        (meeting["user_id"], day.isoformat())
+    )
+    row = await cursor.fetchone()
+    items = [item for item in json.loads(row["items"]) if item["meeting_id"] != meeting_id] if row else []
+
+    # 其他會議的現況（排除本場）須與日誌內容相符
+    cursor = await db.execute(
+        _SOURCE_VERSION_SQL + " AND id != ?",
+        (meeting["user_id"], start_of_day, end_of_day, meeting_id)
+    )
+    others_version = (await cursor.fetchone())[0]
+    if _items_version(items) != others_version:
+        await db.execute(
+            "DELETE FROM daily_digests WHERE user_id = ? AND date = ?",
+            (meeting["user_id"], day.isoformat())
+        )
+        return
+
+    items.append(_digest_item(meeting, key_points))
+    items.sort(key=lambda item: (item["start_time"], item["meeting_id"]))
+    await db.execute(
+        _UPSERT_DIGEST_SQL,
+        (
+            meeting["user_id"], day.isoformat(), json.dumps(items, ensure_ascii=False),
+            len(items), _items_version(items), datetime.now().isoformat(),
+        )
+    )
+
+
+async def _rebuild_daily_digest(user_id: int, day: date) -> List[dict]:
+    """由當天已完成的會議重建日誌（摘要經由內容快取讀取）並寫回"""
+    start_of_day, end_of_day = _day_range(day)
+    async with get_db_session(readonly=True) as db:
+        cursor = await db.execute(
+            """
+            SELECT id, room, topic, start_time, updated_at, summary_path
+            FROM meetings
+            WHERE user_id = ?
+              AND status = 'completed'
+              AND start_time >= ?
+              AND start_time < ?
+            ORDER BY start_time ASC, id ASC
+            """,
+            (user_id, start_of_day, end_of_day)
+        )
+        meetings = await cursor.fetchall()
+
+    items = []
+    for meeting in meetings:
+        key_points = []
+        if meeting["summary_path"]:
+            try:
+                key_points = await read_text_cached(
+                    meeting["summary_path"], view="key_points", parse=extract_key_points
+                )
+            except Exception:
+                pass
+        items.append(_digest_item(meeting, key_points))
+
+    if items:
+        await WriteBatch().execute(
+            _UPSERT_DIGEST_SQL,
+            (
+                user_id, day.isoformat(), json.dumps(items, ensure_ascii=False),
+                len(items), _items_version(items), datetime.now().isoformat(),
+            )
+        ).commit()
+    return items
+
+
+async def get_daily_digest(user_id: int, day: date) -> Optional[Tuple[Optional[dict], List[dict]]]:
+    """
+    讀取用戶某天的日誌
+
+    一般情況只需一次查詢（日誌列與當天版本以索引查出）；版本不符或尚未建立時才重建
+
+    Returns:
+        (用戶資料, 會議重點列表)；用戶不存在時回傳 None
+    """
+    start_of_day, end_of_day = _day_range(day)
+    async with get_db_session(readonly=True) as db:
+        cursor = await db.execute(
+            f"""
+            SELECT u.email, u.name, d.items, d.source_version,
+                   ({_SOURCE_VERSION_SQL}) AS current_version
+            FROM users u
+            LEFT JOIN daily_digests d ON d.user_id = u.id AND d.date = ?
+            WHERE u.id = ?
+            """,
+            (user_id, start_of_day, end_of_day, day.isoformat(), user_id)
+        )
+        row = await cursor.fetchone()
+
+    if not row:
+        return None
+    user = {"email": row["email"], "name": row["name"]}
+    if row["current_version"].startswith("0|"):
+        return user, []
+    if row["items"] is not None and row["source_version"] == row["current_version"]:
+        return user, json.loads(row["items"])
+    return user, await _rebuild_daily_digest(user_id, day)
@@ -4,14 +4,12 @@ Email 發送服務
 """
 
 from typing import List
-import aiosmtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 import ssl
 
 from config import get_settings
-
-settings = get_settings()
+from . import import_module_async
 
 
 async def send_summary_email(
@@ -34,6 +32,8 @@ async def send_summary_email(
     Returns:
         是否發送成功
     """
+    settings = get_settings()
+    
     # 檢查 SMTP 設定
     if not settings.smtp_user or not settings.smtp_password:
         print("⚠️ SMTP 未設定，跳過 Email 發送")
@@ -78,9 +78,23 @@ async def send_summary_email(
     message.attach(MIMEText(text_content, "plain", "utf-8"))
     message.attach(MIMEText(html_content, "html", "utf-8"))
     
+    # aiosmtplib 不在啟動時載入；於背景執行緒取得，避免阻塞事件迴圈
+    aiosmtplib = await import_module_async("aiosmtplib")
+    
     try:
+        if not settings.smtp_tls:
+            # 明文連線（本機轉送或測試用的 SMTP）
+            await aiosmtplib.send(
+                message,
+                hostname=settings.smtp_host,
+                port=settings.smtp_port,
+                username=settings.smtp_user,
+                password=password,
+                use_tls=False,
+                start_tls=False,
+            )
         # 方法 1: 使用 Port 465 + SSL（Gmail 推薦）
-        if settings.smtp_port == 587:
+        elif settings.smtp_port == 587:
             # STARTTLS 模式
             await aiosmtplib.send(
                 message,
@@ -108,7 +122,7 @@ async def send_summary_email(
         print(f"❌ Email 發送失敗 (Port {settings.smtp_port}): {error_msg}")
         
         # 如果 587 失敗，嘗試 465
-        if settings.smtp_port == 587:
+        if settings.smtp_tls and settings.smtp_port == 587:
             print("🔄 嘗試使用 Port 465 + SSL...")
             try:
                 await aiosmtplib.send(
@@ -0,0 +1,72 @@
+"""
+會議狀態事件
+程序內的發佈/訂閱，process_meeting 每完成一個步驟即發佈會議的最新狀態，
+由 /meetings/{id}/events（SSE）與 /meetings/{id}/ws（WebSocket）推送給前端
+"""
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Set
+
+
+class MeetingEventBus:
+    """
+    以會議 ID 分組的發佈/訂閱
+
+    - 每個訂閱者擁有固定大小的佇列；事件內容是狀態快照，佇列滿時丟棄最舊的一筆即可
+    - 僅供單一事件迴圈使用（不需加鎖）
+    """
+
+    def __init__(self, queue_size: int = 16):
+        self.queue_size = queue_size
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    @asynccontextmanager
+    async def subscribe(self, meeting_id: str):
+        """訂閱會議狀態，離開 context 時自動取消訂閱"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(meeting_id, set()).add(queue)
+        try:
+            yield queue
+        finally:
+            subscribers = self._subscribers.get(meeting_id)
+            if subscribers is not None:
+                subscribers.discard(queue)
+                if not subscribers:
+                    del self._subscribers[meeting_id]
+
+    def publish(self, meeting_id: str, state: dict):
+        """
+        發佈會議狀態
+
+        Args:
+            meeting_id: 會議 ID
+            state: 與 meetings 表欄位同名的狀態快照（status, transcript_path, summary_path, error_message）
+        """
+        self.published += 1
+        for queue in self._subscribers.get(meeting_id, ()):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(state)
+            self.delivered += 1
+
+    def subscriber_count(self, meeting_id: Optional[str] = None) -> int:
+        if meeting_id is not None:
+            return len(self._subscribers.get(meeting_id, ()))
+        return sum(len(s) for s in self._subscribers.values())
+
+    def stats(self) -> dict:
+        return {
+            "meetings": len(self._subscribers),
+            "subscribers": self.subscriber_count(),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+meeting_events = MeetingEventBus()
@@ -0,0 +1,273 @@
+"""
+會議批次匯出
+將會議資料（基本資料、與會者、摘要、逐字稿）串流輸出為 NDJSON、CSV 或 ZIP，
+供 /api/admin/export 與 scripts/export_meetings.py 共用
+
+- meetings JOIN attendees 以單一查詢的游標逐批取出（aiosqlite 每次 fetchmany），不一次載入所有資料列；
+  游標在匯出期間持續開啟，因此使用每次匯出專用的唯讀連線，不佔住共用連線池的 WAL 快照
+- 摘要與逐字稿逐段讀取並直接編碼輸出，單一檔案也不會整份載入記憶體
+- 輸出累積到 EXPORT_FLUSH_BYTES 即交給呼叫端，記憶體用量與匯出筆數無關
+  （ZIP 的中央目錄須記錄每個項目，每個項目約保留數百位元組的中繼資料）
+"""
+
+import csv
+import io
+import json
+import zipfile
+from contextlib import aclosing
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Optional
+
+from database import dedicated_reader
+from .serialization import json_dumps
+from .storage import iter_text_chunks
+
+# 匯出格式對應的 Content-Type
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "zip": "application/zip",
+}
+
+# 會議基本資料欄位（NDJSON/CSV 的欄位順序）
+EXPORT_FIELDS = (
+    "id", "user_id", "user_email", "room", "topic", "start_time", "end_time",
+    "status", "error_message", "created_at", "updated_at",
+)
+
+EXPORT_FLUSH_BYTES = 64 * 1024
+
+# 依 start_time 索引的順序逐列產生；同一開始時間內的 id、a.id 排序只需局部排序，不會先排序整個結果
+_EXPORT_SQL = """
+    SELECT m.id, m.user_id, u.email AS user_email, m.room, m.topic, m.start_time, m.end_time,
+           m.status, m.error_message, m.created_at, m.updated_at,
+           m.summary_path, m.transcript_path,
+           a.email AS attendee_email, a.name AS attendee_name,
+           a.email_sent, a.email_sent_at
+    FROM meetings m
+    LEFT JOIN users u ON u.id = m.user_id
+    LEFT JOIN attendees a ON a.meeting_id = m.id
+    {where}
+    ORDER BY m.start_time, m.id, a.id
+"""
+
+
+async def iter_export_meetings(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    user_id: Optional[int] = None,
+) -> AsyncIterator[dict]:
+    """
+    依開始時間逐場產生會議資料（含與會者列表）
+
+    Args:
+        start: 起始日期（含）
+        end: 結束日期（含）
+        user_id: 只匯出該用戶的會議
+    """
+    conditions, params = [], []
+    if start is not None:
+        conditions.append("m.start_time >= ?")
+        params.append(datetime.combine(start, datetime.min.time()).isoformat())
+    if end is not None:
+        conditions.append("m.start_time < ?")
+        params.append(datetime.combine(end + timedelta(days=1), datetime.min.time()).isoformat())
+    if user_id is not None:
+        conditions.append("m.user_id = ?")
+        params.append(user_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    async with dedicated_reader() as db:
+        cursor = await db.execute(_EXPORT_SQL.format(where=where), params)
+        try:
+            meeting = None
+            async for row in cursor:
+                if meeting is None or meeting["id"] != row["id"]:
+                    if meeting is not None:
+                        yield meeting
+                    meeting = {field: row[field] for field in EXPORT_FIELDS}
+                    meeting["attendees"] = []
+                    meeting["summary_path"] = row["summary_path"]
+                    meeting["transcript_path"] = row["transcript_path"]
+                if row["attendee_email"] is not None:
+                    meeting["attendees"].append({
+                        "email": row["attendee_email"],
+                        "name": row["attendee_name"],
+                        "email_sent": bool(row["email_sent"]),
+                        "email_sent_at": row["email_sent_at"],
+                    })
+            if meeting is not None:
+                yield meeting
+        finally:
+            await cursor.close()
+
+
+def _metadata(meeting: dict) -> dict:
+    return {key: meeting[key] for key in (*EXPORT_FIELDS, "attendees")}
+
+
+class _Output:
+    """累積輸出，超過 EXPORT_FLUSH_BYTES 時由 take() 取出"""
+
+    def __init__(self):
+        self._parts = []
+        self._size = 0
+
+    def write(self, data: bytes) -> int:
+        if data:
+            self._parts.append(data)
+            self._size += len(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def full(self) -> bool:
+        return self._size >= EXPORT_FLUSH_BYTES
+
+    def take(self) -> bytes:
+        data = b"".join(self._parts)
+        self._parts.clear()
+        self._size = 0
+        return data
+
+
+async def _export_ndjson(meetings, include_transcript: bool) -> AsyncIterator[bytes]:
+    """每場會議一行 JSON；摘要與逐字稿以 JSON 字串逐段編碼（跳脫只依字元本身，可分段進行）"""
+    out = _Output()
+    async for meeting in meetings:
+        # 基本資料最後的 } 改由文字欄位之後補上
+        out.write(json_dumps(_metadata(meeting))[:-1])
+        kinds = ("summary", "transcript") if include_transcript else ("summary",)
+        for kind in kinds:
+            out.write(f',"{kind}":"'.encode("utf-8"))
+            async with aclosing(iter_text_chunks(meeting[f"{kind}_path"])) as chunks:
+                async for chunk in chunks:
+                    out.write(json.dumps(chunk, ensure_ascii=False)[1:-1].encode("utf-8"))
+                    if out.full():
+                        yield out.take()
+            out.write(b'"')
+        out.write(b"}\n")
+        if out.full():
+            yield out.take()
+    yield out.take()
+
+
+def _format_attendees(attendees: list) -> str:
+    return "; ".join(
+        f"{a['name']} <{a['email']}>" if a["name"] else a["email"] for a in attendees
+    )
+
+
+async def _export_csv(meetings, include_transcript: bool) -> AsyncIterator[bytes]:
+    """
+    每場會議一列；摘要與逐字稿一律加上引號並逐段輸出（欄位內的引號重複一次即可，可分段進行）
+
+    開頭加上 UTF-8 BOM，讓 Excel 正確辨識中文
+    """
+    kinds = ("summary", "transcript") if include_transcript else ("summary",)
+    line = io.StringIO()
+    writer = csv.writer(line, lineterminator="")
+
+    def render(values) -> bytes:
+        writer.writerow(values)
+        data = line.getvalue().encode("utf-8")
+        line.seek(0)
+        line.truncate()
+        return data
+
+    out = _Output()
+    out.write("\ufeff".encode("utf-8"))
+    out.write(render([*EXPORT_FIELDS, "attendees", *kinds]) + b"\r\n")
+    async for meeting in meetings:
+        out.write(render([
+            *("" if meeting[field] is None else meeting[field] for field in EXPORT_FIELDS),
+            _format_attendees(meeting["attendees"]),
+        ]))
+        for kind in kinds:
+            out.write(b',"')
+            async with aclosing(iter_text_chunks(meeting[f"{kind}_path"])) as chunks:
+                async for chunk in chunks:
+                    out.write(chunk.replace('"', '""').encode("utf-8"))
+                    if out.full():
+                        yield out.take()
+            out.write(b'"')
+        out.write(b"\r\n")
+        if out.full():
+            yield out.take()
+    yield out.take()
+
+
+def _zip_date_time(meeting: dict) -> tuple:
+    try:
+        timestamp = datetime.fromisoformat(meeting["updated_at"] or meeting["start_time"])
+    except (TypeError, ValueError):
+        timestamp = datetime.now()
+    return max(timestamp, datetime(1980, 1, 1)).timetuple()[:6]
+
+
+async def _export_zip(meetings, include_transcript: bool) -> AsyncIterator[bytes]:
+    """
+    每場會議一個目錄：meeting.json、summary.md、transcript.txt
+
+    輸出端不可 seek，zipfile 會改用 data descriptor 記錄壓縮後的大小，可邊壓縮邊輸出
+    """
+    out = _Output()
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        async for meeting in meetings:
+            date_time = _zip_date_time(meeting)
+
+            info = zipfile.ZipInfo(f"{meeting['id']}/meeting.json", date_time)
+            info.compress_type = zipfile.ZIP_DEFLATED
+            archive.writestr(
+                info, json.dumps(_metadata(meeting), ensure_ascii=False, indent=2)
+            )
+
+            files = [("summary", "summary.md")]
+            if include_transcript:
+                files.append(("transcript", "transcript.txt"))
+            for kind, filename in files:
+                if not meeting[f"{kind}_path"]:
+                    continue
+                info = zipfile.ZipInfo(f"{meeting['id']}/{filename}", date_time)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                async with aclosing(iter_text_chunks(meeting[f"{kind}_path"])) as chunks:
+                    with archive.open(info, "w") as entry:
+                        async for chunk in chunks:
+                            entry.write(chunk.encode("utf-8"))
+                            if out.full():
+                                yield out.take()
+            if out.full():
+                yield out.take()
+    yield out.take()
+
+
+async def export_meetings(
+    format: str,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    user_id: Optional[int] = None,
+    include_transcript: bool = True,
+) -> AsyncIterator[bytes]:
+    """
+    串流匯出會議
+
+    Args:
+        format: ndjson、csv 或 zip（見 EXPORT_FORMATS）
+        start: 起始日期（含）
+        end: 結束日期（含）
+        user_id: 只匯出該用戶的會議
+        include_transcript: 是否包含逐字稿
+
+    Yields:
+        輸出內容（每段約 EXPORT_FLUSH_BYTES）
+    """
+    exporters = {"ndjson": _export_ndjson, "csv": _export_csv, "zip": _export_zip}
+    if format not in exporters:
+        raise ValueError(f"不支援的匯出格式: {format}")
+
+    async with aclosing(iter_export_meetings(start, end, user_id)) as meetings:
+        async with aclosing(exporters[format](meetings, include_transcript)) as output:
+            async for data in output:
+                if data:
+                    yield data
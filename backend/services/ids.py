@@ -0,0 +1,72 @@
+"""
+唯一 ID 產生器
+產生 ULID 格式的 ID：48 位元毫秒時間戳 + 80 位元隨機數，以 Crockford Base32 編碼為 26 字元
+
+- 依時間排序，新資料集中寫入 B-tree 尾端
+- 同一毫秒內遞增隨機部分，保證單一程序內嚴格遞增
+- 80 位元隨機數讓多個程序（多台伺服器）同時產生也不會碰撞
+"""
+
+import os
+import threading
+import time
+
+CROCKFORD_BASE32 = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+
+_TIMESTAMP_BITS = 48
+_RANDOM_BITS = 80
+_RANDOM_MAX = (1 << _RANDOM_BITS) - 1
+ULID_LENGTH = 26
+
+
+def _encode(value: int) -> str:
+    """將 128 位元整數編碼為 26 字元 Crockford Base32"""
+    chars = []
+    for _ in range(ULID_LENGTH):
+        chars.append(CROCKFORD_BASE32[value & 0x1F])
+        value >>= 5
+    return "".join(reversed(chars))
+
+
+class ULIDGenerator:
+    """
+    單調遞增的 ULID 產生器（執行緒安全）
+
+    同一毫秒（或系統時鐘倒退）時沿用上一個時間戳並將隨機部分加一；
+    隨機部分溢位時借用下一毫秒
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._last_random = 0
+
+    def new(self) -> str:
+        with self._lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._last_random = int.from_bytes(os.urandom(10), "big")
+            elif self._last_random < _RANDOM_MAX:
+                self._last_random += 1
+            else:
+                self._last_ms += 1
+                self._last_random = int.from_bytes(os.urandom(10), "big")
+            value = (self._last_ms << _RANDOM_BITS) | self._last_random
+        return _encode(value)
+
+
+_generator = ULIDGenerator()
+
+
+def new_ulid() -> str:
+    """產生新的 ULID"""
+    return _generator.new()
+
+
+def ulid_timestamp(ulid: str) -> float:
+    """取出 ULID 的時間戳（Unix 秒）"""
+    value = 0
+    for char in ulid[:10]:
+        value = value * 32 + CROCKFORD_BASE32.index(char)
+    return value / 1000
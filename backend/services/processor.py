@@ -3,20 +3,48 @@
 整合語音轉文字、AI 摘要、Email 發送
 """
 
+import asyncio
+import time
 from datetime import datetime
 from pathlib import Path
 
 from config import get_settings
-from database import get_db
+from database import get_db, WriteBatch
 from models.meeting import MeetingStatus
 from .transcription import transcribe_audio
 from .summary import generate_summary
 from .email import send_summary_email
+from .search import index_meeting
+from .stats import refresh_daily_stats
+from .digest import extract_key_points, update_daily_digest
+from .storage import artifact_exists, read_text, write_text, register_artifact
+from .events import meeting_events
+from .profiling import track_io
 
-settings = get_settings()
 
 
-async def process_meeting(meeting_id: str):
+async def _save_transcript(meeting_id: str, meeting_dir: Path, transcript: str, state: dict):
+    """儲存逐字稿並更新 DB 路徑與檔案索引"""
+    transcript_path = meeting_dir / "transcript.txt"
+    # 寫檔與預先壓縮（gzip 9 / brotli 11）每 MB 約需 0.3 秒，在背景執行緒執行以免阻塞事件迴圈
+    await track_io(asyncio.to_thread(write_text, transcript_path, transcript))
+    
+    batch = WriteBatch().execute(
+        "UPDATE meetings SET transcript_path = ?, updated_at = ? WHERE id = ?",
+        (str(transcript_path), datetime.now().isoformat(), meeting_id)
+    )
+    register_artifact(batch, meeting_id, "transcript", transcript_path)
+    await batch.commit()
+    state["transcript_path"] = str(transcript_path)
+    meeting_events.publish(meeting_id, dict(state))
+
+
+async def process_meeting(
+    meeting_id: str,
+    reuse_transcript: bool = False,
+    send_email: bool = True,
+    keep_on_failure: bool = False,
+):
     """
     處理會議的完整流程
     
@@ -25,9 +53,19 @@ async def process_meeting(meeting_id: str):
     3. 發送 Email
     
     這是背景任務，由 end_meeting API 觸發
+    
+    Args:
+        meeting_id: 會議 ID
+        reuse_transcript: 已有逐字稿時直接沿用，不重新呼叫 Whisper（批次重跑用）
+        send_email: 是否寄送摘要 Email（批次重跑時通常關閉）
+        keep_on_failure: 失敗時保留會議原本的狀態與檔案，只拋出例外（批次重跑用：
+            既有摘要仍然有效，不應因重跑失敗而被標記為 failed）；新逐字稿延到摘要完成後才寫入
     """
+    started = time.monotonic()
     db = await get_db()
-    meeting_dir = Path(settings.storage_path) / meeting_id
+    meeting_dir = Path(get_settings().storage_path) / meeting_id
+    # 目前已寫入 DB 的狀態，每完成一步即發佈給訂閱者（SSE / WebSocket）
+    state = {"status": MeetingStatus.PROCESSING.value, "transcript_path": None, "summary_path": None}
     
     try:
         print(f"📝 開始處理會議: {meeting_id}")
@@ -43,22 +81,22 @@ async def process_meeting(meeting_id: str):
             raise Exception("會議不存在")
         
         audio_path = meeting["audio_path"]
+        if reuse_transcript:
+            state["transcript_path"] = meeting["transcript_path"]
         
         # ========== Step 1: 語音轉文字 ==========
-        print(f"🎤 [1/3] 語音轉文字中...")
-        transcript = await transcribe_audio(audio_path)
-        
-        # 儲存逐字稿
-        transcript_path = meeting_dir / "transcript.txt"
-        with open(transcript_path, "w", encoding="utf-8") as f:
-            f.write(transcript)
-        
-        await db.execute(
-            "UPDATE meetings SET transcript_path = ?, updated_at = ? WHERE id = ?",
-            (str(transcript_path), datetime.now().isoformat(), meeting_id)
-        )
-        await db.commit()
-        print(f"✅ 語音轉文字完成，共 {len(transcript)} 字")
+        existing_transcript = meeting["transcript_path"]
+        new_transcript = False
+        if reuse_transcript and artifact_exists(existing_transcript):
+            print(f"🎤 [1/3] 沿用既有逐字稿")
+            transcript = await track_io(asyncio.to_thread(read_text, existing_transcript))
+        else:
+            print(f"🎤 [1/3] 語音轉文字中...")
+            transcript = await transcribe_audio(audio_path)
+            new_transcript = True
+            if not keep_on_failure:
+                await _save_transcript(meeting_id, meeting_dir, transcript, state)
+            print(f"✅ 語音轉文字完成，共 {len(transcript)} 字")
         
         # ========== Step 2: AI 摘要 ==========
         print(f"🤖 [2/3] AI 摘要生成中...")
@@ -82,58 +120,110 @@ async def process_meeting(meeting_id: str):
             attendees=attendee_list
         )
         
+        if new_transcript and keep_on_failure:
+            await _save_transcript(meeting_id, meeting_dir, transcript, state)
+        
         # 儲存摘要
         summary_path = meeting_dir / "summary.md"
-        with open(summary_path, "w", encoding="utf-8") as f:
-            f.write(summary)
+        await track_io(asyncio.to_thread(write_text, summary_path, summary))
         
-        await db.execute(
+        batch = WriteBatch().execute(
             "UPDATE meetings SET summary_path = ?, updated_at = ? WHERE id = ?",
             (str(summary_path), datetime.now().isoformat(), meeting_id)
         )
-        await db.commit()
+        register_artifact(batch, meeting_id, "summary", summary_path)
+        await batch.commit()
+        state["summary_path"] = str(summary_path)
+        meeting_events.publish(meeting_id, dict(state))
         print(f"✅ 摘要生成完成")
         
+        # 剩餘的寫入（Email 狀態、搜尋索引、完成狀態、每日統計）在同一交易提交
+        batch = WriteBatch()
+        
         # ========== Step 3: 發送 Email ==========
-        print(f"📧 [3/3] 發送 Email 中...")
+        if send_email:
+            print(f"📧 [3/3] 發送 Email 中...")
+            
+            email_list = [a["email"] for a in attendees]
+            await send_summary_email(
+                recipients=email_list,
+                summary=summary,
+                meeting_id=meeting_id,
+                room=meeting["room"],
+                start_time=meeting["start_time"]
+            )
+            
+            # 更新 Email 發送狀態
+            batch.execute(
+                """
+                UPDATE attendees 
+                SET email_sent = TRUE, email_sent_at = ? 
+                WHERE meeting_id = ?
+                """,
+                (datetime.now().isoformat(), meeting_id)
+            )
+        else:
+            print(f"📧 [3/3] 略過 Email 發送")
         
-        email_list = [a["email"] for a in attendees]
-        await send_summary_email(
-            recipients=email_list,
-            summary=summary,
-            meeting_id=meeting_id,
-            room=meeting["room"],
-            start_time=meeting["start_time"]
-        )
+        # 更新全文搜尋索引（失敗不影響會議處理結果）
+        async def update_search_index(conn):
+            try:
+                await index_meeting(conn, meeting_id, transcript=transcript, summary=summary)
+            except Exception as e:
+                print(f"⚠️ 搜尋索引更新失敗: {meeting_id}, 錯誤: {str(e)}")
         
-        # 更新 Email 發送狀態
-        await db.execute(
-            """
-            UPDATE attendees 
-            SET email_sent = TRUE, email_sent_at = ? 
-            WHERE meeting_id = ?
-            """,
-            (datetime.now().isoformat(), meeting_id)
-        )
+        batch.run(update_search_index)
         
         # ========== 完成 ==========
-        await db.execute(
+        # 實際處理耗時（不可用 end_time 推算：批次重跑舊會議時會得到數天甚至數月）
+        completed_at = datetime.now()
+        processing_seconds = round(time.monotonic() - started, 3)
+        batch.execute(
             """
             UPDATE meetings 
-            SET status = ?, updated_at = ?
+            SET status = ?, transcript_chars = ?, processing_seconds = ?, updated_at = ?
             WHERE id = ?
             """,
-            (MeetingStatus.COMPLETED.value, datetime.now().isoformat(), meeting_id)
+            (
+                MeetingStatus.COMPLETED.value,
+                len(transcript),
+                processing_seconds,
+                completed_at.isoformat(),
+                meeting_id
+            )
         )
-        await db.commit()
+        # 與狀態更新同一交易更新每日統計與業務日誌
+        batch.run(lambda conn: refresh_daily_stats(conn, meeting["user_id"], meeting["start_time"]))
+        
+        async def update_digest(conn):
+            try:
+                await update_daily_digest(conn, meeting_id, extract_key_points(summary))
+            except Exception as e:
+                print(f"⚠️ 業務日誌更新失敗: {meeting_id}, 錯誤: {str(e)}")
+        
+        batch.run(update_digest)
+        await batch.commit()
+        state["status"] = MeetingStatus.COMPLETED.value
+        meeting_events.publish(meeting_id, dict(state))
         
         print(f"🎉 會議處理完成: {meeting_id}")
         
     except Exception as e:
         # 處理失敗
         print(f"❌ 會議處理失敗: {meeting_id}, 錯誤: {str(e)}")
+        if keep_on_failure:
+            raise
+        
+        async def refresh_failed_stats(conn):
+            cursor = await conn.execute(
+                "SELECT user_id, start_time FROM meetings WHERE id = ?",
+                (meeting_id,)
+            )
+            failed_meeting = await cursor.fetchone()
+            if failed_meeting:
+                await refresh_daily_stats(conn, failed_meeting["user_id"], failed_meeting["start_time"])
         
-        await db.execute(
+        await WriteBatch().execute(
             """
             UPDATE meetings 
             SET status = ?, error_message = ?, updated_at = ?
@@ -145,7 +235,10 @@ async def process_meeting(meeting_id: str):
                 datetime.now().isoformat(),
                 meeting_id
             )
+        ).run(refresh_failed_stats).commit()
+        meeting_events.publish(
+            meeting_id,
+            dict(state, status=MeetingStatus.FAILED.value, error_message=str(e)),
         )
-        await db.commit()
         raise
 
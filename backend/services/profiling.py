@@ -0,0 +1,504 @@
+"""
+請求效能剖析
+- ProfilingMiddleware：記錄每個請求的耗時並拆分為 DB、檔案 I/O 與處理（其餘）時間，
+  以 Server-Timing 標頭回傳
+- 慢請求取樣：請求執行超過 profiling_slow_request_ms 後，背景執行緒開始定期取樣它的呼叫堆疊，
+  請求結束時連同耗時拆分存成剖析檔（profiles_path/{id}.json）
+- 取樣時間窗：由管理員觸發，在指定秒數內持續取樣事件迴圈執行緒，結束時存成一份剖析檔
+
+未觸發取樣時，每個請求只多一次 contextvar 設定與數次 perf_counter，
+每次 DB 呼叫或檔案 I/O 多一次 contextvar 讀取；背景執行緒閒置時每 100 ms 以內檢查一次
+
+剖析檔的堆疊為 folded 格式（root;...;leaf），可直接匯入 speedscope 或 flamegraph.pl：
+- [cpu]：取樣當下事件迴圈正在執行該請求，堆疊為實際的 Python 呼叫堆疊
+- [await]：該請求正在等待（DB、檔案 I/O、網路等），堆疊為 coroutine 的 await 鏈
+"""
+
+import asyncio
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter, OrderedDict, deque
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Awaitable, Dict, List, Optional, TypeVar
+
+from config import get_settings
+
+T = TypeVar("T")
+
+KIND_DB = 0
+KIND_IO = 1
+
+# 只接受自己產生的剖析檔 ID，避免下載端點被用來讀取任意檔案
+PROFILE_ID_PATTERN = re.compile(r"^[0-9]{8}T[0-9]{6}_[0-9]{6}_[a-z0-9_]{1,80}$")
+
+_BACKEND_DIR = str(Path(__file__).resolve().parent.parent) + os.sep
+_IDLE_CHECK_MAX_SECONDS = 0.1
+_MAX_STACK_DEPTH = 128
+
+
+class RequestTimings:
+    """
+    單一請求的耗時累計
+
+    同類等待互相重疊時（例如 gather 並行讀檔）只計算一次實際經過的時間，
+    處理時間 = 總耗時 - DB 時間 - 檔案 I/O 時間
+    """
+
+    __slots__ = (
+        "method", "scope", "task", "started", "started_at", "status",
+        "finished", "result", "stacks", "samples", "_elapsed", "_depth", "_since",
+    )
+
+    def __init__(self, scope: dict, task: Optional[asyncio.Task]):
+        self.method = scope["method"]
+        self.scope = scope
+        self.task = task
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        self.status = 500
+        self.finished = False
+        self.result: Optional[Dict[str, float]] = None
+        # 開始取樣後才建立，只由取樣執行緒寫入
+        self.stacks: Optional[Counter] = None
+        self.samples = 0
+        self._elapsed = [0.0, 0.0]
+        self._depth = [0, 0]
+        self._since = [0.0, 0.0]
+
+    @property
+    def path(self) -> str:
+        """路由樣板（例如 /api/meetings/{meeting_id}/status），尚未比對到路由時為實際路徑"""
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope["path"]
+
+    def enter(self, kind: int):
+        if self._depth[kind] == 0:
+            self._since[kind] = time.perf_counter()
+        self._depth[kind] += 1
+
+    def exit(self, kind: int):
+        self._depth[kind] -= 1
+        if self._depth[kind] == 0:
+            self._elapsed[kind] += time.perf_counter() - self._since[kind]
+
+    def breakdown(self, now: Optional[float] = None) -> Dict[str, float]:
+        """目前為止的耗時拆分（毫秒）"""
+        total = (now or time.perf_counter()) - self.started
+        db, io = self._elapsed
+        return {
+            "total_ms": round(total * 1000, 3),
+            "db_ms": round(db * 1000, 3),
+            "io_ms": round(io * 1000, 3),
+            "handler_ms": round(max(0.0, total - db - io) * 1000, 3),
+        }
+
+    def server_timing(self) -> bytes:
+        t = self.breakdown()
+        return (
+            f"db;dur={t['db_ms']:.1f}, io;dur={t['io_ms']:.1f}, "
+            f"app;dur={t['handler_ms']:.1f}, total;dur={t['total_ms']:.1f}"
+        ).encode("latin-1")
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+async def _track(kind: int, awaitable: Awaitable[T]) -> T:
+    timings = _current_timings.get()
+    if timings is None:
+        return await awaitable
+    timings.enter(kind)
+    try:
+        return await awaitable
+    finally:
+        timings.exit(kind)
+
+
+def track_db(awaitable: Awaitable[T]) -> Awaitable[T]:
+    """將等待時間計入目前請求的 DB 時間（不在請求中時直接等待）"""
+    return _track(KIND_DB, awaitable)
+
+
+def track_io(awaitable: Awaitable[T]) -> Awaitable[T]:
+    """將等待時間計入目前請求的檔案 I/O 時間（不在請求中時直接等待）"""
+    return _track(KIND_IO, awaitable)
+
+
+def instrument_connection(conn):
+    """
+    讓 aiosqlite 連線的所有操作計入 DB 時間
+
+    aiosqlite 的 execute/fetch*/commit（包含 Cursor）都經由 Connection._execute
+    送到連線的背景執行緒，只需包裝這一個方法
+    """
+    execute = conn._execute
+
+    async def timed_execute(fn, *args, **kwargs):
+        timings = _current_timings.get()
+        if timings is None:
+            return await execute(fn, *args, **kwargs)
+        timings.enter(KIND_DB)
+        try:
+            return await execute(fn, *args, **kwargs)
+        finally:
+            timings.exit(KIND_DB)
+
+    conn._execute = timed_execute
+    return conn
+
+
+def _frame_label(code, labels: dict) -> str:
+    label = labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        if filename.startswith(_BACKEND_DIR):
+            filename = filename[len(_BACKEND_DIR):]
+        elif "site-packages" + os.sep in filename:
+            filename = filename.split("site-packages" + os.sep, 1)[1]
+        else:
+            filename = os.sep.join(Path(filename).parts[-2:])
+        name = getattr(code, "co_qualname", code.co_name)
+        label = labels[code] = f"{name} ({filename}:{code.co_firstlineno})".replace(";", ",")
+    return label
+
+
+def _thread_stack(frame, root_code, labels: dict) -> List[str]:
+    """執行緒目前的呼叫堆疊（root 在前）；有 root_code 時從該 coroutine 開始，略過 asyncio 排程的外層"""
+    codes = []
+    while frame is not None and len(codes) < _MAX_STACK_DEPTH:
+        codes.append(frame.f_code)
+        if frame.f_code is root_code:
+            break
+        frame = frame.f_back
+    return [_frame_label(code, labels) for code in reversed(codes)]
+
+
+def _await_stack(coro, labels: dict) -> List[str]:
+    """
+    task 目前的 await 鏈（最外層的 coroutine 在前）
+
+    經由 __await__ 包裝的物件（例如 aiosqlite 的 execute 結果）無法再往內追，
+    因此最內層附上目前執行到的行號，標示正在等待的位置
+    """
+    stack = []
+    leaf = None
+    while coro is not None and len(stack) < _MAX_STACK_DEPTH:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None) or getattr(coro, "ag_frame", None)
+        if frame is None:
+            break
+        leaf = frame
+        stack.append(_frame_label(frame.f_code, labels))
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None) or getattr(coro, "ag_await", None)
+    if leaf is not None:
+        stack[-1] += f" @{leaf.f_lineno}"
+    return stack
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "_", text.lower()).strip("_")[:80] or "request"
+
+
+class RequestProfiler:
+    """
+    慢請求與時間窗的堆疊取樣器
+
+    - 進行中的請求登記在 _inflight（事件迴圈寫入，取樣執行緒只讀取快照）
+    - 取樣執行緒平時每 min(門檻/10, 100 ms) 檢查一次是否有請求超過門檻，
+      有慢請求或時間窗進行中時改以 profiling_sample_interval_ms 的間隔取樣
+    - 剖析檔的寫入與舊檔清理都在取樣執行緒進行，不佔用事件迴圈
+    """
+
+    def __init__(self):
+        self._inflight: Dict[int, RequestTimings] = {}
+        self._finished: deque = deque()
+        self._index: "OrderedDict[str, dict]" = OrderedDict()
+        self._index_lock = threading.Lock()
+        self._labels: dict = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._window_stacks: Optional[Counter] = None
+        self._window_until = 0.0
+        self._window_started_at = 0.0
+        self._window_samples = 0
+        self._slow_request_ms = 0.0
+        self.running = False
+        self.requests = 0
+        self.slow_requests = 0
+        self.samples = 0
+        self.saved = 0
+        self.save_errors = 0
+
+    # ---------- 事件迴圈端 ----------
+
+    def begin(self, timings: RequestTimings):
+        self.requests += 1
+        self._inflight[id(timings)] = timings
+
+    def end(self, timings: RequestTimings):
+        if timings.finished:
+            return
+        timings.finished = True
+        self._inflight.pop(id(timings), None)
+        timings.result = timings.breakdown()
+        if self._slow_request_ms > 0 and timings.result["total_ms"] >= self._slow_request_ms:
+            self.slow_requests += 1
+            self._finished.append(timings)
+
+    def exclude(self, timings: RequestTimings):
+        """不再追蹤此請求（例如 SSE 這類刻意保持開啟的長連線）"""
+        timings.finished = True
+        self._inflight.pop(id(timings), None)
+
+    def start_window(self, seconds: float) -> bool:
+        """開始取樣時間窗；已有時間窗進行中時回傳 False"""
+        if self._window_stacks is not None:
+            return False
+        self._window_samples = 0
+        self._window_started_at = time.time()
+        self._window_stacks = Counter()
+        self._window_until = time.perf_counter() + seconds
+        return True
+
+    def list_profiles(self) -> List[dict]:
+        """已儲存的剖析檔摘要（新的在前）"""
+        with self._index_lock:
+            return list(reversed(self._index.values()))
+
+    def profile_path(self, profile_id: str) -> Optional[Path]:
+        if not PROFILE_ID_PATTERN.match(profile_id):
+            return None
+        path = Path(get_settings().profiles_path) / f"{profile_id}.json"
+        return path if path.exists() else None
+
+    def stats(self) -> dict:
+        window_active = self._window_stacks is not None
+        return {
+            "running": self.running,
+            "slow_request_ms": self._slow_request_ms,
+            "requests": self.requests,
+            "inflight": len(self._inflight),
+            "slow_requests": self.slow_requests,
+            "samples": self.samples,
+            "saved_profiles": self.saved,
+            "save_errors": self.save_errors,
+            "window_active": window_active,
+            "window_remaining_seconds": (
+                round(max(0.0, self._window_until - time.perf_counter()), 1) if window_active else 0.0
+            ),
+        }
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._slow_request_ms = get_settings().profiling_slow_request_ms
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+        self.running = True
+
+    async def stop(self):
+        if self._thread is None:
+            return
+        self.running = False
+        self._stop.set()
+        await asyncio.to_thread(self._thread.join)
+        self._thread = None
+
+    # ---------- 取樣執行緒端 ----------
+
+    def _run(self):
+        interval = max(get_settings().profiling_sample_interval_ms, 1.0) / 1000
+        threshold = self._slow_request_ms / 1000
+        idle = min(max(threshold / 10, interval), _IDLE_CHECK_MAX_SECONDS) if threshold > 0 else _IDLE_CHECK_MAX_SECONDS
+        self._load_index()
+
+        while not self._stop.is_set():
+            while self._finished:
+                self._save_request(self._finished.popleft())
+
+            now = time.perf_counter()
+            if self._window_stacks is not None and now >= self._window_until:
+                self._save_window()
+            slow = [
+                t for t in tuple(self._inflight.values())
+                if threshold > 0 and now - t.started >= threshold and not t.finished
+            ]
+            if slow or self._window_stacks is not None:
+                self._sample(slow)
+                self._stop.wait(interval)
+            else:
+                self._stop.wait(idle)
+
+        if self._window_stacks is not None:
+            self._save_window()
+        while self._finished:
+            self._save_request(self._finished.popleft())
+
+    def _sample(self, slow: List[RequestTimings]):
+        frame = sys._current_frames().get(self._loop_thread_id)
+        running = asyncio.current_task(self._loop)
+        running_root = getattr(running.get_coro(), "cr_code", None) if running is not None else None
+        self.samples += 1
+
+        for timings in slow:
+            if timings.stacks is None:
+                timings.stacks = Counter()
+            if timings.task is not None and timings.task is running:
+                stack = ["[cpu]"] + _thread_stack(frame, running_root, self._labels)
+            elif timings.task is not None:
+                stack = ["[await]"] + _await_stack(timings.task.get_coro(), self._labels)
+            else:
+                continue
+            timings.stacks[tuple(stack)] += 1
+            timings.samples += 1
+
+        if self._window_stacks is not None:
+            if running is None:
+                stack = ["[idle]"]
+            else:
+                owner = next(
+                    (t for t in tuple(self._inflight.values()) if t.task is running),
+                    None,
+                )
+                root = f"{owner.method} {owner.path}" if owner is not None else "[background]"
+                stack = [root] + _thread_stack(frame, running_root, self._labels)
+            self._window_stacks[tuple(stack)] += 1
+            self._window_samples += 1
+
+    def _save_request(self, timings: RequestTimings):
+        root = f"{timings.method} {timings.path}"
+        stacks = Counter({(root,) + stack: count for stack, count in (timings.stacks or {}).items()})
+        self._save({
+            "kind": "slow_request",
+            "method": timings.method,
+            "path": timings.path,
+            "status": timings.status,
+            "started_at": datetime.fromtimestamp(timings.started_at).isoformat(),
+            "timings": timings.result,
+            "samples": timings.samples,
+        }, stacks, f"{timings.method} {timings.path}", timings.started_at)
+
+    def _save_window(self):
+        stacks, self._window_stacks = self._window_stacks, None
+        self._save({
+            "kind": "window",
+            "started_at": datetime.fromtimestamp(self._window_started_at).isoformat(),
+            "duration_seconds": round(time.time() - self._window_started_at, 3),
+            "samples": self._window_samples,
+        }, stacks, "window", self._window_started_at)
+
+    def _save(self, meta: dict, stacks: Counter, name: str, started_at: float):
+        settings = get_settings()
+        stamp = datetime.fromtimestamp(started_at)
+        profile_id = f"{stamp:%Y%m%dT%H%M%S}_{stamp:%f}_{_slug(name)}"
+        meta = {
+            "id": profile_id,
+            **meta,
+            "sample_interval_ms": settings.profiling_sample_interval_ms,
+        }
+        profile = {
+            **meta,
+            "stacks": [
+                {"stack": ";".join(stack), "count": count}
+                for stack, count in stacks.most_common()
+            ],
+        }
+        directory = Path(settings.profiles_path)
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            tmp = directory / f".{profile_id}.json.tmp"
+            tmp.write_text(json.dumps(profile, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, directory / f"{profile_id}.json")
+        except OSError as e:
+            self.save_errors += 1
+            print(f"⚠️ 剖析檔寫入失敗: {profile_id}, 錯誤: {str(e)}")
+            return
+        self.saved += 1
+
+        with self._index_lock:
+            self._index[profile_id] = meta
+            expired = []
+            while len(self._index) > max(1, settings.profiling_max_profiles):
+                expired.append(self._index.popitem(last=False)[0])
+        for old_id in expired:
+            try:
+                (directory / f"{old_id}.json").unlink()
+            except FileNotFoundError:
+                pass
+
+    def _load_index(self):
+        """啟動時讀入既有剖析檔的摘要（依 ID 即時間排序）"""
+        directory = Path(get_settings().profiles_path)
+        if not directory.exists():
+            return
+        index = OrderedDict()
+        for path in sorted(directory.glob("*.json")):
+            if not PROFILE_ID_PATTERN.match(path.stem):
+                continue
+            try:
+                profile = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            profile.pop("stacks", None)
+            index[path.stem] = profile
+        with self._index_lock:
+            index.update(self._index)
+            self._index = index
+
+
+request_profiler = RequestProfiler()
+
+
+class ProfilingMiddleware:
+    """
+    ASGI 中介層：記錄請求耗時拆分並登記給取樣器
+
+    以純 ASGI 實作（不用 BaseHTTPMiddleware），請求在原本的 task 中執行，取樣器才能對應到它；
+    耗時計算到回應送完為止，之後執行的 BackgroundTasks 不計入
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not request_profiler.running:
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings(scope, asyncio.current_task())
+        token = _current_timings.set(timings)
+        request_profiler.begin(timings)
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                timings.status = message["status"]
+                headers = list(message.get("headers", []))
+                if any(
+                    name.lower() == b"content-type" and value.startswith(b"text/event-stream")
+                    for name, value in headers
+                ):
+                    request_profiler.exclude(timings)
+                headers.append((b"server-timing", timings.server_timing()))
+                message = {**message, "headers": headers}
+                await send(message)
+            elif message["type"] == "http.response.body" and not message.get("more_body", False):
+                await send(message)
+                request_profiler.end(timings)
+            else:
+                await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            request_profiler.end(timings)
+            _current_timings.reset(token)
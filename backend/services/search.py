@@ -0,0 +1,201 @@
+"""
+會議全文搜尋服務
+使用 SQLite FTS5（trigram 分詞，適用中文）索引逐字稿與摘要
+"""
+
+import html
+import re
+from typing import List, Optional, Tuple
+
+from .storage import read_text
+
+# trigram 分詞器至少需要 3 個字元才能使用索引
+MIN_INDEXED_QUERY_LENGTH = 3
+
+# 欄位權重（meeting_id, user_id, topic, summary, transcript）
+BM25_WEIGHTS = (0.0, 0.0, 5.0, 2.0, 1.0)
+
+# rowid 高位放 user_id，低位放該用戶的文件序號
+USER_ROWID_SHIFT = 32
+
+SNIPPET_OPEN = "<mark>"
+SNIPPET_CLOSE = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 24
+
+# snippet() 先以控制字元標示關鍵字，Python 端跳脫 HTML 後才換成 <mark>，
+# 會議內容中的 HTML 不會被當成標記輸出
+_MATCH_START = "\x02"
+_MATCH_END = "\x03"
+_MATCHED_SPAN = re.compile(f"{_MATCH_START}(.*?){_MATCH_END}", re.S)
+
+
+def user_rowid_range(user_id: int) -> Tuple[int, int]:
+    """
+    用戶在 FTS 表中的 rowid 範圍
+
+    rowid = (user_id << 32) | 序號，同一用戶的文件在 FTS doclist 中相鄰，
+    查詢時以 rowid 範圍限定，FTS5 只需掃描該用戶的區段，不必先比對全部用戶再過濾
+    """
+    low = user_id << USER_ROWID_SHIFT
+    return low, low + (1 << USER_ROWID_SHIFT) - 1
+
+
+async def index_meeting(
+    db,
+    meeting_id: str,
+    transcript: Optional[str] = None,
+    summary: Optional[str] = None,
+):
+    """
+    更新單場會議的搜尋索引（不 commit，由呼叫端決定交易邊界）
+
+    Args:
+        db: 寫入連線
+        meeting_id: 會議 ID
+        transcript: 逐字稿內容（未提供時從 transcript_path 讀取）
+        summary: 摘要內容（未提供時從 summary_path 讀取）
+    """
+    cursor = await db.execute(
+        "SELECT user_id, topic, transcript_path, summary_path FROM meetings WHERE id = ?",
+        (meeting_id,)
+    )
+    meeting = await cursor.fetchone()
+    # 無擁有者的會議無法被任何用戶搜尋到，不需索引
+    if not meeting or meeting["user_id"] is None:
+        return
+
+    if transcript is None:
+        transcript = read_text(meeting["transcript_path"])
+    if summary is None:
+        summary = read_text(meeting["summary_path"])
+
+    low, high = user_rowid_range(meeting["user_id"])
+    await db.execute(
+        "DELETE FROM meeting_search WHERE rowid BETWEEN ? AND ? AND meeting_id = ?",
+        (low, high, meeting_id)
+    )
+    await db.execute(
+        """
+        INSERT INTO meeting_search (rowid, meeting_id, user_id, topic, summary, transcript)
+        SELECT COALESCE(MAX(rowid) + 1, ?), ?, ?, ?, ?, ?
+        FROM meeting_search WHERE rowid BETWEEN ? AND ?
+        """,
+        (
+            low, meeting_id, meeting["user_id"], meeting["topic"] or "", summary, transcript,
+            low, high,
+        )
+    )
+
+
+def build_match_query(query: str) -> str:
+    """將使用者輸入轉為 FTS5 查詢：每個詞視為片語，彼此 AND"""
+    terms = [t for t in query.split() if t]
+    return " AND ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def _escape_like(term: str) -> str:
+    """跳脫 LIKE 的萬用字元（搭配 ESCAPE '\\'），讓 % 與 _ 只比對字面"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+async def search_meetings(db, user_id: int, query: str, limit: int = 20) -> List[dict]:
+    """
+    搜尋用戶自己的會議，依相關度排序並回傳標示關鍵字的片段
+
+    少於 3 個字元的詞無法使用 trigram 索引，改以 LIKE 逐筆比對（較慢）
+    """
+    terms = [t for t in query.split() if t]
+    if not terms:
+        return []
+
+    snippet = (
+        "snippet(meeting_search, {col}, "
+        f"char(2), char(3), '{SNIPPET_ELLIPSIS}', {SNIPPET_TOKENS})"
+    )
+    weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+    low, high = user_rowid_range(user_id)
+
+    if all(len(t) >= MIN_INDEXED_QUERY_LENGTH for t in terms):
+        cursor = await db.execute(
+            f"""
+            SELECT s.meeting_id, m.room, m.topic, m.start_time, m.status,
+                   {snippet.format(col=3)} AS summary_snippet,
+                   {snippet.format(col=4)} AS transcript_snippet,
+                   bm25(meeting_search, {weights}) AS score
+            FROM meeting_search s
+            JOIN meetings m ON m.id = s.meeting_id
+            WHERE meeting_search MATCH ?
+            AND s.rowid BETWEEN ? AND ?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (build_match_query(query), low, high, limit)
+        )
+    else:
+        # 短詞：以 LIKE 比對，沒有相關度分數，依時間新到舊排序
+        conditions = " AND ".join(
+            "(s.topic LIKE ? ESCAPE '\\' OR s.summary LIKE ? ESCAPE '\\' "
+            "OR s.transcript LIKE ? ESCAPE '\\')"
+            for _ in terms
+        )
+        params: list = []
+        for t in terms:
+            pattern = f"%{_escape_like(t)}%"
+            params.extend([pattern, pattern, pattern])
+        # 以第一個詞所在位置擷取前後文（與 LIKE 相同，不分大小寫）
+        around = (
+            "CASE WHEN instr(lower({col}), lower(?)) > 0 "
+            "THEN substr({col}, max(1, instr(lower({col}), lower(?)) - 30), 80) ELSE '' END"
+        )
+        cursor = await db.execute(
+            f"""
+            SELECT s.meeting_id, m.room, m.topic, m.start_time, m.status,
+                   {around.format(col="s.summary")} AS summary_snippet,
+                   {around.format(col="s.transcript")} AS transcript_snippet,
+                   0.0 AS score
+            FROM meeting_search s
+            JOIN meetings m ON m.id = s.meeting_id
+            WHERE s.rowid BETWEEN ? AND ? AND {conditions}
+            ORDER BY m.start_time DESC
+            LIMIT ?
+            """,
+            (terms[0], terms[0], terms[0], terms[0], low, high, *params, limit)
+        )
+
+    rows = await cursor.fetchall()
+    return [
+        {
+            "meeting_id": row["meeting_id"],
+            "room": row["room"],
+            "topic": row["topic"],
+            "start_time": row["start_time"],
+            "status": row["status"],
+            "summary_snippet": _highlight(row["summary_snippet"], terms),
+            "transcript_snippet": _highlight(row["transcript_snippet"], terms),
+            # bm25() 越小越相關，轉為越大越相關
+            "score": -row["score"] if row["score"] else 0.0,
+        }
+        for row in rows
+    ]
+
+
+def _highlight(text: str, terms: List[str]) -> str:
+    """
+    跳脫 HTML 並以 <mark> 標示關鍵字
+
+    snippet() 已標示的位置直接沿用；LIKE 擷取的片段則以單一正規式一次比對所有關鍵字
+    （較長的詞優先），避免逐詞替換時後面的詞比對到先前插入的標記
+    """
+    if not text:
+        return text
+    if _MATCH_START in text:
+        parts = _MATCHED_SPAN.split(text)
+    else:
+        alternatives = "|".join(re.escape(t) for t in sorted(set(terms), key=len, reverse=True))
+        parts = re.split(f"({alternatives})", text, flags=re.I)
+    # split 的結果為 [未比對, 比對, 未比對, ...]
+    return "".join(
+        f"{SNIPPET_OPEN}{html.escape(part)}{SNIPPET_CLOSE}" if i % 2 else html.escape(part)
+        for i, part in enumerate(parts)
+    )
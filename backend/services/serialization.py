@@ -0,0 +1,38 @@
+"""
+快速 JSON 序列化
+大量資料列的 API（會議列表、管理員概覽）直接由資料列組出 dict/list，
+以 orjson 編碼（未安裝時退回標準庫 json）後回傳原始回應，略過 Pydantic 驗證與 jsonable_encoder
+"""
+
+import json
+from typing import Any, Iterable, List, Sequence
+
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_dumps(content: Any) -> bytes:
+    """編碼為緊湊的 UTF-8 JSON（與 FastAPI JSONResponse 的輸出相同）"""
+    if orjson is not None:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, ensure_ascii=False, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """以 json_dumps 編碼的 JSON 回應，內容須為 dict/list/str/int/float/bool/None 組成"""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return json_dumps(content)
+
+
+def rows_to_dicts(rows: Iterable[Sequence], keys: Sequence[str]) -> List[dict]:
+    """將資料列（依 keys 的欄位順序查詢）轉為 dict，不逐欄以名稱取值"""
+    return [dict(zip(keys, row)) for row in rows]
@@ -0,0 +1,77 @@
+"""
+每日統計服務
+維護 daily_user_stats 彙總表（每位用戶每天一列）
+
+彙總值以該 (用戶, 日期) 的會議重新計算，因此同一場會議重跑多次也不會重複累計；
+查詢走 meetings(user_id, start_time) 索引，只涉及當天少數幾列
+"""
+
+from datetime import datetime, timedelta
+from typing import Optional
+
+# 以下 SELECT 以 meetings 為來源計算彙總欄位，供單日更新與全量重建共用
+_AGGREGATE_COLUMNS = """
+    COALESCE(SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END), 0),
+    COALESCE(SUM(CASE WHEN status = 'failed' THEN 1 ELSE 0 END), 0),
+    COALESCE(SUM(CASE WHEN status = 'completed' AND end_time IS NOT NULL
+        THEN (julianday(end_time) - julianday(start_time)) * 1440 END), 0),
+    COALESCE(SUM(CASE WHEN status = 'completed' THEN transcript_chars END), 0),
+    COALESCE(SUM(CASE WHEN status = 'completed' THEN processing_seconds END), 0)
+"""
+
+
+async def refresh_daily_stats(db, user_id: Optional[int], start_time: str):
+    """
+    重新計算指定用戶某天的彙總列（不 commit，由呼叫端決定交易邊界）
+
+    Args:
+        db: 寫入連線
+        user_id: 用戶 ID（無擁有者的會議不計入）
+        start_time: 會議開始時間（ISO 格式），用來決定所屬日期
+    """
+    if user_id is None:
+        return
+
+    day = datetime.fromisoformat(start_time).date()
+    start_of_day = datetime.combine(day, datetime.min.time())
+    end_of_day = start_of_day + timedelta(days=1)
+
+    await db.execute(
+        f"""
+        INSERT OR REPLACE INTO daily_user_stats (
+            user_id, date, meeting_count, failed_count,
+            audio_minutes, transcript_chars, processing_seconds, updated_at
+        )
+        SELECT ?, ?, {_AGGREGATE_COLUMNS}, ?
+        FROM meetings
+        WHERE user_id = ? AND start_time >= ? AND start_time < ?
+        AND status IN ('completed', 'failed')
+        """,
+        (
+            user_id,
+            day.isoformat(),
+            datetime.now().isoformat(),
+            user_id,
+            start_of_day.isoformat(),
+            end_of_day.isoformat(),
+        )
+    )
+
+
+async def rebuild_daily_stats(db):
+    """由 meetings 全量重建 daily_user_stats（不 commit）"""
+    await db.execute("DELETE FROM daily_user_stats")
+    await db.execute(
+        f"""
+        INSERT INTO daily_user_stats (
+            user_id, date, meeting_count, failed_count,
+            audio_minutes, transcript_chars, processing_seconds, updated_at
+        )
+        SELECT user_id, substr(start_time, 1, 10), {_AGGREGATE_COLUMNS}, ?
+        FROM meetings
+        WHERE user_id IS NOT NULL
+        AND status IN ('completed', 'failed')
+        GROUP BY user_id, substr(start_time, 1, 10)
+        """,
+        (datetime.now().isoformat(),)
+    )
@@ -0,0 +1,678 @@
+"""
+會議檔案分層儲存
+依會議存放時間將檔案移往較便宜的儲存層，讓 storage_path 的用量維持有界
+
+儲存層：
+- hot：剛處理完成的檔案，原樣存放於 storage_path/{meeting_id}/
+- compressed：逐字稿與摘要超過 storage_compress_after_days 後以 gzip 壓縮（讀取時自動解壓）
+- archived：音檔超過 storage_archive_after_days 後移至 archive_path/{YYYY-MM}/{meeting_id}/
+- missing：索引中有記錄但檔案已不存在
+
+每個檔案目前的位置記錄在 meeting_artifacts 表，並同步更新 meetings 的 *_path 欄位，
+因此既有的讀取流程只要改用 read_text() 即可讀到任何一層的內容
+"""
+
+import asyncio
+import gzip
+import io
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple, Union
+
+from config import get_settings
+from database import get_db_session, WriteBatch
+from .cache import ArtifactCache
+from .profiling import track_io
+
+try:
+    import brotli  # 選用：安裝後額外產生 .br 版本
+except ImportError:
+    brotli = None
+
+TIER_HOT = "hot"
+TIER_COMPRESSED = "compressed"
+TIER_ARCHIVED = "archived"
+TIER_MISSING = "missing"
+
+# 檔案種類對應 meetings 表的路徑欄位
+ARTIFACT_COLUMNS = {
+    "audio": "audio_path",
+    "transcript": "transcript_path",
+    "summary": "summary_path",
+}
+
+COMPRESSED_SUFFIX = ".gz"
+BROTLI_SUFFIX = ".br"
+_CHUNK_SIZE = 1024 * 1024
+_TEXT_CHUNK_CHARS = 64 * 1024
+
+_UPSERT_ARTIFACT_SQL = """
+    INSERT INTO meeting_artifacts (meeting_id, kind, tier, path, size_bytes, stored_bytes, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(meeting_id, kind) DO UPDATE SET
+        tier = excluded.tier,
+        path = excluded.path,
+        size_bytes = excluded.size_bytes,
+        stored_bytes = excluded.stored_bytes,
+        updated_at = excluded.updated_at
+"""
+
+PathLike = Union[str, Path]
+
+
+def _candidates(path: PathLike) -> list:
+    """檔案可能所在的位置（原檔與壓縮檔），壓縮過程中兩者會短暫並存"""
+    path = Path(path)
+    if path.name.endswith(COMPRESSED_SUFFIX):
+        return [path, path.with_name(path.name[:-len(COMPRESSED_SUFFIX)])]
+    return [path, path.with_name(path.name + COMPRESSED_SUFFIX)]
+
+
+def _load_text(path: Path) -> str:
+    with _open_text(path) as f:
+        return f.read()
+
+
+def _open_text(path: Path):
+    if path.name.endswith(COMPRESSED_SUFFIX):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def _resolve(path: Optional[PathLike]) -> Optional[Tuple[Path, os.stat_result]]:
+    """找出實際存在的檔案（原檔或壓縮檔）及其 stat"""
+    if not path:
+        return None
+    for candidate in _candidates(path):
+        try:
+            return candidate, candidate.stat()
+        except FileNotFoundError:
+            continue
+    return None
+
+
+def read_text(path: Optional[PathLike]) -> str:
+    """
+    讀取逐字稿或摘要，自動解壓 .gz
+
+    DB 中的路徑可能在讀取的同時被壓縮器更新，因此原檔不存在時會改讀另一個版本；
+    都不存在時回傳空字串
+    """
+    if not path:
+        return ""
+    for candidate in _candidates(path):
+        try:
+            return _load_text(candidate)
+        except FileNotFoundError:
+            continue
+    return ""
+
+
+async def read_text_cached(
+    path: Optional[PathLike],
+    view: str = "text",
+    parse: Optional[Callable[[str], Any]] = None,
+) -> Any:
+    """
+    經由 artifact_cache 讀取逐字稿或摘要（檔案未變更時不讀磁碟）
+
+    Args:
+        path: DB 中記錄的檔案路徑
+        view: 快取的檢視名稱（同一檔案的不同解析結果各自快取）
+        parse: 將原文轉為快取值的函式（在背景執行緒執行），未提供時快取原文
+    """
+    def load(resolved: Path):
+        text = _load_text(resolved)
+        return parse(text) if parse else text
+
+    # 壓縮器可能在 stat 與讀取之間搬移檔案，重新定位一次
+    for _ in range(2):
+        resolved = _resolve(path)
+        if resolved is None:
+            break
+        candidate, stat = resolved
+        try:
+            return await artifact_cache.get(
+                candidate, (stat.st_mtime_ns, stat.st_size), load, view=view
+            )
+        except FileNotFoundError:
+            continue
+    return parse("") if parse else ""
+
+
+async def read_texts_cached(
+    paths: List[Optional[PathLike]],
+    view: str = "text",
+    parse: Optional[Callable[[str], Any]] = None,
+    workers: int = 8,
+) -> List[Any]:
+    """
+    批次版的 read_text_cached：未命中的檔案分組後由最多 workers 個背景執行緒並行讀取
+
+    檔案不存在或讀取失敗時該項目為空內容（不影響其他檔案）
+    """
+    def load(resolved: Path):
+        text = _load_text(resolved)
+        return parse(text) if parse else text
+
+    empty = parse("") if parse else ""
+    resolved = [_resolve(path) for path in paths]
+    requests = [(candidate, (stat.st_mtime_ns, stat.st_size)) for candidate, stat in filter(None, resolved)]
+    values = iter(await artifact_cache.get_many(requests, load, view=view, workers=workers))
+
+    results = []
+    for path, found in zip(paths, resolved):
+        if found is None:
+            results.append(empty)
+            continue
+        value = next(values)
+        if isinstance(value, FileNotFoundError):
+            # 壓縮器在 stat 與讀取之間搬移了檔案，重新定位
+            value = await read_text_cached(path, view=view, parse=parse)
+        elif isinstance(value, Exception):
+            print(f"⚠️ 檔案讀取失敗: {path}, 錯誤: {str(value)}")
+            value = empty
+        results.append(value)
+    return results
+
+
+async def gzip_cached(
+    path: Optional[PathLike],
+    version: str,
+    build: Callable[[], bytes],
+    view: str,
+    level: int = 6,
+) -> Optional[bytes]:
+    """
+    經由 artifact_cache 取得由檔案內容產生、已 gzip 壓縮的回應本文（例如 JSON 摘要）
+
+    同一 version（通常為回應的 ETag）只在第一次請求時於背景執行緒產生並壓縮一次，
+    同時的請求共用同一個結果；內容變更後 version 不同即重新產生
+
+    Args:
+        path: 回應內容所依據的檔案（決定快取鍵）
+        version: 回應版本
+        build: 在背景執行緒中產生未壓縮本文的函式
+        view: 檢視名稱，區分同一檔案的不同回應
+        level: gzip 壓縮等級
+
+    Returns:
+        壓縮後的本文；檔案不存在時回傳 None
+    """
+    resolved = _resolve(path)
+    if resolved is None:
+        return None
+    return await artifact_cache.get(
+        resolved[0], (version,), lambda _: gzip.compress(build(), level, mtime=0), view=view
+    )
+
+
+async def iter_text_chunks(
+    path: Optional[PathLike],
+    chunk_chars: int = _TEXT_CHUNK_CHARS,
+) -> AsyncIterator[str]:
+    """
+    逐段讀取逐字稿或摘要（自動解壓 .gz，讀取在背景執行緒執行），記憶體用量與檔案大小無關
+
+    檔案開啟後即使被壓縮器搬移也會讀完同一份內容；檔案不存在時不產生任何內容
+    """
+    reader = None
+    for _ in range(2):
+        resolved = _resolve(path)
+        if resolved is None:
+            return
+        try:
+            reader = await track_io(asyncio.to_thread(_open_text, resolved[0]))
+            break
+        except FileNotFoundError:
+            continue
+    if reader is None:
+        return
+
+    try:
+        while True:
+            chunk = await track_io(asyncio.to_thread(reader.read, chunk_chars))
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        reader.close()
+
+
+def read_text_page(
+    path: Optional[PathLike],
+    byte_offset: int = 0,
+    skip_chars: int = 0,
+    skip_lines: int = 0,
+    max_chars: int = 16000,
+    max_lines: Optional[int] = None,
+) -> Optional[dict]:
+    """
+    讀取逐字稿的一段內容（seek 到指定位置後只讀需要的部分，不載入整個檔案）
+
+    .gz 檔以串流解壓的方式 seek，記憶體用量同樣與檔案大小無關
+
+    Args:
+        path: DB 中記錄的檔案路徑
+        byte_offset: 起始位置（未壓縮內容的位元組偏移，通常來自上一頁的 end）
+        skip_chars: 自起始位置再略過的字元數
+        skip_lines: 自起始位置再略過的行數
+        max_chars: 最多回傳的字元數
+        max_lines: 最多回傳的行數（仍受 max_chars 限制，單行過長時會在行中截斷）
+
+    Returns:
+        {text, start, end, eof}，start/end 為本段內容的位元組偏移；檔案不存在時回傳 None
+
+    Raises:
+        UnicodeDecodeError: byte_offset 不在字元邊界上
+    """
+    resolved = _resolve(path)
+    if resolved is None:
+        return None
+    candidate, _ = resolved
+    opener = gzip.open if candidate.name.endswith(COMPRESSED_SUFFIX) else open
+
+    with opener(candidate, "rb") as raw:
+        raw.seek(byte_offset)
+        # newline="" 保留原始換行，讓字元數與位元組偏移可以互相換算
+        reader = io.TextIOWrapper(raw, encoding="utf-8", newline="")
+        start = byte_offset
+
+        for _ in range(skip_lines):
+            line = reader.readline()
+            if not line:
+                break
+            start += len(line.encode("utf-8"))
+        remaining = skip_chars
+        while remaining > 0:
+            chunk = reader.read(min(remaining, _CHUNK_SIZE))
+            if not chunk:
+                break
+            start += len(chunk.encode("utf-8"))
+            remaining -= len(chunk)
+
+        if max_lines is None:
+            text = reader.read(max_chars)
+        else:
+            parts = []
+            budget = max_chars
+            for _ in range(max_lines):
+                line = reader.readline(budget)
+                if not line:
+                    break
+                parts.append(line)
+                budget -= len(line)
+                if budget <= 0:
+                    break
+            text = "".join(parts)
+
+        end = start + len(text.encode("utf-8"))
+        eof = reader.read(1) == ""
+        reader.detach()
+
+    return {"text": text, "start": start, "end": end, "eof": eof}
+
+
+def artifact_exists(path: Optional[PathLike]) -> bool:
+    """檔案（原檔或壓縮檔）是否存在"""
+    return bool(path) and any(candidate.exists() for candidate in _candidates(path))
+
+
+def artifact_version(path: Optional[PathLike]) -> str:
+    """
+    檔案版本標記（實際所在檔案的路徑、修改時間與大小），用於 ETag，不需讀取內容
+
+    檔案不存在時回傳空字串
+    """
+    resolved = _resolve(path)
+    if resolved is None:
+        return ""
+    candidate, stat = resolved
+    return f"{candidate.name}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _write_atomic(path: Path, data: bytes):
+    """先寫暫存檔再改名，避免讀到寫一半的檔案"""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def precompress(path: PathLike, content: Optional[str] = None):
+    """
+    產生預先壓縮的版本（.gz，安裝 brotli 時另有 .br），供 API 依 Accept-Encoding 直接傳送
+
+    同時覆蓋同名的舊壓縮檔（重新處理時避免讀到舊內容）；.gz 即為 compressed 層的檔案，
+    壓縮器遇到較新的 .gz 時直接沿用
+    """
+    path = Path(path)
+    data = path.read_bytes() if content is None else content.encode("utf-8")
+    _write_atomic(path.with_name(path.name + COMPRESSED_SUFFIX), gzip.compress(data, compresslevel=9, mtime=0))
+    br_path = path.with_name(path.name + BROTLI_SUFFIX)
+    if brotli is not None:
+        _write_atomic(br_path, brotli.compress(data, quality=11, mode=brotli.MODE_TEXT))
+    else:
+        br_path.unlink(missing_ok=True)
+
+
+def write_text(path: PathLike, content: str):
+    """
+    寫入逐字稿或摘要，並產生預先壓縮的版本
+
+    壓縮為 CPU 密集工作（每 MB 約 0.3 秒），在事件迴圈中請以 asyncio.to_thread 呼叫
+    """
+    path = Path(path)
+    path.write_text(content, encoding="utf-8")
+    precompress(path, content)
+
+
+def encoded_variants(path: Optional[PathLike]) -> dict:
+    """
+    檔案目前可直接傳送的版本
+
+    Returns:
+        {content-coding: (Path, stat)}，content-coding 為 "br"、"gzip" 或 "identity"（原檔）；
+        compressed 層只剩 gzip（與 br）版本
+    """
+    if not path:
+        return {}
+    path = Path(path)
+    if path.name.endswith(COMPRESSED_SUFFIX):
+        path = path.with_name(path.name[:-len(COMPRESSED_SUFFIX)])
+    variants = {}
+    for coding, candidate in (
+        ("br", path.with_name(path.name + BROTLI_SUFFIX)),
+        ("gzip", path.with_name(path.name + COMPRESSED_SUFFIX)),
+        ("identity", path),
+    ):
+        try:
+            variants[coding] = (candidate, candidate.stat())
+        except FileNotFoundError:
+            continue
+    return variants
+
+
+def register_artifact(batch: WriteBatch, meeting_id: str, kind: str, path: PathLike):
+    """在批次寫入中記錄新產生的 hot 檔案"""
+    size = Path(path).stat().st_size if Path(path).exists() else None
+    batch.execute(
+        _UPSERT_ARTIFACT_SQL,
+        (meeting_id, kind, TIER_HOT, str(path), size, size, datetime.now().isoformat())
+    )
+
+
+class IOBudget:
+    """
+    每秒讀寫位元組上限
+
+    在背景執行緒中呼叫 throttle()，超出預算時以 sleep 延後，避免壓縮/搬移時搶走線上請求的磁碟頻寬
+    """
+
+    def __init__(self, bytes_per_second: float):
+        self.bytes_per_second = bytes_per_second
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._consumed = 0
+
+    def throttle(self, nbytes: int):
+        if self.bytes_per_second <= 0:
+            return
+        with self._lock:
+            self._consumed += nbytes
+            ahead = self._consumed / self.bytes_per_second - (time.monotonic() - self._started)
+        if ahead > 0:
+            time.sleep(ahead)
+
+
+class StaleArtifactError(Exception):
+    """檔案在壓縮/搬移期間已被重新產生，放棄本次結果"""
+
+
+class StorageCompactor:
+    """
+    背景壓縮器
+
+    定期找出超過保存期限的 hot 檔案，壓縮逐字稿/摘要、將音檔移到封存層；
+    檔案 I/O 在背景執行緒中進行並受 IOBudget 限速
+    """
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self.compressed = 0
+        self.archived = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.bytes_freed = 0
+        self.errors = 0
+        self.last_run_at: Optional[str] = None
+
+    async def find_candidates(self, limit: int) -> list:
+        """依會議開始時間由舊到新列出需要移層的檔案"""
+        settings = get_settings()
+        now = datetime.now()
+        compress_cutoff = now - timedelta(days=settings.storage_compress_after_days)
+        archive_cutoff = now - timedelta(days=settings.storage_archive_after_days)
+
+        async with get_db_session(readonly=True) as db:
+            cursor = await db.execute(
+                """
+                SELECT a.meeting_id, a.kind, a.path, a.updated_at, m.start_time
+                FROM meeting_artifacts a
+                JOIN meetings m ON m.id = a.meeting_id
+                WHERE a.tier = ?
+                AND m.status IN ('completed', 'failed')
+                AND (
+                    (a.kind IN ('transcript', 'summary') AND m.start_time < ?)
+                    OR (a.kind = 'audio' AND m.start_time < ?)
+                )
+                ORDER BY m.start_time
+                LIMIT ?
+                """,
+                (TIER_HOT, compress_cutoff.isoformat(), archive_cutoff.isoformat(), limit)
+            )
+            return [dict(row) for row in await cursor.fetchall()]
+
+    async def run_once(self, limit: Optional[int] = None) -> int:
+        """處理一輪候選檔案，回傳成功移層的數量"""
+        settings = get_settings()
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            budget = IOBudget(settings.storage_compactor_io_mb_per_sec * 1024 * 1024)
+            candidates = await self.find_candidates(limit or settings.storage_compactor_batch_size)
+            moved = 0
+            for artifact in candidates:
+                try:
+                    if await self._move(artifact, budget):
+                        moved += 1
+                except Exception as e:
+                    self.errors += 1
+                    print(f"⚠️ 檔案移層失敗: {artifact['meeting_id']}/{artifact['kind']}, 錯誤: {str(e)}")
+            self.last_run_at = datetime.now().isoformat()
+            return moved
+
+    async def _move(self, artifact: dict, budget: IOBudget) -> bool:
+        settings = get_settings()
+        source = Path(artifact["path"])
+        if not source.exists():
+            await self._mark_missing(artifact)
+            return False
+
+        before = source.stat()
+        reused = False
+
+        if artifact["kind"] == "audio":
+            month = artifact["start_time"][:7]
+            target = Path(settings.archive_path) / month / artifact["meeting_id"] / source.name
+            tier = TIER_ARCHIVED
+            size, stored = await asyncio.to_thread(_copy_file, source, target, budget)
+        else:
+            target = source.with_name(source.name + COMPRESSED_SUFFIX)
+            tier = TIER_COMPRESSED
+            precompressed = _fresh_stat(target, before)
+            if precompressed is not None:
+                # 寫入時已產生 .gz，只需刪除原檔
+                size, stored = before.st_size, precompressed.st_size
+                reused = True
+            else:
+                size, stored = await asyncio.to_thread(_gzip_file, source, target, budget)
+
+        column = ARTIFACT_COLUMNS[artifact["kind"]]
+        now = datetime.now().isoformat()
+
+        async def switch_path(conn):
+            # 檔案在複製期間被重新處理（批次重跑）改寫或改路徑時放棄本次結果
+            after = source.stat()
+            if (after.st_mtime_ns, after.st_size) != (before.st_mtime_ns, before.st_size):
+                raise StaleArtifactError(str(source))
+            cursor = await conn.execute(
+                """
+                UPDATE meeting_artifacts
+                SET tier = ?, path = ?, size_bytes = ?, stored_bytes = ?, updated_at = ?
+                WHERE meeting_id = ? AND kind = ? AND tier = ? AND updated_at IS ?
+                """,
+                (
+                    tier, str(target), size, stored, now,
+                    artifact["meeting_id"], artifact["kind"], TIER_HOT, artifact["updated_at"],
+                )
+            )
+            if cursor.rowcount == 0:
+                raise StaleArtifactError(str(source))
+            cursor = await conn.execute(
+                f"UPDATE meetings SET {column} = ? WHERE id = ? AND {column} = ?",
+                (str(target), artifact["meeting_id"], str(source))
+            )
+            if cursor.rowcount == 0:
+                raise StaleArtifactError(str(source))
+
+        try:
+            await WriteBatch().run(switch_path).commit()
+        except (StaleArtifactError, FileNotFoundError):
+            # 沿用的預先壓縮檔屬於目前的內容，不可刪除
+            if not reused:
+                target.unlink(missing_ok=True)
+            return False
+
+        # DB 已指向新位置後才刪除原檔；期間的讀取由 read_text() 自動改讀新檔
+        source.unlink(missing_ok=True)
+
+        if not reused:
+            self.bytes_read += size
+            self.bytes_written += stored
+        self.bytes_freed += size - stored if tier == TIER_COMPRESSED and not reused else size
+        if tier == TIER_ARCHIVED:
+            self.archived += 1
+        else:
+            self.compressed += 1
+        return True
+
+    async def _mark_missing(self, artifact: dict):
+        """原檔已不存在（例如手動清理）：標記後不再列為候選，避免每輪重複嘗試"""
+        await WriteBatch().execute(
+            "UPDATE meeting_artifacts SET tier = ?, updated_at = ? WHERE meeting_id = ? AND kind = ? AND path = ?",
+            (TIER_MISSING, datetime.now().isoformat(), artifact["meeting_id"], artifact["kind"], artifact["path"])
+        ).commit()
+
+    async def run_forever(self):
+        """每隔 storage_compactor_interval_seconds 執行一輪，直到被取消"""
+        settings = get_settings()
+        while True:
+            try:
+                # 一輪處理滿額時代表還有積壓，立即繼續下一輪
+                while await self.run_once() >= settings.storage_compactor_batch_size:
+                    pass
+            except Exception as e:
+                self.errors += 1
+                print(f"⚠️ 儲存壓縮器執行失敗: {str(e)}")
+            await asyncio.sleep(settings.storage_compactor_interval_seconds)
+
+    def start(self):
+        """在目前事件迴圈啟動背景壓縮器"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._lock = None
+
+    def stats(self) -> dict:
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "compressed": self.compressed,
+            "archived": self.archived,
+            "bytes_read": self.bytes_read,
+            "bytes_written": self.bytes_written,
+            "bytes_freed": self.bytes_freed,
+            "errors": self.errors,
+            "last_run_at": self.last_run_at,
+        }
+
+
+def _fresh_stat(path: Path, source: os.stat_result) -> Optional[os.stat_result]:
+    """path 存在且不比來源檔舊時回傳其 stat（寫入時產生的預先壓縮檔）"""
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat if stat.st_mtime_ns >= source.st_mtime_ns else None
+
+
+def _gzip_file(source: Path, target: Path, budget: IOBudget) -> tuple:
+    """壓縮檔案（先寫暫存檔再改名，避免讀到寫一半的壓縮檔），回傳（原始大小, 壓縮後大小）"""
+    tmp = target.with_name(target.name + ".tmp")
+    size = 0
+    with open(source, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+        while True:
+            chunk = src.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            dst.write(chunk)
+            size += len(chunk)
+            budget.throttle(len(chunk))
+    stored = tmp.stat().st_size
+    budget.throttle(stored)
+    os.replace(tmp, target)
+    return size, stored
+
+
+def _copy_file(source: Path, target: Path, budget: IOBudget) -> tuple:
+    """複製檔案到封存層（可能跨檔案系統），回傳（原始大小, 封存後大小）"""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    size = 0
+    with open(source, "rb") as src, open(tmp, "wb") as dst:
+        while True:
+            chunk = src.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            dst.write(chunk)
+            size += len(chunk)
+            # 讀一次、寫一次
+            budget.throttle(len(chunk) * 2)
+        dst.flush()
+        os.fsync(dst.fileno())
+    os.replace(tmp, target)
+    return size, size
+
+
+storage_compactor = StorageCompactor()
+
+# 摘要與逐字稿內容快取
+# 容量於啟動時由 configure_artifact_cache() 套用設定，匯入本模組時不讀取設定（未設定前不快取）
+artifact_cache = ArtifactCache(max_bytes=0)
+
+
+def configure_artifact_cache():
+    """依設定套用內容快取的容量上限（應用程式啟動時呼叫）"""
+    artifact_cache.max_bytes = get_settings().artifact_cache_max_mb * 1024 * 1024
@@ -4,11 +4,9 @@ AI 摘要生成服務
 """
 
 from typing import List
-from openai import AsyncOpenAI
 
 from config import get_settings
-
-settings = get_settings()
+from . import import_module_async
 
 # 摘要生成提示詞（簡潔版）
 SUMMARY_PROMPT = """你是一位專業的會議記錄員。請根據以下會議逐字稿，生成一份簡潔清晰的會議摘要。
@@ -78,11 +76,16 @@ async def generate_summary(
     Returns:
         Markdown 格式的摘要
     """
+    settings = get_settings()
+    
     # 檢查 API Key
     if not settings.openai_api_key:
         raise Exception("OpenAI API Key 未設定，請在 .env 檔案中設定 OPENAI_API_KEY")
     
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    # openai SDK 載入約需 0.6 秒，不在啟動時載入；於背景執行緒取得，避免阻塞事件迴圈
+    openai = await import_module_async("openai")
+    
+    client = openai.AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url or None)
     
     # 整理與會者資訊
     attendee_names = ", ".join([
@@ -4,11 +4,9 @@
 """
 
 from pathlib import Path
-from openai import AsyncOpenAI
 
 from config import get_settings
-
-settings = get_settings()
+from . import import_module_async
 
 
 async def transcribe_audio(audio_path: str) -> str:
@@ -21,11 +19,16 @@ async def transcribe_audio(audio_path: str) -> str:
     Returns:
         逐字稿文字
     """
+    settings = get_settings()
+    
     # 檢查 API Key
     if not settings.openai_api_key:
         raise Exception("OpenAI API Key 未設定，請在 .env 檔案中設定 OPENAI_API_KEY")
     
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    # openai SDK 載入約需 0.6 秒，不在啟動時載入；於背景執行緒取得，避免阻塞事件迴圈
+    openai = await import_module_async("openai")
+    
+    client = openai.AsyncOpenAI(api_key=settings.openai_api_key, base_url=settings.openai_base_url or None)
     
     audio_file = Path(audio_path)
     if not audio_file.exists():
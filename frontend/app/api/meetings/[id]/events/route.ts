@@ -0,0 +1,35 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+const BACKEND_URL = 'http://tw-07.access.glows.ai:23435';
+
+// SSE 串流不可快取，需逐段轉送
+export const dynamic = 'force-dynamic';
+
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    const response = await fetch(`${BACKEND_URL}/api/meetings/${id}/events`, {
+      cache: 'no-store',
+      signal: request.signal,
+    });
+    
+    if (!response.ok || !response.body) {
+      const data = await response.json();
+      return NextResponse.json(data, { status: response.status });
+    }
+    
+    return new Response(response.body, {
+      headers: {
+        'Content-Type': 'text/event-stream',
+        'Cache-Control': 'no-cache, no-transform',
+        'Connection': 'keep-alive',
+      },
+    });
+  } catch (error) {
+    console.error('Proxy error:', error);
+    return NextResponse.json({ error: 'Backend connection failed' }, { status: 500 });
+  }
+}
@@ -0,0 +1,35 @@
+import { NextRequest, NextResponse } from 'next/server';
+
+const BACKEND_URL = 'http://tw-07.access.glows.ai:23435';
+
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ id: string }> }
+) {
+  try {
+    const { id } = await params;
+    
+    // 轉送分頁參數（cursor / offset / line / lines / limit）
+    const query = request.nextUrl.search;
+    const ifNoneMatch = request.headers.get('if-none-match');
+    const response = await fetch(`${BACKEND_URL}/api/meetings/${id}/transcript${query}`, {
+      cache: 'no-store',
+      headers: ifNoneMatch ? { 'If-None-Match': ifNoneMatch } : undefined,
+    });
+    
+    // 內容未變更：直接回傳 304，瀏覽器沿用快取
+    const etag = response.headers.get('etag');
+    if (response.status === 304) {
+      return new NextResponse(null, { status: 304, headers: etag ? { ETag: etag } : undefined });
+    }
+    
+    const data = await response.json();
+    return NextResponse.json(data, {
+      status: response.status,
+      headers: etag ? { ETag: etag, 'Cache-Control': 'no-cache' } : undefined,
+    });
+  } catch (error) {
+    console.error('Proxy error:', error);
+    return NextResponse.json({ error: 'Backend connection failed' }, { status: 500 });
+  }
+}
@@ -14,11 +14,20 @@ export async function GET(request: NextRequest) {
     
     console.log('Fetching meetings with auth:', authorization.substring(0, 20) + '...');
     
+    const ifNoneMatch = request.headers.get('if-none-match');
     const response = await fetch(`${BACKEND_URL}/api/meetings/my/list`, {
+      cache: 'no-store',
       headers: {
         'Authorization': authorization,
+        ...(ifNoneMatch ? { 'If-None-Match': ifNoneMatch } : {}),
       },
     });
+    
+    // 列表未變更：直接回傳 304，瀏覽器沿用快取
+    const etag = response.headers.get('etag');
+    if (response.status === 304) {
+      return new NextResponse(null, { status: 304, headers: etag ? { ETag: etag } : undefined });
+    }
 
     if (!response.ok) {
       const errorText = await response.text();
@@ -37,7 +46,9 @@ export async function GET(request: NextRequest) {
 
     const data = await response.json();
     
-    return NextResponse.json(data);
+    return NextResponse.json(data, {
+      headers: etag ? { ETag: etag, 'Cache-Control': 'private, no-cache' } : undefined,
+    });
   } catch (error) {
     console.error('Meetings list proxy error:', error);
     return NextResponse.json(
@@ -6,9 +6,9 @@ import { MeetingPanel, AttendeeList, ProcessingModal, SummaryModal } from '@/com
 import LoginPage from '@/components/LoginPage';
 import MeetingHistory from '@/components/MeetingHistory';
 import { useAudioRecorder } from '@/lib/useAudioRecorder';
-import { startMeeting, endMeeting, getMeetingStatus, getMeetingSummary } from '@/lib/api';
+import { startMeeting, endMeeting, getMeetingStatus, getMeetingSummary, loadMeetingTranscript, subscribeMeetingStatus } from '@/lib/api';
 import * as auth from '@/lib/auth';
-import type { Attendee, MeetingStatus, ProcessingStep } from '@/lib/types';
+import type { Attendee, MeetingStatus, ProcessingStep, ProcessingStatusResponse } from '@/lib/types';
 
 // 會議室名稱（可從環境變數或設定檔讀取）
 const ROOM_NAME = '會議室 A';
@@ -155,8 +155,8 @@ export default function HomePage() {
       setProcessingSteps(prev => ({ ...prev, upload: 'completed' }));
       setStatus('processing');
       
-      // 開始輪詢狀態
-      pollStatus(meetingId);
+      // 訂閱處理狀態（SSE 失敗時改為輪詢）
+      watchStatus(meetingId);
       
     } catch (err) {
       setError(err instanceof Error ? err.message : '結束會議失敗');
@@ -165,39 +165,52 @@ export default function HomePage() {
     }
   }, [meetingId, attendees, stopRecording]);
 
-  // 輪詢處理狀態
+  // 套用處理狀態，回傳是否仍在處理中
+  const applyStatus = useCallback(async (id: string, response: ProcessingStatusResponse) => {
+    setProcessingSteps(response.steps);
+    setStatus(response.status);
+    
+    if (response.status === 'processing' || response.status === 'uploading') {
+      return true;
+    }
+    
+    if (response.status === 'completed') {
+      // 處理完成，獲取摘要並顯示摘要頁面
+      console.log('✅ 處理完成！獲取摘要...');
+      try {
+        const summaryData = await getMeetingSummary(id);
+        setSummaryContent(summaryData.summary);
+        // 逐字稿可能很長，先顯示摘要，再於背景逐頁載入
+        setTranscriptContent('');
+        loadMeetingTranscript(id, setTranscriptContent).catch((transcriptErr) => {
+          console.error('獲取逐字稿失敗:', transcriptErr);
+        });
+        // 關閉處理中 Modal，顯示摘要 Modal
+        setShowProcessingModal(false);
+        setShowSummaryModal(true);
+      } catch (summaryErr) {
+        console.error('獲取摘要失敗:', summaryErr);
+        // 即使獲取摘要失敗，也顯示摘要頁面
+        setShowProcessingModal(false);
+        setShowSummaryModal(true);
+      }
+    } else if (response.status === 'failed') {
+      setError(response.error || '處理失敗');
+    }
+    return false;
+  }, []);
+
+  // 輪詢處理狀態（SSE 無法使用時的備援）
   const pollStatus = useCallback(async (id: string) => {
     const poll = async () => {
       try {
         const response = await getMeetingStatus(id);
         console.log('Poll response:', response);
         
-        setProcessingSteps(response.steps);
-        setStatus(response.status);
-        
         // 如果還在處理中，繼續輪詢
-        if (response.status === 'processing' || response.status === 'uploading') {
+        if (await applyStatus(id, response)) {
           setTimeout(poll, 2000);
-        } else if (response.status === 'completed') {
-          // 處理完成，獲取摘要並顯示摘要頁面
-          console.log('✅ 處理完成！獲取摘要...');
-          try {
-            const summaryData = await getMeetingSummary(id);
-            setSummaryContent(summaryData.summary);
-            setTranscriptContent(summaryData.transcript);
-            // 關閉處理中 Modal，顯示摘要 Modal
-            setShowProcessingModal(false);
-            setShowSummaryModal(true);
-          } catch (summaryErr) {
-            console.error('獲取摘要失敗:', summaryErr);
-            // 即使獲取摘要失敗，也顯示摘要頁面
-            setShowProcessingModal(false);
-            setShowSummaryModal(true);
-          }
-        } else if (response.status === 'failed') {
-          setError(response.error || '處理失敗');
         }
-        
       } catch (err) {
         console.error('輪詢狀態失敗:', err);
         setTimeout(poll, 3000);
@@ -206,7 +219,29 @@ export default function HomePage() {
     
     // 延遲開始輪詢
     setTimeout(poll, 1000);
-  }, []);
+  }, [applyStatus]);
+
+  // 訂閱處理狀態：由伺服器在每個步驟完成時推送，連線失敗時改回輪詢
+  const watchStatus = useCallback((id: string) => {
+    let finished = false;
+    
+    subscribeMeetingStatus(
+      id,
+      (response) => {
+        console.log('Status event:', response);
+        if (response.status === 'completed' || response.status === 'failed') {
+          finished = true;
+        }
+        applyStatus(id, response);
+      },
+      () => {
+        if (!finished) {
+          console.warn('狀態串流中斷，改用輪詢');
+          pollStatus(id);
+        }
+      }
+    );
+  }, [applyStatus, pollStatus]);
 
   // 重置會議狀態
   const resetMeeting = useCallback(() => {
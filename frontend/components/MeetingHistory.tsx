@@ -1,8 +1,9 @@
 'use client';
 
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef } from 'react';
 import { Clock, FileText, ChevronRight, RefreshCw } from 'lucide-react';
 import { getAuthHeaders } from '@/lib/auth';
+import { loadMeetingTranscript } from '@/lib/api';
 
 interface Meeting {
   id: string;
@@ -24,6 +25,7 @@ export default function MeetingHistory({ onViewMeeting }: MeetingHistoryProps) {
   const [selectedMeeting, setSelectedMeeting] = useState<string | null>(null);
   const [summary, setSummary] = useState<string>('');
   const [transcript, setTranscript] = useState<string>('');
+  const viewingMeetingRef = useRef<string | null>(null);
   const [loadingSummary, setLoadingSummary] = useState(false);
 
   const fetchMeetings = async () => {
@@ -62,10 +64,12 @@ export default function MeetingHistory({ onViewMeeting }: MeetingHistoryProps) {
   const handleViewMeeting = async (meetingId: string) => {
     if (selectedMeeting === meetingId) {
       setSelectedMeeting(null);
+      viewingMeetingRef.current = null;
       return;
     }
     
     setSelectedMeeting(meetingId);
+    viewingMeetingRef.current = meetingId;
     setLoadingSummary(true);
     setSummary('');
     setTranscript('');
@@ -75,7 +79,13 @@ export default function MeetingHistory({ onViewMeeting }: MeetingHistoryProps) {
       if (response.ok) {
         const data = await response.json();
         setSummary(data.summary || '尚無摘要');
-        setTranscript(data.transcript || '');
+        // 逐字稿另外分頁載入，不延遲摘要顯示
+        loadMeetingTranscript(meetingId, (text) => {
+          // 已切換到其他會議時忽略
+          if (viewingMeetingRef.current === meetingId) {
+            setTranscript(text);
+          }
+        }).catch(() => {});
       }
     } catch (err) {
       setSummary('無法獲取摘要');
@@ -65,13 +65,42 @@ export async function getMeetingStatus(meetingId: string): Promise<ProcessingSta
   return response.json();
 }
 
+/**
+ * 訂閱處理狀態（Server-Sent Events）
+ * 
+ * 狀態變化時立即回呼 onStatus；連線中斷時關閉串流並呼叫 onError（由呼叫端改用輪詢）
+ * 回傳取消訂閱的函式
+ */
+export function subscribeMeetingStatus(
+  meetingId: string,
+  onStatus: (status: ProcessingStatusResponse) => void,
+  onError: () => void
+): () => void {
+  const source = new EventSource(`${API_BASE}/meetings/${meetingId}/events`);
+  
+  source.addEventListener('status', (event) => {
+    const status: ProcessingStatusResponse = JSON.parse((event as MessageEvent).data);
+    // 完成或失敗後伺服器會關閉連線，先行關閉以免 EventSource 自動重連
+    if (status.status === 'completed' || status.status === 'failed') {
+      source.close();
+    }
+    onStatus(status);
+  });
+  
+  source.onerror = () => {
+    source.close();
+    onError();
+  };
+  
+  return () => source.close();
+}
+
 /**
  * 獲取會議摘要
  */
 export async function getMeetingSummary(meetingId: string): Promise<{
   meeting_id: string;
   summary: string;
-  transcript: string;
 }> {
   const response = await fetch(`${API_BASE}/meetings/${meetingId}/summary`);
   
@@ -82,3 +111,44 @@ export async function getMeetingSummary(meetingId: string): Promise<{
   return response.json();
 }
 
+export interface TranscriptPage {
+  meeting_id: string;
+  text: string;
+  has_more: boolean;
+  next_cursor: string | null;
+}
+
+/**
+ * 獲取一頁逐字稿（不帶 cursor 時為第一頁）
+ */
+export async function getMeetingTranscript(meetingId: string, cursor?: string): Promise<TranscriptPage> {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+  const response = await fetch(`${API_BASE}/meetings/${meetingId}/transcript${query}`);
+  
+  if (!response.ok) {
+    throw new Error('無法取得逐字稿');
+  }
+  
+  return response.json();
+}
+
+/**
+ * 逐頁載入完整逐字稿，每載入一頁就以目前累積的內容呼叫 onProgress
+ */
+export async function loadMeetingTranscript(
+  meetingId: string,
+  onProgress: (transcript: string) => void
+): Promise<string> {
+  let transcript = '';
+  let cursor: string | undefined;
+  
+  do {
+    const page = await getMeetingTranscript(meetingId, cursor);
+    transcript += page.text;
+    onProgress(transcript);
+    cursor = page.next_cursor ?? undefined;
+  } while (cursor);
+  
+  return transcript;
+}
+
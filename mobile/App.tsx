@@ -331,14 +331,22 @@ export default function App() {
         try {
           const summaryData = await api.getMeetingSummary(serverId);
           setSummary(summaryData.summary);
-          setTranscript(summaryData.transcript);
+          setTranscript('');
           setShowSummary(true);
           
+          // 逐字稿可能很長，先顯示摘要，再於背景逐頁載入
+          let transcript: string | undefined;
+          try {
+            transcript = await api.loadMeetingTranscript(serverId, setTranscript);
+          } catch (e) {
+            console.error('獲取逐字稿失敗:', e);
+          }
+          
           // 更新本地記錄
           await storage.updateMeetingStatus(localId, {
             status: 'uploaded',
             summary: summaryData.summary,
-            transcript: summaryData.transcript,
+            transcript,
           });
         } catch (e) {
           console.error('獲取摘要失敗:', e);
@@ -409,13 +417,21 @@ export default function App() {
       try {
         const data = await api.getMeetingSummary(meeting.serverId);
         setDetailSummary(data.summary || '尚無摘要');
-        setDetailTranscript(data.transcript || '');
+        setDetailTranscript('');
+        setLoadingDetail(false);
         
-        // 保存到本地
-        await storage.updateMeetingStatus(meeting.id, {
-          summary: data.summary,
-          transcript: data.transcript,
-        });
+        // 逐字稿另外分頁載入，不延遲摘要顯示；失敗時不保存，下次重新下載
+        try {
+          const transcript = await api.loadMeetingTranscript(meeting.serverId, setDetailTranscript);
+          
+          // 保存到本地
+          await storage.updateMeetingStatus(meeting.id, {
+            summary: data.summary,
+            transcript,
+          });
+        } catch (e) {
+          console.error('獲取逐字稿失敗:', e);
+        }
       } catch (err) {
         setDetailSummary('無法獲取摘要');
       }
@@ -31,7 +31,13 @@ export interface MeetingStatusResponse {
 export interface SummaryResponse {
   meeting_id: string;
   summary: string;
-  transcript: string;
+}
+
+export interface TranscriptPage {
+  meeting_id: string;
+  text: string;
+  has_more: boolean;
+  next_cursor: string | null;
 }
 
 /**
@@ -117,3 +123,40 @@ export async function getMeetingSummary(meetingId: string): Promise<SummaryRespo
   return response.json();
 }
 
+/**
+ * 獲取一頁逐字稿（不帶 cursor 時為第一頁）
+ */
+export async function getMeetingTranscript(meetingId: string, cursor?: string): Promise<TranscriptPage> {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+  const response = await fetch(`${API_BASE}/meetings/${meetingId}/transcript${query}`);
+
+  if (!response.ok) {
+    throw new Error('無法取得逐字稿');
+  }
+
+  return response.json();
+}
+
+/**
+ * 下載完整逐字稿
+ * 伺服器直接傳送寫入時預先壓縮的版本（gzip），由 fetch 自動解壓
+ */
+export async function loadMeetingTranscript(
+  meetingId: string,
+  onProgress?: (transcript: string) => void
+): Promise<string> {
+  const response = await fetch(`${API_BASE}/meetings/${meetingId}/transcript.txt`);
+
+  if (response.status === 404) {
+    onProgress?.('');
+    return '';
+  }
+  if (!response.ok) {
+    throw new Error('無法取得逐字稿');
+  }
+
+  const transcript = await response.text();
+  onProgress?.(transcript);
+  return transcript;
+}
+